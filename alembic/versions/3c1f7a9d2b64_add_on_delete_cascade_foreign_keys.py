@@ -0,0 +1,59 @@
+"""add on delete cascade foreign keys
+
+Revision ID: 3c1f7a9d2b64
+Revises: 938564953218
+Create Date: 2026-10-19 09:12:03.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '3c1f7a9d2b64'
+down_revision: Union[str, Sequence[str], None] = '938564953218'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, referred table, referred column)
+FOREIGN_KEYS = [
+    ('gigs', 'owner_id', 'users', 'uid'),
+    ('applications', 'gig_id', 'gigs', 'id'),
+    ('applications', 'applicant_id', 'users', 'uid'),
+    ('reviews', 'gig_id', 'gigs', 'id'),
+    ('reviews', 'reviewer_id', 'users', 'uid'),
+    ('reviews', 'reviewed_user_id', 'users', 'uid'),
+]
+
+# SQLite foreign keys are unnamed; batch mode reflects them under this convention
+NAMING_CONVENTION = {
+    "fk": "%(table_name)s_%(column_0_name)s_fkey",
+}
+
+
+def _recreate_foreign_keys(ondelete: Union[str, None]) -> None:
+    tables = {}
+    for table, column, referred_table, referred_column in FOREIGN_KEYS:
+        tables.setdefault(table, []).append((column, referred_table, referred_column))
+
+    for table, foreign_keys in tables.items():
+        # Postgres' default constraint names match the naming convention above
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            for column, referred_table, referred_column in foreign_keys:
+                name = f'{table}_{column}_fkey'
+                batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(
+                    name, referred_table, [column], [referred_column], ondelete=ondelete
+                )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate_foreign_keys(ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_foreign_keys(ondelete=None)
@@ -0,0 +1,93 @@
+"""add gig archive tables
+
+Revision ID: 5b8e3d7a2c16
+Revises: 9e2a6c4d1f83
+Create Date: 2026-10-20 01:06:52.231870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '5b8e3d7a2c16'
+down_revision: Union[str, Sequence[str], None] = '9e2a6c4d1f83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# SQLite foreign keys are unnamed; batch mode reflects them under this convention
+NAMING_CONVENTION = {
+    "fk": "%(table_name)s_%(column_0_name)s_fkey",
+}
+
+GIG_COLUMNS = (
+    'id, title, description, budget, budget_type, location, skills_required, deadline, owner_id, status, '
+    'created_at, updated_at'
+)
+APPLICATION_COLUMNS = 'id, gig_id, applicant_id, cover_letter, status, created_at, updated_at'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('archived_gigs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('budget', sa.Float(), nullable=True),
+    sa.Column('budget_type', sa.String(), nullable=True),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('skills_required', sa.JSON(), nullable=True),
+    sa.Column('deadline', sa.DateTime(), nullable=True),
+    sa.Column('owner_id', sa.String(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.uid'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_archived_gigs_owner_id_created_at', 'archived_gigs', ['owner_id', 'created_at'], unique=False
+    )
+    op.create_table('archived_applications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('gig_id', sa.Integer(), nullable=False),
+    sa.Column('applicant_id', sa.String(), nullable=False),
+    sa.Column('cover_letter', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['applicant_id'], ['users.uid'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['gig_id'], ['archived_gigs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_archived_applications_applicant_id_created_at', 'archived_applications',
+        ['applicant_id', 'created_at'], unique=False
+    )
+    op.create_index(
+        'ix_archived_applications_gig_id_created_at', 'archived_applications', ['gig_id', 'created_at'], unique=False
+    )
+    # Reviews stay in place when their gig is archived
+    with op.batch_alter_table('reviews', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint('reviews_gig_id_fkey', type_='foreignkey')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Move archived rows back so nothing is lost and the restored foreign key holds
+    op.execute(f'INSERT INTO gigs ({GIG_COLUMNS}) SELECT {GIG_COLUMNS} FROM archived_gigs')
+    op.execute(
+        f'INSERT INTO applications ({APPLICATION_COLUMNS}) SELECT {APPLICATION_COLUMNS} FROM archived_applications'
+    )
+    op.execute('DELETE FROM reviews WHERE gig_id NOT IN (SELECT id FROM gigs)')
+    with op.batch_alter_table('reviews', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.create_foreign_key('reviews_gig_id_fkey', 'gigs', ['gig_id'], ['id'], ondelete='CASCADE')
+    op.drop_index('ix_archived_applications_gig_id_created_at', table_name='archived_applications')
+    op.drop_index('ix_archived_applications_applicant_id_created_at', table_name='archived_applications')
+    op.drop_table('archived_applications')
+    op.drop_index('ix_archived_gigs_owner_id_created_at', table_name='archived_gigs')
+    op.drop_table('archived_gigs')
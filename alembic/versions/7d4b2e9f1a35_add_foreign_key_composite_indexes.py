@@ -0,0 +1,56 @@
+"""add foreign key composite indexes
+
+Revision ID: 7d4b2e9f1a35
+Revises: 3c1f7a9d2b64
+Create Date: 2026-10-19 14:37:52.206114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '7d4b2e9f1a35'
+down_revision: Union[str, Sequence[str], None] = '3c1f7a9d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns): every crud lookup by owner, applicant, gig or reviewed
+# user, in the order it sorts by, plus the foreign keys ON DELETE CASCADE follows
+INDEXES = [
+    ('ix_gigs_owner_id_created_at', 'gigs', ['owner_id', 'created_at']),
+    ('ix_gigs_budget', 'gigs', ['budget']),
+    ('ix_gigs_updated_at_id', 'gigs', ['updated_at', 'id']),
+    ('ix_applications_gig_id_created_at', 'applications', ['gig_id', 'created_at']),
+    ('ix_applications_applicant_id_created_at', 'applications', ['applicant_id', 'created_at']),
+    ('ix_reviews_reviewed_user_id_created_at', 'reviews', ['reviewed_user_id', 'created_at']),
+    ('ix_reviews_gig_id_reviewer_id', 'reviews', ['gig_id', 'reviewer_id']),
+    ('ix_reviews_reviewer_id', 'reviews', ['reviewer_id']),
+    ('ix_reviews_updated_at_id', 'reviews', ['updated_at', 'id']),
+]
+
+# Duplicates of the primary key index that only cost writes
+REDUNDANT_INDEXES = [
+    ('ix_users_uid', 'users', ['uid']),
+    ('ix_gigs_id', 'gigs', ['id']),
+    ('ix_applications_id', 'applications', ['id']),
+    ('ix_reviews_id', 'reviews', ['id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    for name, table, columns in REDUNDANT_INDEXES:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, columns in REDUNDANT_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,36 @@
+"""add gig changes
+
+Revision ID: 9e2a6c4d1f83
+Revises: d4f1c8a2b695
+Create Date: 2026-10-19 23:41:07.512394
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '9e2a6c4d1f83'
+down_revision: Union[str, Sequence[str], None] = 'd4f1c8a2b695'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('gig_changes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('gig_id', sa.Integer(), nullable=False),
+    sa.Column('op', sa.String(length=10), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sqlite_autoincrement=True
+    )
+    op.create_index('ix_gig_changes_created_at', 'gig_changes', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_gig_changes_created_at', table_name='gig_changes')
+    op.drop_table('gig_changes')
@@ -0,0 +1,65 @@
+"""add gig status with open partial indexes
+
+Revision ID: a2c9e4f7b1d8
+Revises: 7d4b2e9f1a35
+Create Date: 2026-10-19 16:05:41.873320
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'a2c9e4f7b1d8'
+down_revision: Union[str, Sequence[str], None] = '7d4b2e9f1a35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+OPEN_GIG = sa.text("status = 'open'")
+
+# (name, column) of the partial indexes behind the public feed
+OPEN_INDEXES = [
+    ('ix_gigs_open_created_at', 'created_at'),
+    ('ix_gigs_open_budget', 'budget'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('gigs') as batch_op:
+        batch_op.add_column(sa.Column('status', sa.String(length=20), nullable=False, server_default='open'))
+
+    # Backfill: completed gigs from is_completed, gigs with a selected applicant
+    # are in progress, and open gigs past their deadline have expired
+    op.execute("UPDATE gigs SET status = 'completed' WHERE is_completed = 'true'")
+    op.execute(
+        "UPDATE gigs SET status = 'in_progress' WHERE status = 'open' AND EXISTS ("
+        "SELECT 1 FROM applications WHERE applications.gig_id = gigs.id AND applications.status = 'accepted')"
+    )
+    op.get_bind().execute(
+        sa.text("UPDATE gigs SET status = 'expired' WHERE status = 'open' AND deadline < :now"),
+        {'now': datetime.utcnow()}
+    )
+
+    with op.batch_alter_table('gigs') as batch_op:
+        batch_op.drop_column('is_completed')
+
+    for name, column in OPEN_INDEXES:
+        op.create_index(name, 'gigs', [column], unique=False, postgresql_where=OPEN_GIG, sqlite_where=OPEN_GIG)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, column in OPEN_INDEXES:
+        op.drop_index(name, table_name='gigs', postgresql_where=OPEN_GIG, sqlite_where=OPEN_GIG)
+
+    with op.batch_alter_table('gigs') as batch_op:
+        batch_op.add_column(sa.Column('is_completed', sa.String(), nullable=True, server_default='false'))
+
+    op.execute("UPDATE gigs SET is_completed = CASE WHEN status = 'completed' THEN 'true' ELSE 'false' END")
+
+    with op.batch_alter_table('gigs') as batch_op:
+        batch_op.drop_column('status')
@@ -0,0 +1,66 @@
+"""add saved searches
+
+Revision ID: b7d2f5c8e061
+Revises: e3f6a0b2c94d
+Create Date: 2026-10-19 19:12:37.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b7d2f5c8e061'
+down_revision: Union[str, Sequence[str], None] = 'e3f6a0b2c94d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('saved_searches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('search', sa.String(length=100), nullable=True),
+    sa.Column('skills', sa.JSON(), nullable=True),
+    sa.Column('budget_type', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.uid'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_saved_searches_user_id_created_at', 'saved_searches', ['user_id', 'created_at'], unique=False)
+    op.create_table('saved_search_anchors',
+    sa.Column('key', sa.String(length=120), nullable=False),
+    sa.Column('saved_search_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['saved_search_id'], ['saved_searches.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('key', 'saved_search_id')
+    )
+    op.create_index(
+        'ix_saved_search_anchors_saved_search_id', 'saved_search_anchors', ['saved_search_id'], unique=False
+    )
+    op.create_table('saved_search_matches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('saved_search_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('gig_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['gig_id'], ['gigs.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['saved_search_id'], ['saved_searches.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.uid'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('saved_search_id', 'gig_id', name='uq_saved_search_matches_saved_search_id_gig_id')
+    )
+    op.create_index('ix_saved_search_matches_gig_id', 'saved_search_matches', ['gig_id'], unique=False)
+    op.create_index('ix_saved_search_matches_user_id_id', 'saved_search_matches', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_saved_search_matches_user_id_id', table_name='saved_search_matches')
+    op.drop_index('ix_saved_search_matches_gig_id', table_name='saved_search_matches')
+    op.drop_table('saved_search_matches')
+    op.drop_index('ix_saved_search_anchors_saved_search_id', table_name='saved_search_anchors')
+    op.drop_table('saved_search_anchors')
+    op.drop_index('ix_saved_searches_user_id_created_at', table_name='saved_searches')
+    op.drop_table('saved_searches')
@@ -0,0 +1,49 @@
+"""add scheduler lease and housekeeping indexes
+
+Revision ID: c5e81f3a9d27
+Revises: a2c9e4f7b1d8
+Create Date: 2026-10-19 17:48:12.530964
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c5e81f3a9d27'
+down_revision: Union[str, Sequence[str], None] = 'a2c9e4f7b1d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+OPEN_GIG = sa.text("status = 'open'")
+PENDING_APPLICATION = sa.text("status = 'pending'")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('scheduler_leases',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('holder', sa.String(length=100), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_index(
+        'ix_gigs_open_deadline', 'gigs', ['deadline'], unique=False,
+        postgresql_where=OPEN_GIG, sqlite_where=OPEN_GIG
+    )
+    op.create_index(
+        'ix_applications_pending_gig_id', 'applications', ['gig_id'], unique=False,
+        postgresql_where=PENDING_APPLICATION, sqlite_where=PENDING_APPLICATION
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_applications_pending_gig_id', table_name='applications',
+        postgresql_where=PENDING_APPLICATION, sqlite_where=PENDING_APPLICATION
+    )
+    op.drop_index('ix_gigs_open_deadline', table_name='gigs', postgresql_where=OPEN_GIG, sqlite_where=OPEN_GIG)
+    op.drop_table('scheduler_leases')
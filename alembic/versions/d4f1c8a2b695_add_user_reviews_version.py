@@ -0,0 +1,31 @@
+"""add user reviews version
+
+Revision ID: d4f1c8a2b695
+Revises: b7d2f5c8e061
+Create Date: 2026-10-19 20:31:08.512734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'd4f1c8a2b695'
+down_revision: Union[str, Sequence[str], None] = 'b7d2f5c8e061'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('reviews_version', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('reviews_updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('reviews_updated_at')
+        batch_op.drop_column('reviews_version')
@@ -0,0 +1,53 @@
+"""add outbox events
+
+Revision ID: e3f6a0b2c94d
+Revises: c5e81f3a9d27
+Create Date: 2026-10-19 19:22:36.104857
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e3f6a0b2c94d'
+down_revision: Union[str, Sequence[str], None] = 'c5e81f3a9d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PENDING_EVENT = sa.text("status = 'pending'")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outbox_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('topic', sa.String(length=100), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('available_at', sa.DateTime(), nullable=False),
+    sa.Column('claimed_by', sa.String(length=100), nullable=True),
+    sa.Column('claimed_until', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_outbox_events_pending_available_at', 'outbox_events', ['available_at', 'id'], unique=False,
+        postgresql_where=PENDING_EVENT, sqlite_where=PENDING_EVENT
+    )
+    op.create_index('ix_outbox_events_processed_at', 'outbox_events', ['processed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbox_events_processed_at', table_name='outbox_events')
+    op.drop_index(
+        'ix_outbox_events_pending_available_at', table_name='outbox_events',
+        postgresql_where=PENDING_EVENT, sqlite_where=PENDING_EVENT
+    )
+    op.drop_table('outbox_events')
@@ -0,0 +1,116 @@
+"""
+Multiplexed reads for POST /api/batch.
+
+A batch runs each sub-request through the app's router as if it were its own
+GET request, so routing, validation, dependencies (including rate limits) and
+serialization are unchanged. Middleware is not run again for sub-requests; the
+batch request itself went through it.
+
+While a batch runs, `current_batch` holds its context, and two dependencies
+read it:
+- `get_db` yields the batch's session instead of opening one. The session
+  reads from a single snapshot (REPEATABLE READ on PostgreSQL, one read
+  transaction on SQLite), so sub-requests see consistent data.
+- `get_current_user` returns the batch's user. The token is verified, and a
+  first-time user created, on a separate session before the snapshot is
+  opened: the snapshot is read-only, and committing would end it.
+
+Sub-requests run one after another. A Session is not thread-safe and the
+snapshot lives on one connection, so running them concurrently would mean
+giving up the shared snapshot. Each one is a few milliseconds of database
+work; the batch saves the round trips and token checks around them.
+"""
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import orjson
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from starlette.types import ASGIApp, Message, Scope
+
+from app.core import concurrency
+
+
+MAX_REQUESTS = 20
+MAX_COST = 20
+# Cost of one sub-request per route class; searches scan, so they count for more
+COSTS = {"read": 1, "search": 5}
+ALLOWED_PREFIXES = ("/api/gigs", "/api/users", "/api/reviews", "/api/applications")
+
+
+class BatchContext:
+    def __init__(self, db: Session, uid: Optional[str] = None, auth_error: Optional[HTTPException] = None):
+        self.db = db
+        self.uid = uid  # Verified caller, if the batch carried a valid token
+        self.auth_error = auth_error  # Raised to sub-requests that need a user when the token was rejected
+        self.user: Optional[dict] = None  # Loaded from the snapshot by get_current_user on first use
+
+
+current_batch: ContextVar[Optional[BatchContext]] = ContextVar("current_batch", default=None)
+
+
+def begin_snapshot(db: Session) -> None:
+    """Make every read on `db` until it is closed see the same snapshot"""
+    connection = db.connection()
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+    elif connection.dialect.name == "sqlite":
+        # pysqlite only opens a transaction before writes; reads would each see the latest data
+        connection.exec_driver_sql("BEGIN")
+
+
+def split_path(path: str) -> Tuple[str, bytes]:
+    """(path, query string) of a sub-request, or ValueError if batching it is not allowed"""
+    parts = urlsplit(path)
+    if parts.scheme or parts.netloc or not any(
+        parts.path == prefix or parts.path.startswith(prefix + "/") for prefix in ALLOWED_PREFIXES
+    ):
+        raise ValueError(f"{path!r} is not a gigs, users, reviews or applications path")
+    return parts.path, parts.query.encode()
+
+
+def cost(path: str, query_string: bytes) -> int:
+    return COSTS.get(concurrency.route_class("GET", path, query_string), COSTS["search"])
+
+
+async def dispatch(app: ASGIApp, parent: Scope, path: str, query_string: bytes) -> Tuple[int, Optional[bytes], bool]:
+    """Run one GET through `app`; returns (status, body, whether the body is JSON)"""
+    scope = {k: v for k, v in parent.items() if k not in ("route", "endpoint", "path_params", "router")}
+    scope.update({
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string,
+        "headers": [(k, v) for k, v in parent["headers"] if k not in (b"content-length", b"content-type")],
+    })
+    status = 500
+    is_json = False
+    chunks: List[bytes] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        nonlocal status, is_json
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            is_json = any(
+                k == b"content-type" and v.startswith(b"application/json") for k, v in message.get("headers", ())
+            )
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks) or None, is_json
+
+
+def encode_response(request_id: Optional[str], status: int, body: Optional[bytes], is_json: bool) -> bytes:
+    """One entry of the batch response; JSON bodies are spliced in without re-encoding"""
+    if body is None:
+        encoded = b"null"
+    elif is_json:
+        encoded = body
+    else:
+        encoded = orjson.dumps(body.decode("utf-8", "replace"))
+    return b'{"id":%s,"status":%d,"body":%s}' % (orjson.dumps(request_id), status, encoded)
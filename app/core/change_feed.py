@@ -0,0 +1,87 @@
+"""
+Incremental gig sync for clients that keep a local copy of the gigs they show.
+
+Every gig write appends a row to `gig_changes` in its own transaction (see
+crud.record_gig_changes). The row's id is the feed's sequence, and a token is
+an encoded id: GET /api/gigs/changes?since=<token> returns each gig changed
+after it once, with its current state, or its id under `deleted`.
+
+On PostgreSQL a change can commit after one with a higher id. So the returned
+token never moves past a change younger than GIG_CHANGES_SETTLE_SECONDS
+(default 5); such changes are returned again on the next call, and applying
+them twice is harmless because each carries the gig's whole state. Changes
+older than GIG_CHANGES_RETENTION_DAYS (default 30) are purged. A token from
+before the oldest retained change is rejected, and the client must reload its
+gigs in full.
+"""
+import base64
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.crud import crud
+from app.models.models import Gig
+
+
+SETTLE = timedelta(seconds=float(os.getenv("GIG_CHANGES_SETTLE_SECONDS", "5")))
+RETENTION = timedelta(days=int(os.getenv("GIG_CHANGES_RETENTION_DAYS", "30")))
+MAX_LIMIT = 1000
+
+_PREFIX = b"gc1:"
+
+
+class TokenExpired(Exception):
+    """The changes after this token are no longer retained"""
+
+
+def encode_token(change_id: int) -> str:
+    return base64.urlsafe_b64encode(_PREFIX + str(change_id).encode()).decode().rstrip("=")
+
+
+def decode_token(token: str) -> int:
+    """Change id of a token, or ValueError if it was not issued by this feed"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (TypeError, ValueError):
+        raise ValueError("Malformed change token")
+    if not raw.startswith(_PREFIX) or not raw[len(_PREFIX):].isdigit():
+        raise ValueError("Malformed change token")
+    return int(raw[len(_PREFIX):])
+
+
+def head(db: Session) -> int:
+    """Id of the newest change; a client that loads its gigs after reading it misses nothing"""
+    return crud.gig_change_id_range(db)[1] or 0
+
+
+def changes_since(db: Session, since: int, limit: int) -> Tuple[List[Gig], List[int], int, bool]:
+    """
+    (changed gigs, deleted gig ids, next change id, whether more are waiting)
+    for up to `limit` changes after `since`.
+    """
+    oldest, newest = crud.gig_change_id_range(db)
+    # Ahead of the log means the token belongs to another (e.g. restored) database
+    if since > (newest or 0) or (oldest is not None and since < oldest - 1):
+        raise TokenExpired()
+    rows = crud.get_gig_changes_after(db, since, limit)
+
+    # Later changes of a gig supersede earlier ones
+    latest: Dict[int, str] = {}
+    for row in rows:
+        latest.pop(row.gig_id, None)
+        latest[row.gig_id] = row.op
+
+    next_id = since
+    settled = datetime.utcnow() - SETTLE
+    for row in rows:
+        if row.created_at > settled:
+            break
+        next_id = row.id
+
+    live = {gig.id: gig for gig in crud.get_gigs_by_ids(db, [g for g, op in latest.items() if op == "upsert"])}
+    # A gig missing here was deleted by a change past this page
+    gigs = [live[gig_id] for gig_id in latest if gig_id in live]
+    deleted = [gig_id for gig_id in latest if gig_id not in live]
+    return gigs, deleted, next_id, len(rows) == limit and next_id > since
@@ -0,0 +1,179 @@
+"""
+Per-route-class concurrency limits with bounded, deadline-aware queueing.
+
+Every /api request is classified as `read`, `search`, `export` or `write` and
+must take a slot in that class's pool before it reaches the app. When the estimated wait
+for a slot exceeds the pool's budget (or the queue is full) the request is shed
+immediately with 503 + Retry-After instead of queueing until the client gives up.
+This keeps slow searches from starving cheap lookups and writes. A streamed
+export holds its slot until the last byte is sent, so exports get a small pool
+of their own and slow download clients can't use up the others.
+
+Pools are per worker process and configured through environment variables:
+CONCURRENCY_<CLASS>_LIMIT, CONCURRENCY_<CLASS>_QUEUE and
+CONCURRENCY_<CLASS>_WAIT_MS (e.g. CONCURRENCY_SEARCH_LIMIT=8).
+"""
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+import anyio
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.metrics import CONCURRENCY_QUEUED, CONCURRENCY_SHED
+
+
+# route class: (slots, max queued requests, wait budget in ms)
+DEFAULT_POOLS = {
+    "read": (24, 200, 2000),
+    "search": (8, 50, 3000),
+    "write": (8, 100, 5000),
+    "export": (2, 10, 10000),
+}
+
+SERVICE_TIME_ALPHA = 0.1  # EWMA weight of the most recent request
+
+
+class Overloaded(Exception):
+    def __init__(self, pool: str, retry_after: float):
+        self.pool = pool
+        self.retry_after = retry_after
+
+
+class RoutePool:
+    def __init__(self, name: str, limit: int, max_queue: int, wait_budget: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.wait_budget = wait_budget
+        self.in_flight = 0
+        self.queued = 0
+        self.completed = 0
+        self.shed = 0
+        self.avg_service_time = 0.05  # seconds, refined as requests complete
+        self._semaphore = anyio.Semaphore(limit)
+
+    def estimated_wait(self) -> float:
+        """Time until a new arrival would get a slot, if queued requests drain `limit` at a time"""
+        if self.in_flight < self.limit and self.queued == 0:
+            return 0.0
+        return (self.queued + 1) / self.limit * self.avg_service_time
+
+    def _reject(self, wait: float) -> Overloaded:
+        self.shed += 1
+        CONCURRENCY_SHED.labels(self.name).inc()
+        return Overloaded(self.name, max(wait, self.avg_service_time))
+
+    async def _wait_for_slot(self) -> None:
+        wait = self.estimated_wait()
+        if self.queued >= self.max_queue or wait > self.wait_budget:
+            raise self._reject(wait)
+
+        queued_gauge = CONCURRENCY_QUEUED.labels(self.name)
+        self.queued += 1
+        queued_gauge.inc()
+        try:
+            with anyio.move_on_after(self.wait_budget) as scope:
+                await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+            queued_gauge.dec()
+        if scope.cancelled_caught:
+            raise self._reject(self.estimated_wait())
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        try:
+            self._semaphore.acquire_nowait()
+        except anyio.WouldBlock:
+            await self._wait_for_slot()
+
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.avg_service_time += SERVICE_TIME_ALPHA * (elapsed - self.avg_service_time)
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "shed": self.shed,
+            "avg_service_ms": round(self.avg_service_time * 1000, 2),
+            "estimated_wait_ms": round(self.estimated_wait() * 1000, 2),
+        }
+
+
+def _build_pools() -> Dict[str, RoutePool]:
+    pools = {}
+    for name, (limit, max_queue, wait_ms) in DEFAULT_POOLS.items():
+        prefix = f"CONCURRENCY_{name.upper()}"
+        pools[name] = RoutePool(
+            name,
+            limit=int(os.getenv(f"{prefix}_LIMIT", limit)),
+            max_queue=int(os.getenv(f"{prefix}_QUEUE", max_queue)),
+            wait_budget=int(os.getenv(f"{prefix}_WAIT_MS", wait_ms)) / 1000,
+        )
+    return pools
+
+
+pools = _build_pools()
+
+
+def total_slots() -> int:
+    """Thread pool size needed so every admitted request can run a sync handler"""
+    return sum(pool.limit for pool in pools.values())
+
+
+def route_class(method: str, path: str, query_string: bytes) -> Optional[str]:
+    """Classify a request; None means it bypasses the pools (health checks, docs)"""
+    if not path.startswith("/api/"):
+        return None
+    if path.rstrip("/") == "/api/events":
+        return None  # Long-lived SSE streams would hold a slot for their whole life
+    if path.rstrip("/") == "/api/batch":
+        return "search"  # Several reads, possibly searches, in one request
+    if method in ("GET", "HEAD"):
+        if path.startswith("/api/export/"):
+            return "export"
+        if path.rstrip("/") == "/api/gigs" and (b"search=" in query_string or b"skills=" in query_string):
+            return "search"
+        return "read"
+    if method == "OPTIONS":
+        return None
+    return "write"
+
+
+class ConcurrencyLimitMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        name = route_class(scope["method"], scope["path"], scope.get("query_string", b""))
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            async with pools[name].slot():
+                await self.app(scope, receive, send)
+        except Overloaded as e:
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry later"},
+                status_code=503,
+                headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+            )
+            await response(scope, receive, send)
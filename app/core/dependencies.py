@@ -1,11 +1,15 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from app.core.batch import current_batch
+from app.core.metrics import FIREBASE_VERIFY_FAILURES, FIREBASE_VERIFY_LATENCY
 from app.db.database import SessionLocal
 from typing import Generator, Optional
 import firebase_admin
 from firebase_admin import credentials, auth
+import hmac
 import os
+import time
 
 
 # Initialize Firebase Admin (only once)
@@ -42,10 +46,35 @@ if not firebase_admin._apps:
 security = HTTPBearer()
 
 
+def verify_id_token(token: str) -> dict:
+    """
+    Verify a Firebase ID token, recording latency and failures in metrics
+    """
+    start = time.perf_counter()
+    try:
+        return auth.verify_id_token(token)
+    except auth.ExpiredIdTokenError:
+        FIREBASE_VERIFY_FAILURES.labels("expired").inc()
+        raise
+    except auth.InvalidIdTokenError:
+        FIREBASE_VERIFY_FAILURES.labels("invalid").inc()
+        raise
+    except Exception:
+        FIREBASE_VERIFY_FAILURES.labels("error").inc()
+        raise
+    finally:
+        FIREBASE_VERIFY_LATENCY.observe(time.perf_counter() - start)
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Database session dependency
     """
+    batch = current_batch.get()
+    if batch is not None:
+        # Shared by every sub-request of a batch and closed by it
+        yield batch.db
+        return
     db = SessionLocal()
     try:
         yield db
@@ -60,12 +89,29 @@ async def get_current_user(
     """
     Verify Firebase token and return user info.
     Creates user in database if doesn't exist.
+    Within a batch the token was already verified (and the user created) before
+    the batch's read-only snapshot was opened; the user is read from the snapshot.
+    """
+    batch = current_batch.get()
+    if batch is not None:
+        if batch.auth_error is not None:
+            raise batch.auth_error
+        if batch.user is None:
+            from app.crud import crud
+            user = crud.get_user(db, batch.uid)
+            batch.user = {"uid": batch.uid, "email": user.email, "name": user.name, "db_user": user}
+        return batch.user
+    return authenticate(credentials.credentials, db)
+
+
+def authenticate(token: str, db: Session) -> dict:
+    """
+    Verify a Firebase ID token and return the current-user dict, creating the
+    user on first sign-in. Raises 401 HTTPException if the token is not valid.
     """
-    token = credentials.credentials
-    
     try:
         # Verify the Firebase ID token
-        decoded_token = auth.verify_id_token(token)
+        decoded_token = verify_id_token(token)
         uid = decoded_token['uid']
         email = decoded_token.get('email')
         name = decoded_token.get('name')
@@ -104,7 +150,7 @@ async def verify_firebase_token(token: str) -> dict:
     Raises HTTPException if token is invalid.
     """
     try:
-        decoded_token = auth.verify_id_token(token)
+        decoded_token = verify_id_token(token)
         return decoded_token
     except auth.InvalidIdTokenError:
         raise HTTPException(
@@ -138,3 +184,38 @@ async def get_current_user_optional(
         return await get_current_user(credentials, db)
     except HTTPException:
         return None
+
+
+async def get_stream_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+    token: Optional[str] = Query(None, description="ID token, for EventSource clients that cannot set headers")
+) -> str:
+    """
+    Authenticate a long-lived stream from the Authorization header or `?token=`
+    and return the uid. Skips the database: the stream only needs the uid.
+    """
+    id_token = credentials.credentials if credentials else token
+    if not id_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated"
+        )
+    decoded_token = await verify_firebase_token(id_token)
+    return decoded_token["uid"]
+
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    Guard for operational endpoints: requires `X-Admin-Token: <ADMIN_TOKEN>`.
+    The endpoints answer 404 when ADMIN_TOKEN is not configured.
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin token"
+        )
@@ -0,0 +1,54 @@
+"""
+Sparse fieldsets: `?fields=id,title,budget` on read endpoints.
+
+The requested fields are validated against the endpoint's response schema,
+passed to crud so only those columns are loaded (`load_only`), and used to
+build a trimmed response model so only those fields are serialized.
+"""
+from functools import lru_cache
+from typing import Callable, Optional, Tuple, Type
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel, ConfigDict, create_model
+
+
+def sparse_fields(model: Type[BaseModel]) -> Callable[..., Optional[Tuple[str, ...]]]:
+    """
+    Build a dependency that parses the `fields` query parameter for `model`.
+    Resolves to None when no fieldset was requested.
+    """
+    allowed = tuple(model.model_fields)
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Comma-separated subset of fields to return: {', '.join(allowed)}"
+        )
+    ) -> Optional[Tuple[str, ...]]:
+        if not fields:
+            return None
+        requested = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = requested.difference(allowed)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+        # Keep schema order so trimmed models are cached once per fieldset
+        return tuple(name for name in allowed if name in requested) or None
+
+    return dependency
+
+
+def fieldset_model(model: Type[BaseModel], fields: Optional[Tuple[str, ...]]) -> Type[BaseModel]:
+    """The model to serialize a response with: `model` itself or its trimmed copy"""
+    return trimmed_model(model, fields) if fields else model
+
+
+@lru_cache(maxsize=256)
+def trimmed_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Return (and cache) a copy of `model` restricted to `fields`"""
+    return create_model(
+        f"{model.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields}
+    )
@@ -0,0 +1,73 @@
+"""
+Validators and caching headers for versioned read endpoints.
+
+An endpoint that serves a versioned resource first reads its version (a
+primary-key lookup of a version column), derives a weak ETag and
+Last-Modified from it, and answers a matching If-None-Match or
+If-Modified-Since with 304 before loading the body. Tags are weak because a
+CDN may re-encode (compress) the body.
+
+Cache-Control lets shared caches serve repeat reads for HTTP_CACHE_S_MAXAGE
+seconds (default 60) and makes browsers revalidate every time, which costs
+them a 304 when nothing changed.
+"""
+import hashlib
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+from fastapi import Request, Response
+
+
+S_MAXAGE = int(os.getenv("HTTP_CACHE_S_MAXAGE", "60"))
+STALE_WHILE_REVALIDATE = int(os.getenv("HTTP_CACHE_STALE_WHILE_REVALIDATE", "300"))
+CACHE_CONTROL = f"public, max-age=0, s-maxage={S_MAXAGE}, stale-while-revalidate={STALE_WHILE_REVALIDATE}"
+
+
+def etag(*parts) -> str:
+    """Weak entity tag for a representation identified by `parts` (resource, id, version, options)"""
+    return 'W/"%s"' % hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Stored timestamps are naive UTC; HTTP dates have whole seconds
+    return value.replace(tzinfo=value.tzinfo or timezone.utc, microsecond=0)
+
+
+def not_modified(request: Request, tag: str, last_modified: Optional[datetime]) -> bool:
+    """Whether the client's cached copy is current; If-None-Match takes precedence over If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        current = tag.removeprefix("W/")
+        return any(
+            candidate == "*" or candidate.removeprefix("W/") == current
+            for candidate in (c.strip() for c in if_none_match.split(","))
+        )
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _as_utc(last_modified) <= _as_utc(since)
+    return False
+
+
+def validators(tag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {"ETag": tag, "Cache-Control": CACHE_CONTROL}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def not_modified_response(tag: str, last_modified: Optional[datetime]) -> Response:
+    return Response(status_code=304, headers=validators(tag, last_modified))
+
+
+def with_validators(response: Response, tag: str, last_modified: Optional[datetime]) -> Response:
+    response.headers.update(validators(tag, last_modified))
+    return response
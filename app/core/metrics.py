@@ -0,0 +1,205 @@
+"""
+Prometheus metrics, served at GET /metrics.
+
+Under gunicorn every worker writes its samples to PROMETHEUS_MULTIPROC_DIR
+(set up by gunicorn.conf.py) and the scraping worker aggregates all of them,
+so counts cover the whole server rather than whichever worker answered.
+Without that variable metrics are kept in process memory.
+
+HTTP metrics are labelled with the route's path template (e.g.
+/api/gigs/{gig_id}), never the raw path. SQL statements are attributed to the
+route that issued them through a per-request context variable.
+"""
+import os
+import time
+from contextvars import ContextVar
+from typing import List, Optional
+import anyio
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1, 5)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"], buckets=LATENCY_BUCKETS
+)
+HTTP_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being served", ["method"], multiprocess_mode="livesum"
+)
+
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed", ["route"])
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "SQL statement latency", ["route"], buckets=QUERY_BUCKETS
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections", "Connections checked out of the pool", multiprocess_mode="livesum"
+)
+
+FIREBASE_VERIFY_LATENCY = Histogram(
+    "firebase_verify_duration_seconds", "Firebase ID token verification latency", buckets=LATENCY_BUCKETS
+)
+FIREBASE_VERIFY_FAILURES = Counter(
+    "firebase_verify_failures_total", "Failed Firebase ID token verifications", ["reason"]
+)
+
+THREADPOOL_BUSY = Gauge(
+    "threadpool_busy_threads", "Worker threads running sync handlers", multiprocess_mode="livesum"
+)
+THREADPOOL_SIZE = Gauge(
+    "threadpool_size_threads", "Worker thread limit", multiprocess_mode="livesum"
+)
+
+CONCURRENCY_QUEUED = Gauge(
+    "concurrency_queued_requests", "Requests waiting for a route class slot", ["pool"],
+    multiprocess_mode="livesum"
+)
+CONCURRENCY_SHED = Counter("concurrency_shed_total", "Requests rejected with 503 by load shedding", ["pool"])
+RATE_LIMITED = Counter("rate_limited_total", "Requests rejected with 429 by rate limiting", ["policy"])
+SINGLE_FLIGHT_CALLS = Counter(
+    "single_flight_calls_total", "Coalescable reads by outcome (executed or coalesced)", ["group", "result"]
+)
+
+OUTBOX_EVENTS = Counter(
+    "outbox_events_total", "Outbox events handled by topic and outcome (done, retry, dead)", ["topic", "result"]
+)
+OUTBOX_LAG = Histogram(
+    "outbox_event_lag_seconds", "Time from an event's write to its successful dispatch", ["topic"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600)
+)
+OUTBOX_BACKLOG = Gauge("outbox_backlog_events", "Pending outbox events", multiprocess_mode="livemax")
+OUTBOX_OLDEST_AGE = Gauge(
+    "outbox_oldest_pending_age_seconds", "Age of the oldest pending outbox event", multiprocess_mode="livemax"
+)
+
+PUSH_SUBSCRIBERS = Gauge(
+    "push_subscribers", "Open real-time event streams", multiprocess_mode="livesum"
+)
+PUSH_EVENTS = Counter("push_events_total", "Events sent to real-time streams", ["topic"])
+PUSH_RESETS = Counter("push_resets_total", "Streams told to refetch because events could not be replayed")
+
+SCHEDULER_LEADER = Gauge(
+    "scheduler_leader", "1 on the worker holding the scheduler lease", multiprocess_mode="livesum"
+)
+SCHEDULER_JOB_RUNS = Counter("scheduler_job_runs_total", "Background job runs by outcome", ["job", "result"])
+SCHEDULER_JOB_ROWS = Counter("scheduler_job_rows_total", "Rows changed by background jobs", ["job"])
+SCHEDULER_JOB_DURATION = Histogram(
+    "scheduler_job_duration_seconds", "Background job run time", ["job"], buckets=LATENCY_BUCKETS
+)
+
+
+class _RequestStats:
+    __slots__ = ("query_durations", "scope")
+
+    def __init__(self, scope: Scope):
+        self.query_durations: List[float] = []
+        self.scope = scope
+
+
+_request_stats: ContextVar[Optional[_RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def _route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def current_route() -> str:
+    """Route label of the request being served, or "none" outside a request"""
+    stats = _request_stats.get()
+    return _route_label(stats.scope) if stats is not None else "none"
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        THREADPOOL_BUSY.set(limiter.borrowed_tokens)
+        THREADPOOL_SIZE.set(limiter.total_tokens)
+
+        stats = _RequestStats(scope)
+        token = _request_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            _request_stats.reset(token)
+            route = _route_label(scope)
+            HTTP_LATENCY.labels(method, route).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            if stats.query_durations:
+                DB_QUERIES.labels(route).inc(len(stats.query_durations))
+                query_latency = DB_QUERY_LATENCY.labels(route)
+                for duration in stats.query_durations:
+                    query_latency.observe(duration)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record SQL statement timings and pool usage for `engine`"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start"].pop()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.query_durations.append(duration)
+        else:
+            DB_QUERIES.labels("none").inc()
+            DB_QUERY_LATENCY.labels("none").observe(duration)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+    @event.listens_for(engine, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(engine, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+
+
+def render() -> bytes:
+    """Current metrics in Prometheus text format, aggregated across workers if multiprocess"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
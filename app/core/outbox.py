@@ -0,0 +1,134 @@
+"""
+Transactional outbox dispatch.
+
+Writes that have side effects add an `outbox_events` row through
+crud.enqueue_event in the same transaction, and the request does nothing more.
+The worker (`python -m app.worker`) then does the side effects:
+
+1. It claims due events in batches. PostgreSQL uses SKIP LOCKED, so several
+   workers can run at once. A claim lasts OUTBOX_CLAIM_SECONDS (default 60),
+   and a crashed worker's events are picked up again once the claim expires.
+2. It passes each event to every handler registered for its topic.
+3. An event is marked done when all handlers succeed. If one fails, the event
+   is retried with exponential backoff and jitter. After OUTBOX_MAX_ATTEMPTS
+   (default 8) failures it is marked dead.
+
+Delivery is at least once, so handlers must be idempotent.
+
+Topics:
+- gig.created: gig_id, owner_id
+- application.submitted: application_id, gig_id, applicant_id, owner_id
+- application.selected: application_id, gig_id, applicant_id, owner_id
+- application.rejected: application_id, gig_id, applicant_id, owner_id
+- gig.completed: gig_id, owner_id, applicant_id
+
+The API workers also stream these rows to users (app.core.push).
+"""
+import logging
+import os
+import random
+import socket
+import threading
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from app.core.metrics import OUTBOX_BACKLOG, OUTBOX_EVENTS, OUTBOX_LAG, OUTBOX_OLDEST_AGE
+from app.crud import crud
+from app.db.database import SessionLocal
+from app.models.models import OutboxEvent
+
+
+BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "1"))
+CLAIM_SECONDS = int(os.getenv("OUTBOX_CLAIM_SECONDS", "60"))
+MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+
+BACKOFF_BASE_SECONDS = 2
+BACKOFF_MAX_SECONDS = 3600
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict], None]
+
+handlers: Dict[str, List[Handler]] = defaultdict(list)
+
+
+def handler(topic: str) -> Callable[[Handler], Handler]:
+    """Register a function to receive the payload of every `topic` event"""
+
+    def register(func: Handler) -> Handler:
+        handlers[topic].append(func)
+        return func
+
+    return register
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with full jitter: up to base * 2^(attempts - 1) seconds, capped"""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempts - 1)))
+
+
+class OutboxWorker:
+    def __init__(self, batch_size: int = BATCH_SIZE, poll_seconds: float = POLL_SECONDS):
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+
+    def _dispatch(self, event: OutboxEvent) -> Optional[str]:
+        """Run the topic's handlers; returns the error if one failed"""
+        for func in handlers.get(event.topic, []):
+            try:
+                func(event.payload)
+            except Exception as e:
+                return f"{func.__name__}: {type(e).__name__}: {e}"
+        return None
+
+    def run_once(self) -> int:
+        """Claim and dispatch one batch; returns the number of events claimed"""
+        with SessionLocal() as db:
+            events = crud.claim_outbox_events(
+                db, self.worker_id, datetime.utcnow(), self.batch_size, timedelta(seconds=CLAIM_SECONDS)
+            )
+            for event in events:
+                error = self._dispatch(event)
+                now = datetime.utcnow()
+                if error is None:
+                    OUTBOX_LAG.labels(event.topic).observe((now - event.created_at).total_seconds())
+                    crud.complete_outbox_event(db, event, now)
+                    OUTBOX_EVENTS.labels(event.topic, "done").inc()
+                elif event.attempts + 1 >= MAX_ATTEMPTS:
+                    logger.error(
+                        "Outbox event %s (%s) is dead after %s attempts: %s",
+                        event.id, event.topic, event.attempts + 1, error,
+                    )
+                    crud.fail_outbox_event(db, event, error, retry_at=None)
+                    OUTBOX_EVENTS.labels(event.topic, "dead").inc()
+                else:
+                    retry_at = now + timedelta(seconds=retry_delay(event.attempts + 1))
+                    crud.fail_outbox_event(db, event, error, retry_at=retry_at)
+                    OUTBOX_EVENTS.labels(event.topic, "retry").inc()
+            return len(events)
+
+    def update_backlog(self) -> None:
+        with SessionLocal() as db:
+            pending, oldest = crud.outbox_backlog(db)
+        OUTBOX_BACKLOG.set(pending)
+        OUTBOX_OLDEST_AGE.set((datetime.utcnow() - oldest).total_seconds() if oldest else 0)
+
+    def run(self) -> None:
+        """Poll until stop(); full batches are followed straight away by the next claim"""
+        while not self._stop.is_set():
+            try:
+                claimed = self.run_once()
+                self.update_backlog()
+            except Exception:
+                logger.exception("Outbox poll failed")
+                claimed = 0
+            if claimed < self.batch_size:
+                self._stop.wait(self.poll_seconds)
+
+    def stop(self) -> None:
+        self._stop.set()
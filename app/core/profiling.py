@@ -0,0 +1,169 @@
+"""
+Opt-in sampling profiler for individual requests.
+
+Profiling is off unless PROFILE_TOKEN or PROFILE_SAMPLE_RATE is set; when off
+the middleware and engine hooks are not installed at all. When on, a request
+is profiled if it sends `X-Profile: <PROFILE_TOKEN>` or is picked at random
+with probability PROFILE_SAMPLE_RATE.
+
+A profiled request gets a sampler thread that snapshots the stacks of the
+threads serving it every PROFILE_INTERVAL_MS (default 5). Those threads are the
+event loop and any worker thread seen running SQL for the request. Two files
+are written to PROFILE_DIR (default /tmp/tujitume-profiles):
+
+- `<id>.collapsed`: collapsed stacks, ready for flamegraph.pl or speedscope
+- `<id>.sql.json`: the request's SQL timeline (offset, duration, statement)
+
+The profile id is returned in the X-Profile-Id response header.
+"""
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Set
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL = int(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+PROFILE_DIR = os.getenv("PROFILE_DIR", "/tmp/tujitume-profiles")
+
+MAX_STATEMENT_CHARS = 2000
+
+
+def enabled() -> bool:
+    return bool(PROFILE_TOKEN) or PROFILE_SAMPLE_RATE > 0
+
+
+class _ProfileSession:
+    def __init__(self, profile_id: str, loop_thread: int):
+        self.profile_id = profile_id
+        self.start = time.perf_counter()
+        self.threads: Set[int] = {loop_thread}
+        self.stacks: Counter = Counter()
+        self.queries: List[dict] = []
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name=f"profiler-{profile_id}", daemon=True)
+
+    def start_sampling(self) -> None:
+        self._sampler.start()
+
+    def stop_sampling(self) -> None:
+        self._stop.set()
+        self._sampler.join()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(PROFILE_INTERVAL):
+            frames = sys._current_frames()
+            for thread_id in list(self.threads):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.stacks[_collapse(frame)] += 1
+
+    def record_query(self, started: float, duration: float, statement: str) -> None:
+        self.queries.append({
+            "offset_ms": round((started - self.start) * 1000, 3),
+            "duration_ms": round(duration * 1000, 3),
+            "statement": statement[:MAX_STATEMENT_CHARS],
+        })
+
+    def write(self, method: str, route: str, status_code: int) -> None:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        base = os.path.join(PROFILE_DIR, self.profile_id)
+        with open(f"{base}.collapsed", "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        with open(f"{base}.sql.json", "w") as f:
+            json.dump({
+                "method": method,
+                "route": route,
+                "status": status_code,
+                "duration_ms": round((time.perf_counter() - self.start) * 1000, 3),
+                "samples": sum(self.stacks.values()),
+                "queries": self.queries,
+            }, f, indent=2)
+
+
+_active: ContextVar[Optional[_ProfileSession]] = ContextVar("profile_session", default=None)
+
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _should_profile(scope: Scope) -> bool:
+    if PROFILE_TOKEN:
+        for name, value in scope.get("headers", []):
+            if name == b"x-profile":
+                return hmac.compare_digest(value.decode("latin-1"), PROFILE_TOKEN)
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+class ProfilerMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        session = _ProfileSession(uuid.uuid4().hex[:12], threading.get_ident())
+        token = _active.set(session)
+        status_code = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = session.profile_id
+            await send(message)
+
+        session.start_sampling()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            session.stop_sampling()
+            _active.reset(token)
+            route = getattr(scope.get("route"), "path", scope["path"])
+            session.write(scope["method"], route, status_code)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach SQL timeline capture (and worker thread discovery) for profiled requests"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        session = _active.get()
+        if session is not None:
+            session.threads.add(threading.get_ident())
+            conn.info.setdefault("profile_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        session = _active.get()
+        starts = conn.info.get("profile_start")
+        if session is not None and starts:
+            started = starts.pop()
+            session.record_query(started, time.perf_counter() - started, statement)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("profile_start"):
+            conn.info["profile_start"].pop()
@@ -0,0 +1,195 @@
+"""
+Real-time push of application and gig events over Server-Sent Events.
+
+The outbox table is also the event log here. Each API worker runs one poller
+that reads rows past its cursor and sends them to the streams connected to that
+worker. The read is a primary-key range scan every PUSH_POLL_SECONDS (default
+1). Every worker reads the same rows, so a change made on any worker reaches
+subscribers on all of them without a separate broker. The poller only runs
+while the worker has subscribers.
+
+An event goes to the users named in its payload (`owner_id`, `applicant_id`).
+Each SSE message carries its outbox id as `id:`. A reconnecting client sends
+that as Last-Event-ID and the events it missed are replayed from the table.
+Sometimes the gap can't be replayed: the events were purged, or more than
+REPLAY_LIMIT events were written since. The stream then starts with a `reset`
+event, and the client should refetch once.
+
+On PostgreSQL a row can commit after one with a higher id. Ids skipped by the
+cursor are therefore re-checked for GAP_SECONDS before they are given up.
+Delivery is at least once: a resumed stream can repeat an event it replayed.
+"""
+import asyncio
+import os
+import time
+from collections import defaultdict
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import anyio
+import orjson
+
+from app.core.metrics import PUSH_EVENTS, PUSH_RESETS, PUSH_SUBSCRIBERS
+from app.crud import crud
+from app.db.database import SessionLocal
+
+
+POLL_SECONDS = float(os.getenv("PUSH_POLL_SECONDS", "1"))
+KEEPALIVE_SECONDS = 15  # Comment lines keep proxies from closing idle streams
+MAX_STREAMS_PER_USER = int(os.getenv("PUSH_MAX_STREAMS_PER_USER", "5"))
+
+TOPICS = {"application.submitted", "application.selected", "application.rejected", "gig.completed"}
+RECIPIENT_KEYS = ("owner_id", "applicant_id")
+
+BATCH_SIZE = 500  # Rows per poll
+REPLAY_LIMIT = 500  # Events read on reconnect before giving up with `reset`
+QUEUE_SIZE = 100  # Undelivered events per stream before it is reset
+GAP_SECONDS = 10
+MAX_GAPS = 1000
+
+RESET = b"event: reset\ndata: {}\n\n"
+
+
+def recipients(payload: dict) -> Set[str]:
+    return {payload[key] for key in RECIPIENT_KEYS if payload.get(key)}
+
+
+def format_event(event_id: int, topic: str, payload: dict) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, topic.encode(), orjson.dumps(payload))
+
+
+class Subscription:
+    def __init__(self, uid: str):
+        self.uid = uid
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    def put(self, event_id: int, message: bytes) -> None:
+        try:
+            self.queue.put_nowait((event_id, message))
+        except asyncio.QueueFull:
+            # The client is too slow to keep up; drop what it has queued and make it refetch
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait((None, RESET))
+            PUSH_RESETS.inc()
+
+
+class PushHub:
+    def __init__(self, poll_seconds: float = POLL_SECONDS):
+        self.poll_seconds = poll_seconds
+        self.subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self.cursor: Optional[int] = None
+        self.gaps: Dict[int, float] = {}  # Skipped id -> when it was first missed
+        self._task: Optional[asyncio.Task] = None
+
+    def at_capacity(self, uid: str) -> bool:
+        return len(self.subscribers.get(uid, ())) >= MAX_STREAMS_PER_USER
+
+    def subscribe(self, uid: str) -> Subscription:
+        subscription = Subscription(uid)
+        self.subscribers[uid].add(subscription)
+        PUSH_SUBSCRIBERS.inc()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        streams = self.subscribers.get(subscription.uid)
+        if streams is None or subscription not in streams:
+            return
+        streams.discard(subscription)
+        if not streams:
+            del self.subscribers[subscription.uid]
+        PUSH_SUBSCRIBERS.dec()
+
+    def _fetch(self) -> list:
+        with SessionLocal() as db:
+            if self.cursor is None:
+                self.cursor = crud.event_id_range(db)[1] or 0
+                return []
+            return crud.get_events_after(db, self.cursor, also=list(self.gaps), limit=BATCH_SIZE)
+
+    def _advance(self, rows: list) -> None:
+        now = time.monotonic()
+        for row in rows:
+            self.gaps.pop(row.id, None)
+            if row.id > self.cursor:
+                for missing in range(self.cursor + 1, min(row.id, self.cursor + 1 + MAX_GAPS)):
+                    self.gaps[missing] = now
+                self.cursor = row.id
+        self.gaps = {event_id: seen for event_id, seen in self.gaps.items() if now - seen < GAP_SECONDS}
+
+    def publish(self, rows: list) -> None:
+        for row in rows:
+            if row.topic not in TOPICS:
+                continue
+            message = format_event(row.id, row.topic, row.payload)
+            for uid in recipients(row.payload):
+                for subscription in self.subscribers.get(uid, ()):
+                    subscription.put(row.id, message)
+                    PUSH_EVENTS.labels(row.topic).inc()
+
+    async def _run(self) -> None:
+        self.cursor = None
+        self.gaps = {}
+        while self.subscribers:
+            try:
+                rows = await anyio.to_thread.run_sync(self._fetch)
+                self._advance(rows)
+                self.publish(rows)
+            except Exception as e:
+                print(f"Push poll failed: {e}")
+                rows = []
+            if len(rows) < BATCH_SIZE:
+                await asyncio.sleep(self.poll_seconds)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+hub = PushHub()
+
+
+def replay(uid: str, after_id: int) -> Tuple[List[Tuple[int, bytes]], bool]:
+    """Events for `uid` written after `after_id`, and whether that is all of them"""
+    with SessionLocal() as db:
+        oldest, _ = crud.event_id_range(db)
+        rows = crud.get_events_after(db, after_id, limit=REPLAY_LIMIT)
+    complete = (oldest is None or after_id >= oldest - 1) and len(rows) < REPLAY_LIMIT
+    events = [
+        (row.id, format_event(row.id, row.topic, row.payload))
+        for row in rows if row.topic in TOPICS and uid in recipients(row.payload)
+    ]
+    return events, complete
+
+
+async def stream(uid: str, last_event_id: Optional[int]) -> AsyncIterator[bytes]:
+    """SSE body: replay from `last_event_id`, then live events until the client disconnects"""
+    # Subscribed before the replay, so events written meanwhile are queued rather than lost
+    subscription = hub.subscribe(uid)
+    try:
+        yield b"retry: 3000\n\n"
+        replayed: Set[int] = set()
+        if last_event_id is not None:
+            events, complete = await anyio.to_thread.run_sync(replay, uid, last_event_id)
+            if not complete:
+                PUSH_RESETS.inc()
+                yield RESET
+            for event_id, message in events:
+                replayed.add(event_id)
+                yield message
+        while True:
+            try:
+                event_id, message = await asyncio.wait_for(subscription.queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if event_id not in replayed:
+                yield message
+    finally:
+        hub.unsubscribe(subscription)
@@ -0,0 +1,250 @@
+"""
+Token-bucket rate limiting for write and search endpoints.
+
+Routes opt in with a dependency:
+
+    @router.post("/{gig_id}/apply", dependencies=[Depends(rate_limit_user("apply"))])
+
+`rate_limit_user` keys buckets by Firebase uid (it runs after get_current_user),
+`rate_limit_ip` by client IP. Over-limit requests get 429 with Retry-After.
+Every limited response carries RateLimit-Limit/-Remaining/-Reset/-Policy headers,
+added by RateLimitHeadersMiddleware.
+
+Buckets live in process memory by default. Set
+RATE_LIMIT_STORE=sqlite:////path/to/ratelimit.db so all workers on a host share
+one set of buckets. Policies can be overridden with
+RATE_LIMIT_<POLICY>="<requests>/<seconds>" (e.g. RATE_LIMIT_APPLY=20/60).
+
+Per-IP buckets use the socket peer address unless RATE_LIMIT_TRUSTED_PROXIES
+is set to the number of proxies in front of the app that append to
+X-Forwarded-For (1 on Render or behind a single load balancer). The client
+can write anything into the header, so only the hop appended by the
+outermost trusted proxy is used.
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+from fastapi import Depends, HTTPException, Request, status
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.dependencies import get_current_user
+from app.core.metrics import RATE_LIMITED
+
+
+# policy: (requests, window in seconds); a full bucket allows a burst of `requests`
+DEFAULT_POLICIES = {
+    "apply": (10, 60),
+    "write": (30, 60),
+    "bulk": (5, 300),
+    "search": (60, 60),
+}
+
+MAX_MEMORY_BUCKETS = 100_000
+TRUSTED_PROXIES = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "0"))
+
+
+@dataclass(frozen=True)
+class Policy:
+    name: str
+    capacity: int
+    window: int
+
+    @property
+    def rate(self) -> float:
+        """Tokens refilled per second"""
+        return self.capacity / self.window
+
+
+@dataclass(frozen=True)
+class BucketResult:
+    policy: Policy
+    allowed: bool
+    remaining: int
+    reset_after: float  # Seconds until the bucket is full again
+    retry_after: float  # Seconds until one token is available (0 if allowed)
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.policy.capacity),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+            "RateLimit-Policy": f"{self.policy.capacity};w={self.policy.window}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+def _take(tokens: float, updated: float, now: float, policy: Policy) -> Tuple[float, BucketResult]:
+    """Refill a bucket up to `now` and try to take one token; returns the new token count"""
+    tokens = min(policy.capacity, tokens + (now - updated) * policy.rate)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    result = BucketResult(
+        policy=policy,
+        allowed=allowed,
+        remaining=int(tokens),
+        reset_after=(policy.capacity - tokens) / policy.rate,
+        retry_after=0.0 if allowed else (1 - tokens) / policy.rate,
+    )
+    return tokens, result
+
+
+class MemoryBucketStore:
+    """Per-process buckets; each gunicorn worker enforces its own limit"""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, policy: Policy) -> BucketResult:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (policy.capacity, now))
+            tokens, result = _take(tokens, updated, now, policy)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > MAX_MEMORY_BUCKETS:
+                self._prune(now)
+        return result
+
+    def _prune(self, now: float) -> None:
+        # Buckets idle for longer than the longest window are full again; forget them
+        idle = max(p.window for p in policies.values())
+        self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < idle}
+
+
+class SQLiteBucketStore:
+    """Buckets in a SQLite file shared by every worker on the host"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets "
+                "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, policy: Policy) -> BucketResult:
+        conn = self._connect()
+        now = time.time()  # Wall clock: shared between processes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated = row if row else (policy.capacity, now)
+            tokens, result = _take(tokens, updated, now, policy)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                (key, tokens, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+
+def _build_store():
+    url = os.getenv("RATE_LIMIT_STORE", "memory")
+    if url.startswith("sqlite:///"):
+        return SQLiteBucketStore(url[len("sqlite:///"):])
+    return MemoryBucketStore()
+
+
+def _build_policies() -> Dict[str, Policy]:
+    result = {}
+    for name, (capacity, window) in DEFAULT_POLICIES.items():
+        override = os.getenv(f"RATE_LIMIT_{name.upper()}")
+        if override:
+            capacity, window = (int(part) for part in override.split("/"))
+        result[name] = Policy(name, capacity, window)
+    return result
+
+
+policies = _build_policies()
+store = _build_store()
+
+
+def client_ip(request: Request, trusted_proxies: int = TRUSTED_PROXIES) -> str:
+    """
+    Client address: the X-Forwarded-For hop appended by the outermost of
+    `trusted_proxies` proxies, or the peer address when none are trusted.
+    Hops left of that one are client-supplied and ignored.
+    """
+    if trusted_proxies > 0:
+        hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        if len(hops) >= trusted_proxies:
+            return hops[-trusted_proxies]
+    return request.client.host if request.client else "unknown"
+
+
+def _check(request: Request, policy_name: str, key: str) -> None:
+    policy = policies[policy_name]
+    result = store.take(f"{policy_name}:{key}", policy)
+    request.state.rate_limit = result
+    if not result.allowed:
+        RATE_LIMITED.labels(policy_name).inc()
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers=result.headers()
+        )
+
+
+def rate_limit_user(policy_name: str) -> Callable[..., None]:
+    """Dependency limiting the authenticated user under `policy_name`"""
+    def dependency(request: Request, current_user: dict = Depends(get_current_user)) -> None:
+        _check(request, policy_name, f"user:{current_user['uid']}")
+    return dependency
+
+
+def rate_limit_ip(
+    policy_name: str, when: Optional[Callable[[Request], bool]] = None
+) -> Callable[..., None]:
+    """Dependency limiting the client IP under `policy_name`, only if `when(request)` holds"""
+    def dependency(request: Request) -> None:
+        if when is None or when(request):
+            _check(request, policy_name, f"ip:{client_ip(request)}")
+    return dependency
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Add RateLimit-* headers to responses of rate-limited routes. Done here rather
+    than in the dependency because routes may return a Response directly.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                result = scope.get("state", {}).get("rate_limit")
+                if result is not None:
+                    headers = MutableHeaders(scope=message)
+                    for name, value in result.headers().items():
+                        if name not in headers:
+                            headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,197 @@
+"""
+In-memory skill index of open gigs for "gigs for me" recommendations.
+
+Each worker keeps an inverted index from skill to the open gigs that need it,
+plus each gig's creation time and budget. A background thread builds it at
+startup. Every RECOMMEND_REFRESH_SECONDS (default 2) the thread applies the
+gigs whose `updated_at` moved since the last pass: new gigs are added, edits
+re-index skills and budget, and gigs that are no longer open are removed. The
+read uses ix_gigs_updated_at_id, so a change on any worker reaches every
+worker's index within a couple of seconds. Deleted gigs are dropped when the
+route loads the gig rows, and the hourly full rebuild removes them from the
+index.
+
+Ranking combines three parts:
+- match: IDF-weighted share of the user's skills the gig needs, so rare skills
+  count for more than common ones
+- recency: halves every RECENCY_HALF_LIFE_DAYS
+- budget: log-scaled against the largest budget in the index
+
+Only the newest CANDIDATES gigs across the user's skills are scored (split
+evenly between the skills). That keeps ranking at a few milliseconds at 1M open
+gigs; older gigs rank low on recency anyway. Memory is roughly 0.35 KB per open
+gig per worker. Set RECOMMENDATIONS_ENABLED=false to skip the index on a worker.
+"""
+import heapq
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.crud import crud
+from app.db.database import SessionLocal
+from app.models.models import GigStatus
+
+
+RECOMMENDATIONS_ENABLED = os.getenv("RECOMMENDATIONS_ENABLED", "true").lower() not in ("0", "false", "no")
+REFRESH_SECONDS = float(os.getenv("RECOMMEND_REFRESH_SECONDS", "2"))
+
+REBUILD_SECONDS = 3600
+SYNC_BATCH_SIZE = 1000
+SYNC_OVERLAP = timedelta(seconds=10)  # Re-read window for late commits and clock skew between workers
+CANDIDATES = 4000
+RECENCY_HALF_LIFE_DAYS = 7
+
+MATCH_WEIGHT = 0.7
+RECENCY_WEIGHT = 0.2
+BUDGET_WEIGHT = 0.1
+
+
+def normalize_skill(skill: str) -> str:
+    return " ".join(skill.lower().split())
+
+
+class GigIndex:
+    def __init__(self):
+        self.ready = threading.Event()
+        self._lock = threading.Lock()
+        self._skill_ids: Dict[str, int] = {}
+        self._postings: Dict[int, Dict[int, None]] = defaultdict(dict)  # Skill -> gig ids, oldest first
+        self._gigs: Dict[int, Tuple[Tuple[int, ...], float, float]] = {}  # Gig -> (skills, created, budget)
+        self._max_log_budget = 0.0
+        self.watermark: Optional[datetime] = None  # Highest updated_at applied
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._gigs)
+
+    def _skill_id(self, skill: str) -> int:
+        return self._skill_ids.setdefault(normalize_skill(skill), len(self._skill_ids))
+
+    def _remove(self, gig_id: int) -> None:
+        entry = self._gigs.pop(gig_id, None)
+        if entry is None:
+            return
+        for skill in entry[0]:
+            posting = self._postings[skill]
+            posting.pop(gig_id, None)
+            if not posting:
+                del self._postings[skill]
+
+    def apply(self, gig_id: int, status: str, skills: Optional[Sequence[str]],
+              created_at: Optional[datetime], budget: Optional[float]) -> None:
+        """Add, update or remove one gig to match its current row; the caller holds the lock"""
+        skill_ids = tuple({self._skill_id(s) for s in skills or () if isinstance(s, str) and s.strip()})
+        current = self._gigs.get(gig_id)
+        if status != GigStatus.OPEN.value or not skill_ids:
+            self._remove(gig_id)
+            return
+        if current is None or current[0] != skill_ids:
+            # Changed skills go to the end of their postings, like a new gig
+            self._remove(gig_id)
+            for skill in skill_ids:
+                self._postings[skill][gig_id] = None
+        created = created_at.timestamp() if created_at else 0.0
+        self._gigs[gig_id] = (skill_ids, created, budget or 0.0)
+        self._max_log_budget = max(self._max_log_budget, math.log1p(budget or 0.0))
+
+    def rebuild(self) -> None:
+        """Load every open gig into a fresh index and swap it in"""
+        fresh = GigIndex()
+        started = datetime.utcnow()
+        with SessionLocal() as db:
+            for row in crud.stream_open_gig_skills(db):
+                fresh.apply(row.id, GigStatus.OPEN.value, row.skills_required, row.created_at, row.budget)
+        with self._lock:
+            self._skill_ids = fresh._skill_ids
+            self._postings = fresh._postings
+            self._gigs = fresh._gigs
+            self._max_log_budget = fresh._max_log_budget
+            # Changes made while loading are re-read by the next sync
+            self.watermark = started
+        self.ready.set()
+
+    def sync(self) -> int:
+        """Apply gigs updated since the watermark; returns the number of rows read"""
+        after: Tuple[datetime, int] = (self.watermark - SYNC_OVERLAP, 0)
+        total = 0
+        with SessionLocal() as db:
+            while True:
+                rows = crud.get_gigs_updated_after(db, *after, limit=SYNC_BATCH_SIZE)
+                with self._lock:
+                    for row in rows:
+                        self.apply(row.id, row.status, row.skills_required, row.created_at, row.budget)
+                    if rows:
+                        self.watermark = max(self.watermark, rows[-1].updated_at)
+                total += len(rows)
+                if len(rows) < SYNC_BATCH_SIZE:
+                    return total
+                after = (rows[-1].updated_at, rows[-1].id)
+
+    def recommend(self, skills: Iterable[str], limit: int, now: Optional[float] = None) -> List[Tuple[int, float]]:
+        """Top `limit` (gig id, score) pairs for a user with `skills`, best first"""
+        now = now or datetime.utcnow().timestamp()  # Naive UTC, like created_at
+        with self._lock:
+            total_gigs = len(self._gigs)
+            weights = {}
+            for skill in {normalize_skill(s) for s in skills if isinstance(s, str)}:
+                skill_id = self._skill_ids.get(skill)
+                if skill_id is not None and skill_id in self._postings:
+                    weights[skill_id] = math.log(1 + total_gigs / len(self._postings[skill_id]))
+            if not weights:
+                return []
+
+            per_skill = CANDIDATES // len(weights)
+            matched: Dict[int, float] = defaultdict(float)
+            for skill_id, weight in weights.items():
+                for gig_id in islice(reversed(self._postings[skill_id]), per_skill):
+                    matched[gig_id] += weight
+
+            total_weight = sum(weights.values())
+            budget_scale = self._max_log_budget or 1.0
+            decay = math.log(2) / (RECENCY_HALF_LIFE_DAYS * 86400)
+
+            def score(item: Tuple[int, float]) -> float:
+                _, created, budget = self._gigs[item[0]]
+                return (
+                    MATCH_WEIGHT * item[1] / total_weight
+                    + RECENCY_WEIGHT * math.exp(-decay * max(0.0, now - created))
+                    + BUDGET_WEIGHT * math.log1p(budget) / budget_scale
+                )
+
+            best = heapq.nlargest(limit, matched.items(), key=score)
+            return [(gig_id, round(score((gig_id, match)), 4)) for gig_id, match in best]
+
+    def _loop(self) -> None:
+        last_rebuild = None
+        while not self._stop.is_set():
+            try:
+                if last_rebuild is None or time.monotonic() - last_rebuild >= REBUILD_SECONDS:
+                    self.rebuild()
+                    last_rebuild = time.monotonic()
+                else:
+                    self.sync()
+            except Exception as e:
+                print(f"Recommendation index refresh failed: {e}")
+            self._stop.wait(REFRESH_SECONDS)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="recommendations", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+
+index = GigIndex()
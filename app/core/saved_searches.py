@@ -0,0 +1,63 @@
+"""
+Percolation of new gigs against saved searches.
+
+Running every saved search against every new gig costs one query per search.
+Instead, each saved search stores a few anchor keys in `saved_search_anchors`,
+and every gig that matches the search carries at least one of them:
+
+- skills: one `skill:<name>` key per skill, since any one of them matches
+- otherwise search: the `text:<trigram>` key of one trigram of the search
+  text, since a gig containing the text contains all its trigrams
+- otherwise budget_type: `budget_type:<type>`
+
+A new gig looks up its own keys (its skills, the trigrams of its title,
+description and location, and its budget type) in the anchor table's primary
+key. Only the saved searches found that way are checked against the gig in
+full, with the same rules as the `GET /api/gigs/` filters. The cost per gig
+depends on the gig's size and on how many searches are candidates, not on how
+many searches exist.
+"""
+from typing import List, Optional, Set
+
+# Trigrams made of these letters appear in most text, so they make poor anchors
+_COMMON_LETTERS = set("etaoinsrhl ")
+
+
+def trigrams(text: str) -> Set[str]:
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def anchor_keys(search: Optional[str], skills: Optional[List[str]], budget_type: Optional[str]) -> List[str]:
+    """Keys under which a saved search is indexed; every matching gig carries one of them"""
+    if skills:
+        return [f"skill:{skill}" for skill in dict.fromkeys(skills)]
+    if search:
+        # The rarest-looking trigram keeps the candidate list short
+        best = max(sorted(trigrams(search)), key=lambda t: sum(c not in _COMMON_LETTERS for c in t))
+        return [f"text:{best}"]
+    return [f"budget_type:{budget_type}"]
+
+
+def gig_keys(gig) -> List[str]:
+    """Anchor keys carried by a gig"""
+    keys = {f"skill:{skill}" for skill in gig.skills_required or []}
+    for text in (gig.title, gig.description, gig.location):
+        if text:
+            keys.update(f"text:{trigram}" for trigram in trigrams(text))
+    if gig.budget_type:
+        keys.add(f"budget_type:{gig.budget_type}")
+    return sorted(keys)
+
+
+def matches(saved_search, gig) -> bool:
+    """Whether `gig` passes every filter of `saved_search`, as GET /api/gigs/ would apply them"""
+    if saved_search.budget_type and gig.budget_type != saved_search.budget_type:
+        return False
+    if saved_search.skills and not any(skill in (gig.skills_required or []) for skill in saved_search.skills):
+        return False
+    if saved_search.search:
+        needle = saved_search.search.lower()
+        if not any(needle in text.lower() for text in (gig.title, gig.description, gig.location) if text):
+            return False
+    return True
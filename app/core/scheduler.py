@@ -0,0 +1,246 @@
+"""
+In-process background scheduler with leader election.
+
+Every worker starts a scheduler thread from the app lifespan, but only the
+worker holding the `scheduler_leases` lock row runs jobs. The lease lasts
+SCHEDULER_LEASE_SECONDS (default 30) and the leader renews it on every tick
+(SCHEDULER_TICK_SECONDS, default 5), before each job and between a job's
+batches, so a long pass never outlives it. If a renewal fails, the pass stops
+at once. If the leader dies, another worker takes over once the lease expires.
+The lock row works the same on SQLite and PostgreSQL. Expiry times come from
+each worker's clock, so all workers should share a host or be NTP-synced.
+
+Jobs change rows in bounded batches (SCHEDULER_BATCH_SIZE, default 500). Each
+batch is its own short transaction, and one run does at most MAX_BATCHES
+batches, so jobs never hold long locks on the hot tables. A run that hits the
+cap just continues on its next interval.
+
+Default jobs:
+- expire_gigs: open gigs past their deadline become expired (every minute)
+- reject_pending_applications: pending applications on gigs that are no longer
+  open are rejected (every minute)
+- purge_outbox_events: outbox events processed more than OUTBOX_RETENTION_DAYS
+  (default 7) ago are deleted (hourly)
+- purge_gig_changes: change-feed entries older than GIG_CHANGES_RETENTION_DAYS
+  (default 30) are deleted (hourly)
+- archive_gigs: gigs completed or expired more than GIG_ARCHIVE_AFTER_DAYS
+  (default 90) ago move to the archive tables with their applications (hourly)
+- optimize: `PRAGMA optimize` on SQLite, `ANALYZE` on PostgreSQL (every 6 hours)
+
+Set SCHEDULER_ENABLED=false to run no jobs in this process.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from functools import partial
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+from sqlalchemy import insert, or_, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core import change_feed
+from app.core.metrics import SCHEDULER_JOB_DURATION, SCHEDULER_JOB_ROWS, SCHEDULER_JOB_RUNS, SCHEDULER_LEADER
+from app.crud import crud
+from app.db.database import SessionLocal, engine
+from app.models.models import SchedulerLease
+
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() not in ("0", "false", "no")
+LEASE_SECONDS = int(os.getenv("SCHEDULER_LEASE_SECONDS", "30"))
+TICK_SECONDS = int(os.getenv("SCHEDULER_TICK_SECONDS", "5"))
+BATCH_SIZE = int(os.getenv("SCHEDULER_BATCH_SIZE", "500"))
+OUTBOX_RETENTION = timedelta(days=int(os.getenv("OUTBOX_RETENTION_DAYS", "7")))
+ARCHIVE_AFTER = timedelta(days=int(os.getenv("GIG_ARCHIVE_AFTER_DAYS", "90")))
+
+MAX_BATCHES = 20  # Per job run
+BATCH_PAUSE_SECONDS = 0.05  # Between batches, so request traffic gets the locks
+LEASE_NAME = "scheduler"
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseLost(Exception):
+    """Another worker took the lease during a pass"""
+
+
+@dataclass
+class Job:
+    name: str
+    interval: float  # Seconds between runs
+    run: Callable[[Callable[[], None]], int]  # Takes the lease renewal; returns rows changed
+    last_run: Optional[float] = None
+    last_result: Optional[str] = None
+    last_rows: int = 0
+
+    def due(self, now: float) -> bool:
+        return self.last_run is None or now - self.last_run >= self.interval
+
+
+def batched(step: Callable[[Session, datetime, int], int]) -> Callable[[Callable[[], None]], int]:
+    """Run a crud housekeeping step batch by batch until it runs dry or hits MAX_BATCHES"""
+
+    def run(renew_lease: Callable[[], None]) -> int:
+        total = 0
+        for _ in range(MAX_BATCHES):
+            renew_lease()
+            with SessionLocal() as db:
+                changed = step(db, datetime.utcnow(), BATCH_SIZE)
+            total += changed
+            if changed < BATCH_SIZE:
+                break
+            time.sleep(BATCH_PAUSE_SECONDS)
+        return total
+
+    return run
+
+
+def optimize(renew_lease: Callable[[], None]) -> int:
+    """Refresh planner statistics"""
+    with engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            conn.exec_driver_sql("PRAGMA optimize")
+        elif conn.dialect.name == "postgresql":
+            conn.exec_driver_sql("ANALYZE gigs, applications, reviews, outbox_events")
+    return 0
+
+
+class Scheduler:
+    def __init__(self, engine: Engine, lease_seconds: int = LEASE_SECONDS, tick_seconds: int = TICK_SECONDS):
+        self.engine = engine
+        self.lease_seconds = lease_seconds
+        self.tick_seconds = tick_seconds
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self.jobs: Dict[str, Job] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_job(self, name: str, interval: float, run: Callable[[Callable[[], None]], int]) -> None:
+        self.jobs[name] = Job(name, interval, run)
+
+    def _acquire_lease(self) -> bool:
+        """Take or renew the lease; True if this process holds it"""
+        table = SchedulerLease.__table__
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        with self.engine.begin() as conn:
+            renewed = conn.execute(
+                update(table)
+                .where(table.c.name == LEASE_NAME, or_(table.c.holder == self.holder, table.c.expires_at < now))
+                .values(holder=self.holder, expires_at=expires_at)
+            )
+            if renewed.rowcount:
+                return True
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(table).values(name=LEASE_NAME, holder=self.holder, expires_at=expires_at))
+            return True
+        except IntegrityError:
+            return False  # Another worker holds an unexpired lease
+
+    def _renew_lease(self) -> None:
+        """Renew the lease mid-pass, or raise LeaseLost"""
+        self._set_leader(self._acquire_lease())
+        if not self.is_leader:
+            raise LeaseLost()
+
+    def _release_lease(self) -> None:
+        table = SchedulerLease.__table__
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(table)
+                .where(table.c.name == LEASE_NAME, table.c.holder == self.holder)
+                .values(expires_at=datetime.utcnow())
+            )
+
+    def _set_leader(self, leader: bool) -> None:
+        if leader != self.is_leader:
+            SCHEDULER_LEADER.set(1 if leader else 0)
+            self.is_leader = leader
+
+    def run_due_jobs(self) -> None:
+        for job in self.jobs.values():
+            now = time.monotonic()
+            if self._stop.is_set() or not job.due(now):
+                continue
+            self._renew_lease()
+            job.last_run = now
+            start = time.perf_counter()
+            try:
+                job.last_rows = job.run(self._renew_lease)
+                job.last_result = "ok"
+                SCHEDULER_JOB_ROWS.labels(job.name).inc(job.last_rows)
+            except LeaseLost:
+                job.last_result = "lease lost"
+                raise
+            except Exception as e:
+                job.last_result = f"error: {e}"
+                logger.exception("Scheduler job %s failed", job.name)
+            SCHEDULER_JOB_RUNS.labels(job.name, "ok" if job.last_result == "ok" else "error").inc()
+            SCHEDULER_JOB_DURATION.labels(job.name).observe(time.perf_counter() - start)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._set_leader(self._acquire_lease())
+                if self.is_leader:
+                    self.run_due_jobs()
+            except LeaseLost:
+                logger.warning("Scheduler lease lost to another worker; pass stopped")
+            except Exception:
+                self._set_leader(False)
+                logger.exception("Scheduler tick failed")
+            self._stop.wait(self.tick_seconds)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        if self.is_leader:
+            # Let another worker take over right away instead of after the lease expires
+            self._release_lease()
+            self._set_leader(False)
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        return {
+            "enabled": SCHEDULER_ENABLED,
+            "holder": self.holder,
+            "leader": self.is_leader,
+            "jobs": {
+                job.name: {
+                    "interval_seconds": job.interval,
+                    "seconds_since_run": round(now - job.last_run, 1) if job.last_run is not None else None,
+                    "last_result": job.last_result,
+                    "last_rows": job.last_rows,
+                }
+                for job in self.jobs.values()
+            },
+        }
+
+
+scheduler = Scheduler(engine)
+scheduler.add_job("expire_gigs", 60, batched(crud.expire_gigs))
+scheduler.add_job("reject_pending_applications", 60, batched(crud.reject_pending_applications))
+scheduler.add_job(
+    "purge_outbox_events", 3600, batched(partial(crud.purge_outbox_events, retention=OUTBOX_RETENTION))
+)
+scheduler.add_job(
+    "purge_gig_changes", 3600, batched(partial(crud.purge_gig_changes, retention=change_feed.RETENTION))
+)
+scheduler.add_job("archive_gigs", 3600, batched(partial(crud.archive_gigs, age=ARCHIVE_AFTER)))
+scheduler.add_job("optimize", 6 * 3600, optimize)
@@ -0,0 +1,56 @@
+"""
+Fast JSON serialization for list endpoints.
+
+By default FastAPI validates the returned ORM objects into the response model,
+converts them to Python primitives, and then encodes them with the response
+class. For large pages that dominates CPU time. `list_response` validates once
+with a cached pydantic-core TypeAdapter and dumps straight to JSON bytes.
+"""
+from functools import lru_cache
+from typing import Any, Iterable, List, Type
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Build (once per model) the adapter for a list of `model`"""
+    return TypeAdapter(List[model])
+
+
+def dump_list(model: Type[BaseModel], items: Iterable[Any]) -> bytes:
+    """
+    Serialize ORM objects or `Row` tuples as a JSON array of `model`.
+    """
+    adapter = list_adapter(model)
+    return adapter.dump_json(adapter.validate_python(list(items), from_attributes=True))
+
+
+@lru_cache(maxsize=None)
+def object_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Build (once per model) the adapter for a single `model`"""
+    return TypeAdapter(model)
+
+
+def dump_object(model: Type[BaseModel], item: Any) -> bytes:
+    """Serialize one ORM object or `Row` as JSON `model`"""
+    adapter = object_adapter(model)
+    return adapter.dump_json(adapter.validate_python(item, from_attributes=True))
+
+
+def json_response(content: bytes, status_code: int = 200) -> Response:
+    """Wrap an already serialized JSON body"""
+    return Response(content=content, status_code=status_code, media_type="application/json")
+
+
+def object_response(model: Type[BaseModel], item: Any, status_code: int = 200) -> Response:
+    """Single-object counterpart of `list_response`"""
+    return json_response(dump_object(model, item), status_code)
+
+
+def list_response(model: Type[BaseModel], items: Iterable[Any], status_code: int = 200) -> Response:
+    """
+    Return `items` as a JSON response, bypassing FastAPI's response_model serialization.
+    Keep `response_model` on the route so the OpenAPI schema stays accurate.
+    """
+    return json_response(dump_list(model, items), status_code)
@@ -0,0 +1,95 @@
+"""
+Single-flight coalescing of identical concurrent reads within a worker.
+
+When many identical requests arrive together (e.g. a gig shared on social
+media), only the first runs its query and serialization. The others wait for
+it and reuse the same JSON body. A finished result stays shareable for a short
+grace window (SINGLE_FLIGHT_GRACE_MS, default 50) to absorb stragglers.
+
+Only serialized bytes are shared, never ORM objects, so callers do not leak
+state across database sessions. Errors are shared with requests already
+waiting but never cached.
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional
+from app.core.metrics import SINGLE_FLIGHT_CALLS
+
+
+GRACE_SECONDS = int(os.getenv("SINGLE_FLIGHT_GRACE_MS", "50")) / 1000
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "expires")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[bytes] = None
+        self.error: Optional[BaseException] = None
+        self.expires = 0.0
+
+
+class SingleFlight:
+    def __init__(self, name: str, grace: float = GRACE_SECONDS):
+        self.name = name
+        self.grace = grace
+        self.executions = 0  # Calls that ran the loader
+        self.coalesced = 0  # Calls that reused another call's result
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, load: Callable[[], bytes]) -> bytes:
+        """Return `load()`, sharing one execution among concurrent callers with the same key"""
+        now = time.monotonic()
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and (not call.done.is_set() or now < call.expires):
+                self.coalesced += 1
+                SINGLE_FLIGHT_CALLS.labels(self.name, "coalesced").inc()
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                SINGLE_FLIGHT_CALLS.labels(self.name, "executed").inc()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = load()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            call.expires = time.monotonic() + (self.grace if call.error is None else 0)
+            call.done.set()
+            self._prune(key, call)
+
+    def _prune(self, key: Hashable, call: _Call) -> None:
+        with self._lock:
+            if call.error is not None and self._calls.get(key) is call:
+                del self._calls[key]
+            # Entries only live for the grace window, so this scan stays short
+            now = time.monotonic()
+            expired = [k for k, c in self._calls.items() if c.done.is_set() and c.expires <= now]
+            for k in expired:
+                del self._calls[k]
+
+    def stats(self) -> dict:
+        total = self.executions + self.coalesced
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalescing_ratio": round(self.coalesced / total, 4) if total else 0.0,
+            "in_flight": sum(1 for c in self._calls.values() if not c.done.is_set()),
+        }
+
+
+gig_reads = SingleFlight("gig_reads")
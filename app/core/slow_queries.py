@@ -0,0 +1,289 @@
+"""
+Slow-query recorder.
+
+Every SQL statement that takes longer than SLOW_QUERY_MS (default 200, 0
+turns the recorder off) is fingerprinted. To build the fingerprint, literals
+and placeholder lists are normalized, so `IN (?, ?, ?)` and `IN (?)` are the
+same query shape. Each fingerprint gets an aggregate entry holding its count,
+total and max duration, the routes that issued it and its bind-parameter
+shapes (types only, never values).
+
+The first time a fingerprint turns up, and again once EXPLAIN_REFRESH_SECONDS
+have passed, the statement is queued for a background thread. That thread runs
+`EXPLAIN` on its own connection (`EXPLAIN QUERY PLAN` on SQLite) with the
+captured parameters, so the request that hit the slow query never waits for
+the plan.
+
+Occurrences and plans are appended as JSON lines to SLOW_QUERY_LOG (default
+/tmp/tujitume-slow-queries-{pid}.log). The log rotates at SLOW_QUERY_LOG_BYTES
+and keeps 5 backups. The per-worker aggregate is served at
+GET /admin/slow-queries.
+"""
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.metrics import current_route
+
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "/tmp/tujitume-slow-queries-{pid}.log")
+SLOW_QUERY_LOG_BYTES = int(os.getenv("SLOW_QUERY_LOG_BYTES", str(10 * 1024 * 1024)))
+
+EXPLAIN_REFRESH_SECONDS = 3600
+EXPLAIN_QUEUE_SIZE = 64
+MAX_FINGERPRINTS = 500
+MAX_LABELS = 20  # Distinct routes / parameter shapes kept per fingerprint
+MAX_STATEMENT_CHARS = 2000
+
+EXPLAINABLE = ("select", "with", "insert", "update", "delete")
+
+_explaining: ContextVar[bool] = ContextVar("slow_query_explaining", default=False)
+
+
+def enabled() -> bool:
+    return SLOW_QUERY_MS > 0
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_NAMED_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_REPEATED_ROWS = re.compile(r"(\(\?\))(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(statement: str) -> str:
+    """Statement with literals and placeholder lists collapsed to `?`"""
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _NAMED_PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    sql = _PLACEHOLDER_LIST.sub("(?)", sql)
+    return _REPEATED_ROWS.sub(r"\1", sql)
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Bind-parameter types, e.g. `(str, int, int)` or `{gig_id: int}`"""
+    if executemany:
+        rows = list(parameters or [])
+        first = parameter_shape(rows[0]) if rows else "()"
+        return f"{len(rows)} x {first}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+def explain(conn: Connection, statement: str, parameters: Any = None) -> List[str]:
+    """
+    Plan for a DBAPI-level statement, one line per step: `EXPLAIN QUERY PLAN`
+    on SQLite (indented by nesting), plain `EXPLAIN` elsewhere
+    """
+    sqlite = conn.dialect.name == "sqlite"
+    prefix = "EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN "
+    rows = conn.exec_driver_sql(prefix + statement, parameters or ()).fetchall()
+    if sqlite:
+        # (id, parent, notused, detail): indent each step under its parent
+        depth = {0: -1}
+        plan = []
+        for node_id, parent, _, detail in rows:
+            depth[node_id] = depth.get(parent, -1) + 1
+            plan.append("  " * depth[node_id] + detail)
+        return plan
+    return [" | ".join(str(col) for col in row) if len(row) > 1 else str(row[0]) for row in rows]
+
+
+class _Entry:
+    __slots__ = (
+        "fingerprint", "statement", "count", "total_ms", "max_ms", "first_seen", "last_seen",
+        "routes", "parameter_shapes", "plan", "plan_at"
+    )
+
+    def __init__(self, fp: str, statement: str, now: float):
+        self.fingerprint = fp
+        self.statement = statement[:MAX_STATEMENT_CHARS]
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.first_seen = now
+        self.last_seen = now
+        self.routes: Dict[str, int] = {}
+        self.parameter_shapes: Dict[str, int] = {}
+        self.plan: Optional[List[str]] = None
+        self.plan_at: Optional[float] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "fingerprint": self.fingerprint,
+            "statement": self.statement,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "routes": self.routes,
+            "parameter_shapes": self.parameter_shapes,
+            "plan": self.plan,
+            "plan_at": self.plan_at,
+        }
+
+
+def _bump(counts: Dict[str, int], label: str) -> None:
+    if label in counts or len(counts) < MAX_LABELS:
+        counts[label] = counts.get(label, 0) + 1
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms: float, log_path: Optional[str] = None):
+        self.threshold_ms = threshold_ms
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._explain_queue: "queue.Queue" = queue.Queue(maxsize=EXPLAIN_QUEUE_SIZE)
+        self._worker: Optional[threading.Thread] = None
+        self._engine: Optional[Engine] = None
+        self._logger = self._build_logger(log_path) if log_path else None
+
+    @staticmethod
+    def _build_logger(log_path: str) -> logging.Logger:
+        path = log_path.format(pid=os.getpid())
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        logger = logging.getLogger(f"tujitume.slow_queries.{path}")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        if not logger.handlers:
+            logger.addHandler(RotatingFileHandler(path, maxBytes=SLOW_QUERY_LOG_BYTES, backupCount=5))
+        return logger
+
+    def _write(self, record: dict) -> None:
+        if self._logger is not None:
+            self._logger.info(json.dumps(record, default=str))
+
+    def record(self, statement: str, parameters: Any, executemany: bool, duration_ms: float, route: str) -> None:
+        normalized = normalize(statement)
+        fp = fingerprint(normalized)
+        shape = parameter_shape(parameters, executemany)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(fp)
+            if entry is None:
+                entry = _Entry(fp, normalized, now)
+                self._entries[fp] = entry
+                if len(self._entries) > MAX_FINGERPRINTS:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(fp)
+            entry.count += 1
+            entry.total_ms += duration_ms
+            entry.max_ms = max(entry.max_ms, duration_ms)
+            entry.last_seen = now
+            _bump(entry.routes, route)
+            _bump(entry.parameter_shapes, shape)
+            explain = entry.plan_at is None or now - entry.plan_at > EXPLAIN_REFRESH_SECONDS
+            if explain:
+                # Claimed here so concurrent occurrences don't queue the same plan
+                entry.plan_at = now
+
+        self._write({
+            "type": "slow_query", "at": now, "fingerprint": fp, "duration_ms": round(duration_ms, 3),
+            "route": route, "parameter_shape": shape, "statement": normalized[:MAX_STATEMENT_CHARS],
+        })
+        if explain and self._engine is not None and statement.lstrip()[:6].lower().startswith(EXPLAINABLE):
+            params = parameters[0] if executemany and parameters else parameters
+            self._enqueue_explain(fp, statement, params)
+
+    def _enqueue_explain(self, fp: str, statement: str, parameters: Any) -> None:
+        if isinstance(parameters, dict):
+            parameters = dict(parameters)
+        elif isinstance(parameters, list):
+            parameters = tuple(parameters)
+        try:
+            self._explain_queue.put_nowait((fp, statement, parameters))
+        except queue.Full:
+            with self._lock:
+                entry = self._entries.get(fp)
+                if entry is not None and entry.plan is None:
+                    entry.plan_at = None  # Retry on the next occurrence
+            return
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._explain_loop, name="slow-query-explain", daemon=True)
+                    self._worker.start()
+
+    def _explain_loop(self) -> None:
+        _explaining.set(True)
+        while True:
+            fp, statement, parameters = self._explain_queue.get()
+            try:
+                plan = self._explain(statement, parameters)
+            except Exception as e:
+                plan = [f"EXPLAIN failed: {e}"]
+            now = time.time()
+            with self._lock:
+                entry = self._entries.get(fp)
+                if entry is not None:
+                    entry.plan = plan
+                    entry.plan_at = now
+            self._write({"type": "plan", "at": now, "fingerprint": fp, "plan": plan})
+
+    def _explain(self, statement: str, parameters: Any) -> List[str]:
+        with self._engine.connect() as conn:
+            plan = explain(conn, statement, parameters)
+            conn.rollback()
+        return plan
+
+    def attach(self, engine: Engine) -> None:
+        self._engine = engine
+
+    def snapshot(self, sort: str = "total_ms", limit: int = 50) -> List[dict]:
+        with self._lock:
+            entries = [entry.as_dict() for entry in self._entries.values()]
+        entries.sort(key=lambda e: e[sort], reverse=True)
+        return entries[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+slow_queries = SlowQueryLog(SLOW_QUERY_MS, SLOW_QUERY_LOG if enabled() else None)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record statements on `engine` slower than SLOW_QUERY_MS"""
+    slow_queries.attach(engine)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info["slow_query_start"].pop()) * 1000
+        if duration_ms >= slow_queries.threshold_ms and not _explaining.get():
+            slow_queries.record(statement, parameters, executemany, duration_ms, current_route())
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("slow_query_start"):
+            conn.info["slow_query_start"].pop()
@@ -0,0 +1,242 @@
+"""
+In-memory prefix index for typeahead suggestions (GET /api/suggest).
+
+Two tables are kept per worker: skills (from `Gig.skills_required` and
+`User.skills`) and title terms (words of gig titles). Each holds a sorted list
+of normalized keys and a count per key. A prefix lookup bisects the list to
+the range of keys that start with it and returns the most frequent ones. Short
+prefixes cover thousands of keys, so their top completions are cached, and
+the cache is kept current as counts grow.
+
+A background thread builds the tables at startup from a streamed scan of the
+gigs and users tables. Every SUGGEST_REFRESH_SECONDS (default 2) it adds gigs
+created since the last pass (read by primary key). On PostgreSQL a gig can
+commit after one with a higher id, so ids skipped below the cursor are re-read
+for GAP_SECONDS before they are given up. Edited and deleted gigs and profile
+skill changes only move counts, and the hourly rebuild picks them up.
+Title terms seen only once are dropped at the rebuild to keep typos out and
+the tables small. Set SUGGEST_ENABLED=false to skip the index on a worker.
+"""
+import heapq
+import os
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.crud import crud
+from app.db.database import SessionLocal
+
+
+SUGGEST_ENABLED = os.getenv("SUGGEST_ENABLED", "true").lower() not in ("0", "false", "no")
+REFRESH_SECONDS = float(os.getenv("SUGGEST_REFRESH_SECONDS", "2"))
+
+REBUILD_SECONDS = 3600
+SYNC_BATCH_SIZE = 1000
+MAX_LIMIT = 10
+SCAN_LIMIT = 256  # Ranges wider than this use the cached top completions
+MIN_TERM_COUNT = 2
+MAX_KEY_LENGTH = 50
+GAP_SECONDS = 10
+MAX_GAPS = 1000  # Skipped ids re-read, counting back from the cursor
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = frozenset(
+    "and are for from get help looking need needed our the this with you your".split()
+)
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())[:MAX_KEY_LENGTH]
+
+
+def title_terms(title: Optional[str]) -> List[str]:
+    """Distinct words of a title worth suggesting"""
+    if not title:
+        return []
+    words = _WORD.findall(title.lower())
+    return list(dict.fromkeys(w for w in words if len(w) >= 3 and not w.isdigit() and w not in _STOPWORDS))
+
+
+class PrefixTable:
+    """Sorted keys with counts; returns the most frequent keys under a prefix"""
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._counts: Dict[str, int] = {}
+        self._labels: Dict[str, str] = {}  # Display form, only where it differs from the key
+        self._top: Dict[str, List[str]] = {}  # Prefix -> best MAX_LIMIT keys, for wide ranges
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _rank(self, key: str) -> Tuple[int, str]:
+        return -self._counts[key], key
+
+    def add(self, text: str, count: int = 1) -> None:
+        key = normalize(text)
+        if not key:
+            return
+        if key not in self._counts:
+            self._counts[key] = 0
+            insort(self._keys, key)
+            label = " ".join(text.split())[:MAX_KEY_LENGTH]
+            if label != key:
+                self._labels[key] = label
+        self._counts[key] += count
+        # Counts only grow between rebuilds, so a key can only move up in the cached lists
+        for end in range(1, len(key) + 1):
+            top = self._top.get(key[:end])
+            if top is None:
+                continue
+            if key not in top:
+                if len(top) == MAX_LIMIT and self._rank(key) > self._rank(top[-1]):
+                    continue
+                top.append(key)
+            top.sort(key=self._rank)
+            del top[MAX_LIMIT:]
+
+    def prune(self, min_count: int) -> None:
+        """Drop keys seen fewer than `min_count` times; the table must not be in use yet"""
+        self._keys = [k for k in self._keys if self._counts[k] >= min_count]
+        self._counts = {k: self._counts[k] for k in self._keys}
+        self._labels = {k: v for k, v in self._labels.items() if k in self._counts}
+        self._top.clear()
+
+    def complete(self, prefix: str, limit: int) -> List[Tuple[str, int]]:
+        """Up to `limit` (label, count) pairs for keys starting with `prefix`, most frequent first"""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        top = self._top.get(prefix)
+        if top is None:
+            lo = bisect_left(self._keys, prefix)
+            hi = bisect_left(self._keys, prefix + "\uffff", lo)
+            if hi - lo <= SCAN_LIMIT:
+                top = heapq.nsmallest(limit, self._keys[lo:hi], key=self._rank)
+            else:
+                top = self._top[prefix] = heapq.nsmallest(MAX_LIMIT, self._keys[lo:hi], key=self._rank)
+        return [(self._labels.get(k, k), self._counts[k]) for k in top[:limit]]
+
+    def memory_bytes(self) -> int:
+        """Approximate size of the table's containers and strings"""
+        size = sys.getsizeof(self._keys) + sys.getsizeof(self._counts) + sys.getsizeof(self._labels)
+        size += sum(sys.getsizeof(k) for k in self._keys) + sum(sys.getsizeof(v) for v in self._labels.values())
+        size += sys.getsizeof(self._top) + sum(sys.getsizeof(p) + sys.getsizeof(t) for p, t in self._top.items())
+        return size
+
+
+class SuggestIndex:
+    def __init__(self):
+        self.ready = threading.Event()
+        self._lock = threading.Lock()
+        self.skills = PrefixTable()
+        self.terms = PrefixTable()
+        self.last_gig_id = 0  # Highest gig id counted
+        self.gaps: Dict[int, float] = {}  # Skipped gig id -> when it was first missed
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_gig(self, gig_id: int, title: Optional[str], skills: Optional[Iterable[str]]) -> None:
+        """Count one gig's skills and title terms; the caller holds the lock"""
+        for skill in dict.fromkeys(s for s in skills or () if isinstance(s, str)):
+            self.skills.add(skill)
+        for term in title_terms(title):
+            self.terms.add(term)
+        self.gaps.pop(gig_id, None)
+        if gig_id > self.last_gig_id:
+            now = time.monotonic()
+            for missing in range(max(self.last_gig_id + 1, gig_id - MAX_GAPS), gig_id):
+                self.gaps[missing] = now
+            self.last_gig_id = gig_id
+            if len(self.gaps) > 2 * MAX_GAPS:
+                self._prune_gaps(now)
+
+    def _prune_gaps(self, now: float) -> None:
+        """Give up ids missed for GAP_SECONDS or more than MAX_GAPS below the cursor"""
+        floor = self.last_gig_id - MAX_GAPS
+        self.gaps = {
+            gig_id: seen for gig_id, seen in self.gaps.items() if gig_id > floor and now - seen < GAP_SECONDS
+        }
+
+    def rebuild(self) -> None:
+        """Count every gig and user into fresh tables and swap them in"""
+        fresh = SuggestIndex()
+        with SessionLocal() as db:
+            for row in crud.stream_gig_terms(db):
+                fresh.add_gig(row.id, row.title, row.skills_required)
+            for skills, in crud.stream_user_skills(db):
+                for skill in dict.fromkeys(s for s in skills or () if isinstance(s, str)):
+                    fresh.skills.add(skill)
+        fresh.terms.prune(MIN_TERM_COUNT)
+        fresh._prune_gaps(time.monotonic())
+        with self._lock:
+            self.skills = fresh.skills
+            self.terms = fresh.terms
+            # Gigs created while loading are read by the next sync
+            self.last_gig_id = fresh.last_gig_id
+            self.gaps = fresh.gaps
+        self.ready.set()
+
+    def sync(self) -> int:
+        """Count gigs created since the last pass; returns the number of rows read"""
+        total = 0
+        also = list(self.gaps)
+        with SessionLocal() as db:
+            while True:
+                after = self.last_gig_id
+                rows = crud.get_gigs_after_id(db, after, limit=SYNC_BATCH_SIZE, also=also)
+                with self._lock:
+                    for row in rows:
+                        self.add_gig(row.id, row.title, row.skills_required)
+                    self._prune_gaps(time.monotonic())
+                total += len(rows)
+                if sum(row.id > after for row in rows) < SYNC_BATCH_SIZE:
+                    return total
+                also = []
+
+    def suggest(self, prefix: str, limit: int) -> Dict[str, List[Tuple[str, int]]]:
+        limit = min(limit, MAX_LIMIT)
+        with self._lock:
+            return {"skills": self.skills.complete(prefix, limit), "terms": self.terms.complete(prefix, limit)}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready.is_set(),
+                "skills": len(self.skills),
+                "terms": len(self.terms),
+                "last_gig_id": self.last_gig_id,
+                "memory_bytes": self.skills.memory_bytes() + self.terms.memory_bytes(),
+            }
+
+    def _loop(self) -> None:
+        last_rebuild = None
+        while not self._stop.is_set():
+            try:
+                if last_rebuild is None or time.monotonic() - last_rebuild >= REBUILD_SECONDS:
+                    self.rebuild()
+                    last_rebuild = time.monotonic()
+                else:
+                    self.sync()
+            except Exception as e:
+                print(f"Suggest index refresh failed: {e}")
+            self._stop.wait(REFRESH_SECONDS)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="suggest", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+
+index = SuggestIndex()
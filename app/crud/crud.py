@@ -1,14 +1,53 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
-from typing import List, Optional
-from app.models.models import User, Gig, Application, Review
+from sqlalchemy.orm import Session, Query, aliased, contains_eager, load_only, selectinload
+from sqlalchemy import DateTime, or_, and_, delete, func, insert, literal, select, tuple_, update
+from sqlalchemy.engine import Result
+from typing import Collection, Dict, List, Optional, Sequence, Tuple
+from app.core import saved_searches
+from app.models.models import (
+    User, Gig, GigStatus, GigChange, Application, ArchivedGig, ArchivedApplication, Review, OutboxEvent,
+    SavedSearch, SavedSearchAnchor, SavedSearchMatch
+)
 from app.schemas import schemas
-from datetime import datetime
+from datetime import datetime, timedelta
+
+
+def _load_only(query: Query, model, fields: Optional[Sequence[str]]) -> Query:
+    """
+    Restrict a query to the columns named in a sparse fieldset.
+    Names that are not columns (e.g. relationships) are ignored; the primary key
+    is always loaded.
+    """
+    if fields:
+        columns = model.__table__.columns
+        query = query.options(load_only(*[getattr(model, f) for f in fields if f in columns]))
+    return query
 
 
 # User CRUD
-def get_user(db: Session, uid: str) -> Optional[User]:
-    return db.query(User).filter(User.uid == uid).first()
+def get_user(db: Session, uid: str, fields: Optional[Sequence[str]] = None) -> Optional[User]:
+    query = _load_only(db.query(User), User, fields)
+    return query.filter(User.uid == uid).first()
+
+
+def get_user_version(db: Session, uid: str):
+    """Row with the user's updated_at, the version of the profile; None if the user does not exist"""
+    return db.execute(select(User.updated_at).where(User.uid == uid)).first()
+
+
+def get_user_reviews_version(db: Session, uid: str):
+    """
+    Row with the user's reviews_version and reviews_updated_at, and the latest
+    updated_at of the reviewers (their profiles are embedded in the review
+    list); None if the user does not exist
+    """
+    Reviewer = aliased(User)
+    reviewers_updated_at = select(func.max(Reviewer.updated_at)).join(
+        Review, Review.reviewer_id == Reviewer.uid
+    ).where(Review.reviewed_user_id == uid).scalar_subquery()
+    return db.execute(
+        select(User.reviews_version, User.reviews_updated_at, reviewers_updated_at.label("reviewers_updated_at"))
+        .where(User.uid == uid)
+    ).first()
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -46,9 +85,28 @@ def update_user(db: Session, uid: str, user_update: schemas.UserUpdate) -> Optio
     return db_user
 
 
+def stream_user_skills(db: Session) -> Result:
+    """Skills list of every user that has one, in batches"""
+    stmt = select(User.skills).where(User.skills.isnot(None))
+    return db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+
 # Gig CRUD
-def get_gig(db: Session, gig_id: int) -> Optional[Gig]:
-    return db.query(Gig).filter(Gig.id == gig_id).first()
+def _newest_first(*groups: list) -> list:
+    """Merge lists that are each sorted newest first by created_at"""
+    rows = [row for group in groups for row in group]
+    return sorted(rows, key=lambda row: row.created_at or datetime.min, reverse=True)
+
+
+def get_gig(
+    db: Session, gig_id: int, fields: Optional[Sequence[str]] = None, include_archived: bool = False
+) -> Optional[Gig]:
+    """A gig by id; with `include_archived`, falls back to archived_gigs (read-only rows)"""
+    query = _load_only(db.query(Gig), Gig, fields)
+    gig = query.filter(Gig.id == gig_id).first()
+    if gig is None and include_archived:
+        gig = _load_only(db.query(ArchivedGig), ArchivedGig, fields).filter(ArchivedGig.id == gig_id).first()
+    return gig
 
 
 def get_gigs(
@@ -59,9 +117,16 @@ def get_gigs(
     sort_order: str = "desc",
     budget_type: Optional[str] = None,
     skills: Optional[List[str]] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    status: Optional[str] = None
 ) -> List[Gig]:
-    query = db.query(Gig)
+    query = _load_only(db.query(Gig), Gig, fields)
+    
+    # Filter by lifecycle status. Rendered as a literal rather than a bound
+    # parameter so the planner can match the partial indexes on open gigs.
+    if status:
+        query = query.filter(Gig.status == literal(status, literal_execute=True))
     
     # Filter by budget type
     if budget_type and budget_type in ["fixed", "hourly"]:
@@ -98,18 +163,94 @@ def get_gigs(
     return query.offset(skip).limit(limit).all()
 
 
-def get_user_gigs(db: Session, owner_id: str) -> List[Gig]:
-    return db.query(Gig).filter(Gig.owner_id == owner_id).order_by(Gig.created_at.desc()).all()
+def get_gigs_by_ids(db: Session, gig_ids: Sequence[int], fields: Optional[Sequence[str]] = None) -> List[Gig]:
+    """Gigs with the given ids, in no particular order; missing ids are skipped"""
+    return _load_only(db.query(Gig), Gig, fields).filter(Gig.id.in_(gig_ids)).all()
+
+
+def stream_open_gig_skills(db: Session) -> Result:
+    """(id, skills_required, created_at, budget) of every open gig, oldest first, in batches"""
+    stmt = select(Gig.id, Gig.skills_required, Gig.created_at, Gig.budget).where(
+        Gig.status == literal(GigStatus.OPEN.value, literal_execute=True)
+    ).order_by(Gig.created_at.asc())
+    return db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+
+def get_gigs_updated_after(db: Session, updated_at: datetime, gig_id: int, limit: int) -> list:
+    """Gigs after (`updated_at`, `gig_id`) in (updated_at, id) order, with the columns the skill index needs"""
+    return db.query(
+        Gig.id, Gig.status, Gig.skills_required, Gig.created_at, Gig.budget, Gig.updated_at
+    ).filter(
+        tuple_(Gig.updated_at, Gig.id) > tuple_(updated_at, gig_id)
+    ).order_by(Gig.updated_at, Gig.id).limit(limit).all()
+
+
+def stream_gig_terms(db: Session) -> Result:
+    """(id, title, skills_required) of every gig, in id order, in batches"""
+    stmt = select(Gig.id, Gig.title, Gig.skills_required).order_by(Gig.id)
+    return db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+
+def get_gigs_after_id(db: Session, gig_id: int, limit: int, also: Collection[int] = ()) -> list:
+    """
+    (id, title, skills_required) of the gigs created after `gig_id`, plus any
+    of the ids in `also`, in id order.
+    """
+    columns = (Gig.id, Gig.title, Gig.skills_required)
+    rows = db.query(*columns).filter(Gig.id > gig_id).order_by(Gig.id).limit(limit).all()
+    if also:
+        # A second query, as in get_events_after
+        rows = sorted(db.query(*columns).filter(Gig.id.in_(also)).all() + rows, key=lambda row: row.id)
+    return rows
+
+
+def get_user_gigs(
+    db: Session, owner_id: str, fields: Optional[Sequence[str]] = None, include_archived: bool = False
+) -> List[Gig]:
+    if include_archived:
+        fields = fields and (*fields, "created_at")  # Merge key; avoids a lazy load per row
+    query = _load_only(db.query(Gig), Gig, fields)
+    gigs = query.filter(Gig.owner_id == owner_id).order_by(Gig.created_at.desc()).all()
+    if include_archived:
+        archived = _load_only(db.query(ArchivedGig), ArchivedGig, fields).filter(
+            ArchivedGig.owner_id == owner_id
+        ).order_by(ArchivedGig.created_at.desc()).all()
+        gigs = _newest_first(gigs, archived) if archived else gigs
+    return gigs
 
 
 def create_gig(db: Session, gig: schemas.GigCreate, owner_id: str) -> Gig:
     db_gig = Gig(**gig.model_dump(), owner_id=owner_id)
     db.add(db_gig)
+    db.flush()  # Assigns the id for the event
+    enqueue_event(db, "gig.created", {"gig_id": db_gig.id, "owner_id": owner_id})
+    record_gig_changes(db, [db_gig.id])
     db.commit()
     db.refresh(db_gig)
     return db_gig
 
 
+def bulk_create_gigs(db: Session, gigs: List[schemas.GigCreate], owner_id: str) -> List[int]:
+    """
+    Insert a batch of gigs with one multi-row INSERT and commit it as a single
+    transaction. Returns the new IDs in the same order as `gigs`.
+    """
+    if not gigs:
+        return []
+    rows = [{**gig.model_dump(), "owner_id": owner_id} for gig in gigs]
+    result = db.execute(
+        insert(Gig).returning(Gig.id, sort_by_parameter_order=True),
+        rows
+    )
+    ids = list(result.scalars())
+    db.execute(insert(OutboxEvent), [
+        {"topic": "gig.created", "payload": {"gig_id": gig_id, "owner_id": owner_id}} for gig_id in ids
+    ])
+    record_gig_changes(db, ids)
+    db.commit()
+    return ids
+
+
 def update_gig(db: Session, gig_id: int, gig_update: schemas.GigUpdate) -> Optional[Gig]:
     db_gig = get_gig(db, gig_id)
     if not db_gig:
@@ -120,23 +261,33 @@ def update_gig(db: Session, gig_id: int, gig_update: schemas.GigUpdate) -> Optio
         setattr(db_gig, key, value)
     
     db_gig.updated_at = datetime.utcnow()
+    record_gig_changes(db, [gig_id])
     db.commit()
     db.refresh(db_gig)
     return db_gig
 
 
 def delete_gig(db: Session, gig_id: int) -> bool:
-    db_gig = get_gig(db, gig_id)
-    if not db_gig:
-        return False
-    db.delete(db_gig)
+    # Applications are removed by ON DELETE CASCADE in the database, so this is
+    # one DELETE per table regardless of how many rows reference the gig.
+    # Reviews have no foreign key (they outlive archival) and are deleted here.
+    deleted = db.query(Gig).filter(Gig.id == gig_id).delete(synchronize_session=False)
+    if deleted:
+        reviewed = db.execute(
+            delete(Review).where(Review.gig_id == gig_id).returning(Review.reviewed_user_id)
+        ).scalars().all()
+        _bump_reviews_version(db, set(reviewed))
+        record_gig_changes(db, [gig_id], op="delete")
     db.commit()
-    return True
+    return deleted > 0
 
 
 # Application CRUD
-def get_application(db: Session, application_id: int) -> Optional[Application]:
-    return db.query(Application).filter(Application.id == application_id).first()
+def get_application(db: Session, application_id: int, include_archived: bool = False) -> Optional[Application]:
+    application = db.query(Application).filter(Application.id == application_id).first()
+    if application is None and include_archived:
+        application = db.query(ArchivedApplication).filter(ArchivedApplication.id == application_id).first()
+    return application
 
 
 def get_gig_applications(db: Session, gig_id: int) -> List[Application]:
@@ -147,42 +298,126 @@ def get_user_applications(db: Session, applicant_id: str) -> List[Application]:
     return db.query(Application).filter(Application.applicant_id == applicant_id).order_by(Application.created_at.desc()).all()
 
 
-def get_gig_applications_with_details(db: Session, gig_id: int) -> List[Application]:
-    """Get applications with applicant details loaded"""
-    applications = db.query(Application).filter(Application.gig_id == gig_id).order_by(Application.created_at.desc()).all()
+def get_gig_applications_with_details(
+    db: Session, gig_id: int, fields: Optional[Sequence[str]] = None, archived: bool = False
+) -> List[Application]:
+    """Get applications with applicant details loaded; `archived` reads those of an archived gig"""
+    if fields and "applicant" in fields:
+        fields = [*fields, "applicant_id"]
+    model = ArchivedApplication if archived else Application
+    query = _load_only(db.query(model), model, fields)
+    applications = query.filter(model.gig_id == gig_id).order_by(model.created_at.desc()).all()
     # Load applicant relationship
-    for app in applications:
-        _ = app.applicant  # This triggers the lazy load
+    if not fields or "applicant" in fields:
+        for app in applications:
+            _ = app.applicant  # This triggers the lazy load
     return applications
 
 
-def get_user_applications_with_details(db: Session, applicant_id: str) -> List[Application]:
-    """Get user's applications with gig details loaded"""
-    applications = db.query(Application).filter(Application.applicant_id == applicant_id).order_by(Application.created_at.desc()).all()
+def get_user_applications_with_details(
+    db: Session, applicant_id: str, fields: Optional[Sequence[str]] = None, include_archived: bool = False
+) -> List[Application]:
+    """Get user's applications with gig details loaded; `include_archived` adds those to archived gigs"""
+    if fields and "gig" in fields:
+        fields = [*fields, "gig_id"]
+    if include_archived:
+        fields = fields and (*fields, "created_at")  # Merge key; avoids a lazy load per row
+    query = _load_only(db.query(Application), Application, fields)
+    applications = query.filter(Application.applicant_id == applicant_id).order_by(Application.created_at.desc()).all()
+    if include_archived:
+        archived = _load_only(db.query(ArchivedApplication), ArchivedApplication, fields).filter(
+            ArchivedApplication.applicant_id == applicant_id
+        ).order_by(ArchivedApplication.created_at.desc()).all()
+        applications = _newest_first(applications, archived) if archived else applications
     # Load gig relationship
-    for app in applications:
-        _ = app.gig  # This triggers the lazy load
+    if not fields or "gig" in fields:
+        for app in applications:
+            _ = app.gig  # This triggers the lazy load
     return applications
 
 
+def get_user_applications_with_gig_summaries(db: Session, applicant_id: str) -> List[Application]:
+    """
+    User's applications with the summary columns of each gig, newest first:
+    one joined query over the hot tables and one over the archive tables
+    """
+    groups = []
+    for application, gig in ((Application, Gig), (ArchivedApplication, ArchivedGig)):
+        groups.append(db.query(application).join(application.gig).options(
+            contains_eager(application.gig).load_only(
+                gig.title, gig.status, gig.budget, gig.budget_type, gig.location, gig.deadline, gig.owner_id
+            )
+        ).filter(application.applicant_id == applicant_id).order_by(application.created_at.desc()).all())
+    return _newest_first(*groups) if groups[1] else groups[0]
+
+
+def count_applications_by_gig_status(db: Session, owner_id: str) -> Dict[int, Dict[str, int]]:
+    """Application counts per status for each of an owner's gigs that has any, in one grouped query"""
+    rows = db.execute(
+        select(Application.gig_id, Application.status, func.count(Application.id))
+        .join(Gig, Gig.id == Application.gig_id)
+        .where(Gig.owner_id == owner_id)
+        .group_by(Application.gig_id, Application.status)
+    )
+    counts: Dict[int, Dict[str, int]] = {}
+    for gig_id, status, count in rows:
+        counts.setdefault(gig_id, {})[status] = count
+    return counts
+
+
 def check_existing_application(db: Session, gig_id: int, applicant_id: str) -> Optional[Application]:
     return db.query(Application).filter(
         and_(Application.gig_id == gig_id, Application.applicant_id == applicant_id)
     ).first()
 
 
-def create_application(db: Session, application: schemas.ApplicationCreate, gig_id: int, applicant_id: str) -> Application:
+def create_application(
+    db: Session, application: schemas.ApplicationCreate, gig_id: int, applicant_id: str, owner_id: str
+) -> Application:
     db_application = Application(
         **application.model_dump(),
         gig_id=gig_id,
         applicant_id=applicant_id
     )
     db.add(db_application)
+    db.flush()  # Assigns the id for the event
+    enqueue_event(db, "application.submitted", {
+        "application_id": db_application.id, "gig_id": gig_id, "applicant_id": applicant_id, "owner_id": owner_id
+    })
     db.commit()
     db.refresh(db_application)
     return db_application
 
 
+def select_application(db: Session, application: Application, gig: Gig) -> Application:
+    """Accept an application and move its gig to in_progress in one transaction"""
+    now = datetime.utcnow()
+    application.status = "accepted"
+    application.updated_at = now
+    gig.status = GigStatus.IN_PROGRESS.value
+    gig.updated_at = now
+    enqueue_event(db, "application.selected", {
+        "application_id": application.id, "gig_id": gig.id,
+        "applicant_id": application.applicant_id, "owner_id": gig.owner_id
+    })
+    record_gig_changes(db, [gig.id])
+    db.commit()
+    db.refresh(application)
+    return application
+
+
+def reject_application(db: Session, application: Application, gig: Gig) -> Application:
+    application.status = "rejected"
+    application.updated_at = datetime.utcnow()
+    enqueue_event(db, "application.rejected", {
+        "application_id": application.id, "gig_id": gig.id,
+        "applicant_id": application.applicant_id, "owner_id": gig.owner_id
+    })
+    db.commit()
+    db.refresh(application)
+    return application
+
+
 def update_application_status(db: Session, application_id: int, status: str) -> Optional[Application]:
     db_application = get_application(db, application_id)
     if not db_application:
@@ -197,10 +432,23 @@ def update_application_status(db: Session, application_id: int, status: str) ->
 
 # ========== REVIEWS ==========
 
+def _bump_reviews_version(db: Session, user_ids: Collection[str]) -> None:
+    """Mark the review stats of `user_ids` changed, in the current transaction"""
+    if user_ids:
+        db.execute(
+            update(User).where(User.uid.in_(user_ids)).values(
+                reviews_version=User.reviews_version + 1,
+                reviews_updated_at=datetime.utcnow(),
+                updated_at=User.updated_at  # Profile is unchanged; keep its version
+            ).execution_options(synchronize_session=False)
+        )
+
+
 def create_review(db: Session, review_data: dict) -> Review:
-    """Create a new review"""
+    """Create a new review and bump the reviewed user's review-stats version in the same transaction"""
     review = Review(**review_data)
     db.add(review)
+    _bump_reviews_version(db, [review.reviewed_user_id])
     db.commit()
     db.refresh(review)
     return review
@@ -214,6 +462,14 @@ def get_user_reviews(db: Session, user_id: str) -> List[Review]:
         .all()
 
 
+def get_user_rating_stats(db: Session, user_id: str) -> Tuple[float, int]:
+    """(average rating, number of reviews) received by a user, aggregated in the database"""
+    average, total = db.execute(
+        select(func.avg(Review.rating), func.count(Review.id)).where(Review.reviewed_user_id == user_id)
+    ).one()
+    return float(average or 0.0), total
+
+
 def get_review(db: Session, review_id: int) -> Optional[Review]:
     """Get a review by ID"""
     return db.query(Review).filter(Review.id == review_id).first()
@@ -236,7 +492,346 @@ def mark_gig_completed(db: Session, gig_id: int) -> Optional[Gig]:
     """Mark a gig as completed"""
     gig = db.query(Gig).filter(Gig.id == gig_id).first()
     if gig:
-        gig.is_completed = "true"
+        gig.status = GigStatus.COMPLETED.value
+        applicant_id = db.query(Application.applicant_id).filter(
+            Application.gig_id == gig.id, Application.status == "accepted"
+        ).scalar()
+        enqueue_event(db, "gig.completed", {"gig_id": gig.id, "owner_id": gig.owner_id, "applicant_id": applicant_id})
+        record_gig_changes(db, [gig.id])
         db.commit()
         db.refresh(gig)
     return gig
+
+
+# ========== SAVED SEARCHES ==========
+
+def create_saved_search(db: Session, user_id: str, saved_search: schemas.SavedSearchCreate) -> SavedSearch:
+    db_search = SavedSearch(**saved_search.model_dump(), user_id=user_id)
+    db_search.anchors = [
+        SavedSearchAnchor(key=key)
+        for key in saved_searches.anchor_keys(saved_search.search, saved_search.skills, saved_search.budget_type)
+    ]
+    db.add(db_search)
+    db.commit()
+    db.refresh(db_search)
+    return db_search
+
+
+def get_user_saved_searches(db: Session, user_id: str) -> List[SavedSearch]:
+    return db.query(SavedSearch).filter(SavedSearch.user_id == user_id).order_by(SavedSearch.created_at.desc()).all()
+
+
+def count_user_saved_searches(db: Session, user_id: str) -> int:
+    return db.query(func.count(SavedSearch.id)).filter(SavedSearch.user_id == user_id).scalar()
+
+
+def get_saved_search(db: Session, saved_search_id: int) -> Optional[SavedSearch]:
+    return db.query(SavedSearch).filter(SavedSearch.id == saved_search_id).first()
+
+
+def delete_saved_search(db: Session, saved_search_id: int) -> bool:
+    # Anchors and feed entries go with it through ON DELETE CASCADE
+    deleted = db.query(SavedSearch).filter(SavedSearch.id == saved_search_id).delete(synchronize_session=False)
+    db.commit()
+    return deleted > 0
+
+
+def percolate_gig(db: Session, gig_id: int) -> int:
+    """
+    Add `gig_id` to the feed of every saved search it matches; returns the
+    number of new feed entries. Safe to repeat: existing entries are skipped.
+    """
+    gig = get_gig(db, gig_id)
+    if not gig or gig.status != GigStatus.OPEN.value:
+        return 0
+    candidates = select(SavedSearchAnchor.saved_search_id).where(
+        SavedSearchAnchor.key.in_(saved_searches.gig_keys(gig))
+    ).distinct()
+    matched = [
+        s for s in db.query(SavedSearch).filter(
+            SavedSearch.id.in_(candidates.scalar_subquery()), SavedSearch.user_id != gig.owner_id
+        )
+        if saved_searches.matches(s, gig)
+    ]
+    if not matched:
+        return 0
+    existing = set(db.execute(
+        select(SavedSearchMatch.saved_search_id).where(SavedSearchMatch.gig_id == gig_id)
+    ).scalars())
+    new = [
+        SavedSearchMatch(saved_search_id=s.id, user_id=s.user_id, gig_id=gig_id)
+        for s in matched if s.id not in existing
+    ]
+    db.add_all(new)
+    db.commit()
+    return len(new)
+
+
+def get_search_feed(db: Session, user_id: str, before_id: Optional[int] = None, limit: int = 20) -> List[SavedSearchMatch]:
+    """The user's saved-search matches, newest first, with their gigs"""
+    query = db.query(SavedSearchMatch).options(selectinload(SavedSearchMatch.gig))\
+        .filter(SavedSearchMatch.user_id == user_id)
+    if before_id:
+        query = query.filter(SavedSearchMatch.id < before_id)
+    return query.order_by(SavedSearchMatch.id.desc()).limit(limit).all()
+
+
+# ========== HOUSEKEEPING ==========
+# Batched set-based updates for the background scheduler. Each call changes at
+# most `batch_size` rows in one short transaction and returns how many changed.
+
+def expire_gigs(db: Session, now: datetime, batch_size: int) -> int:
+    """Expire open gigs whose deadline has passed"""
+    batch = select(Gig.id).where(
+        Gig.status == literal(GigStatus.OPEN.value, literal_execute=True),
+        Gig.deadline < now
+    ).limit(batch_size)
+    expired = db.execute(
+        update(Gig)
+        .where(Gig.id.in_(batch.scalar_subquery()))
+        .values(status=GigStatus.EXPIRED.value, updated_at=now)
+        .returning(Gig.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    record_gig_changes(db, expired)
+    db.commit()
+    return len(expired)
+
+
+def reject_pending_applications(db: Session, now: datetime, batch_size: int) -> int:
+    """Reject pending applications on gigs that no longer take applications"""
+    pending = literal("pending", literal_execute=True)
+    batch = db.execute(
+        select(Application.id, Application.gig_id, Application.applicant_id, Gig.owner_id)
+        .join(Gig, Gig.id == Application.gig_id)
+        .where(Application.status == pending, Gig.status != literal(GigStatus.OPEN.value, literal_execute=True))
+        .limit(batch_size)
+    ).all()
+    if not batch:
+        return 0
+    rejected = set(db.execute(
+        update(Application)
+        .where(Application.id.in_([row.id for row in batch]), Application.status == pending)
+        .values(status="rejected", updated_at=now)
+        .returning(Application.id)
+        .execution_options(synchronize_session=False)
+    ).scalars())
+    for row in batch:
+        if row.id in rejected:
+            enqueue_event(db, "application.rejected", {
+                "application_id": row.id, "gig_id": row.gig_id,
+                "applicant_id": row.applicant_id, "owner_id": row.owner_id
+            })
+    db.commit()
+    return len(rejected)
+
+
+def purge_outbox_events(db: Session, now: datetime, batch_size: int, retention: timedelta) -> int:
+    """Delete events processed longer than `retention` ago"""
+    batch = select(OutboxEvent.id).where(OutboxEvent.processed_at < now - retention).limit(batch_size)
+    result = db.execute(
+        delete(OutboxEvent)
+        .where(OutboxEvent.id.in_(batch.scalar_subquery()))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def purge_gig_changes(db: Session, now: datetime, batch_size: int, retention: timedelta) -> int:
+    """Delete change-feed entries older than `retention`, always keeping the newest one"""
+    newest = select(func.max(GigChange.id)).scalar_subquery()
+    batch = select(GigChange.id).where(
+        GigChange.created_at < now - retention, GigChange.id < newest
+    ).limit(batch_size)
+    result = db.execute(
+        delete(GigChange)
+        .where(GigChange.id.in_(batch.scalar_subquery()))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+# ========== ARCHIVE ==========
+# Gigs closed long ago move to archived_gigs (and their applications to
+# archived_applications), so the hot tables and their indexes only hold gigs
+# that are still in play. Archived rows keep their ids and columns.
+
+CLOSED_GIG_STATUSES = (GigStatus.COMPLETED.value, GigStatus.EXPIRED.value)
+
+
+def archive_gigs(db: Session, now: datetime, batch_size: int, age: timedelta) -> int:
+    """Move gigs completed or expired more than `age` ago, with their applications, to the archive tables"""
+    batch = db.execute(
+        select(Gig.id)
+        .where(Gig.updated_at < now - age, Gig.status.in_(CLOSED_GIG_STATUSES))
+        .order_by(Gig.updated_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)  # Gigs being edited wait for the next run
+    ).scalars().all()
+    if not batch:
+        return 0
+    archived_at = literal(now, DateTime)
+    gig_columns = list(Gig.__table__.columns)
+    db.execute(insert(ArchivedGig).from_select(
+        [c.name for c in gig_columns] + ["archived_at"],
+        select(*gig_columns, archived_at).where(Gig.id.in_(batch))
+    ))
+    application_columns = list(Application.__table__.columns)
+    db.execute(insert(ArchivedApplication).from_select(
+        [c.name for c in application_columns] + ["archived_at"],
+        select(*application_columns, archived_at).where(Application.gig_id.in_(batch))
+    ))
+    # Applications and saved-search feed entries go with the gig by ON DELETE CASCADE
+    db.execute(delete(Gig).where(Gig.id.in_(batch)).execution_options(synchronize_session=False))
+    db.commit()
+    return len(batch)
+
+
+# ========== OUTBOX ==========
+# Events are added to the caller's session and committed with its write, so an
+# event exists if and only if the change that caused it does.
+
+def enqueue_event(db: Session, topic: str, payload: dict) -> OutboxEvent:
+    """Add an event to the current transaction; the caller commits"""
+    event = OutboxEvent(topic=topic, payload=payload)
+    db.add(event)
+    return event
+
+
+def claim_outbox_events(db: Session, worker_id: str, now: datetime, batch_size: int, lease: timedelta) -> List[OutboxEvent]:
+    """
+    Claim up to `batch_size` due events for `worker_id` until `now + lease`.
+    On PostgreSQL the candidate rows are locked with SKIP LOCKED, so concurrent
+    workers claim disjoint batches. SQLite serializes writers, so the single
+    UPDATE is atomic there too.
+    """
+    batch = select(OutboxEvent.id).where(
+        OutboxEvent.status == literal("pending", literal_execute=True),
+        OutboxEvent.available_at <= now,
+        or_(OutboxEvent.claimed_until.is_(None), OutboxEvent.claimed_until < now)
+    ).order_by(OutboxEvent.available_at, OutboxEvent.id).limit(batch_size).with_for_update(skip_locked=True)
+    claimed = db.execute(
+        update(OutboxEvent)
+        .where(OutboxEvent.id.in_(batch.scalar_subquery()))
+        .values(claimed_by=worker_id, claimed_until=now + lease)
+        .returning(OutboxEvent.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
+    if not claimed:
+        return []
+    return db.query(OutboxEvent).filter(OutboxEvent.id.in_(claimed)).order_by(OutboxEvent.id).all()
+
+
+def complete_outbox_event(db: Session, event: OutboxEvent, now: datetime) -> None:
+    event.status = "done"
+    event.processed_at = now
+    event.claimed_until = None
+    db.commit()
+
+
+def fail_outbox_event(db: Session, event: OutboxEvent, error: str, retry_at: Optional[datetime]) -> None:
+    """Schedule a retry at `retry_at`, or give up (status dead) when it is None"""
+    event.attempts += 1
+    event.last_error = error[:2000]
+    event.claimed_until = None
+    if retry_at is None:
+        event.status = "dead"
+        event.processed_at = datetime.utcnow()
+    else:
+        event.available_at = retry_at
+    db.commit()
+
+
+def outbox_backlog(db: Session) -> Tuple[int, Optional[datetime]]:
+    """Pending event count and the creation time of the oldest one"""
+    pending = literal("pending", literal_execute=True)
+    count = db.query(func.count(OutboxEvent.id)).filter(OutboxEvent.status == pending).scalar()
+    oldest = db.query(func.min(OutboxEvent.created_at)).filter(OutboxEvent.status == pending).scalar()
+    return count, oldest
+
+
+def get_events_after(db: Session, after_id: int, also: Collection[int] = (), limit: int = 500) -> list:
+    """
+    (id, topic, payload) of events with id > `after_id`, plus any of the ids in
+    `also`, in id order. Reads the primary key only, whatever the event status.
+    """
+    columns = (OutboxEvent.id, OutboxEvent.topic, OutboxEvent.payload)
+    rows = db.query(*columns).filter(OutboxEvent.id > after_id).order_by(OutboxEvent.id).limit(limit).all()
+    if also:
+        # A second query: OR-ing the two conditions turns the range read into a table scan
+        rows = sorted(db.query(*columns).filter(OutboxEvent.id.in_(also)).all() + rows, key=lambda row: row.id)
+    return rows
+
+
+def event_id_range(db: Session) -> Tuple[Optional[int], Optional[int]]:
+    """Lowest and highest retained event ids"""
+    # Separate queries, so each is a single primary-key lookup
+    return db.query(func.min(OutboxEvent.id)).scalar(), db.query(func.max(OutboxEvent.id)).scalar()
+
+
+# ========== CHANGE FEED ==========
+# Every write to a gig appends to gig_changes in the same transaction, like
+# the outbox, so the log and the gigs table never disagree.
+
+def record_gig_changes(db: Session, gig_ids: Sequence[int], op: str = "upsert") -> None:
+    """Log a change of each gig in the current transaction; the caller commits"""
+    if gig_ids:
+        db.execute(insert(GigChange), [{"gig_id": gig_id, "op": op} for gig_id in gig_ids])
+
+
+def get_gig_changes_after(db: Session, after_id: int, limit: int) -> list:
+    """(id, gig_id, op, created_at) of changes with id > `after_id`, in id order"""
+    return db.query(GigChange.id, GigChange.gig_id, GigChange.op, GigChange.created_at).filter(
+        GigChange.id > after_id
+    ).order_by(GigChange.id).limit(limit).all()
+
+
+def gig_change_id_range(db: Session) -> Tuple[Optional[int], Optional[int]]:
+    """Lowest and highest retained change ids"""
+    return db.query(func.min(GigChange.id)).scalar(), db.query(func.max(GigChange.id)).scalar()
+
+
+# ========== EXPORTS ==========
+
+EXPORT_BATCH_SIZE = 1000  # Rows fetched per round-trip from the server-side cursor
+
+
+def _stream_export(db: Session, stmt, model, updated_since: Optional[datetime]) -> Result:
+    """
+    Execute an export query through a server-side cursor (`yield_per` implies
+    `stream_results`), so rows are fetched in batches instead of all at once.
+    The whole export is one statement and therefore reads from one snapshot.
+    """
+    if updated_since:
+        stmt = stmt.where(model.updated_at >= updated_since)
+    stmt = stmt.order_by(model.updated_at.asc(), model.id.asc())
+    return db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+
+def stream_gigs(db: Session, updated_since: Optional[datetime] = None) -> Result:
+    stmt = select(
+        Gig.id, Gig.title, Gig.description, Gig.budget, Gig.budget_type, Gig.location,
+        Gig.skills_required, Gig.deadline, Gig.owner_id, Gig.status,
+        Gig.created_at, Gig.updated_at
+    )
+    return _stream_export(db, stmt, Gig, updated_since)
+
+
+def stream_owner_applications(db: Session, owner_id: str, updated_since: Optional[datetime] = None) -> Result:
+    """Applications submitted to gigs owned by `owner_id`"""
+    stmt = select(
+        Application.id, Application.gig_id, Application.applicant_id, Application.cover_letter,
+        Application.status, Application.created_at, Application.updated_at
+    ).join(Gig, Gig.id == Application.gig_id).where(Gig.owner_id == owner_id)
+    return _stream_export(db, stmt, Application, updated_since)
+
+
+def stream_reviews(db: Session, updated_since: Optional[datetime] = None) -> Result:
+    stmt = select(
+        Review.id, Review.gig_id, Review.reviewer_id, Review.reviewed_user_id,
+        Review.rating, Review.comment, Review.created_at, Review.updated_at
+    )
+    return _stream_export(db, stmt, Review, updated_since)
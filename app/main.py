@@ -1,18 +1,71 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Literal
+from fastapi import Depends, FastAPI, Query, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.db.database import engine, Base
-from app.routers import gigs, users, applications, reviews
+import anyio
+from app.core import concurrency, metrics, profiling, push, recommendations, slow_queries, typeahead
+from app.core.dependencies import require_admin
+from app.core.rate_limit import RateLimitHeadersMiddleware
+from app.core.scheduler import SCHEDULER_ENABLED, scheduler
+from app.core.single_flight import gig_reads
+from app.crud import crud
+from app.db.database import engine, Base, SessionLocal
+from app.routers import gigs, users, applications, reviews, exports, events, saved_searches, suggest, batch
 from app.models import models
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+metrics.instrument_engine(engine)
+if profiling.enabled():
+    profiling.instrument_engine(engine)
+if slow_queries.enabled():
+    slow_queries.instrument_engine(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Admission is controlled by the per-route-class pools, so size the sync
+    # handler thread pool to match instead of AnyIO's default 40 threads
+    anyio.to_thread.current_default_thread_limiter().total_tokens = concurrency.total_slots()
+    # Every worker competes for the scheduler lease; only the leader runs jobs
+    if SCHEDULER_ENABLED:
+        scheduler.start()
+    # Builds the skill index in the background and keeps it in sync with the gigs table
+    if recommendations.RECOMMENDATIONS_ENABLED:
+        recommendations.index.start()
+    # Builds the typeahead prefix index in the background and adds new gigs as they appear
+    if typeahead.SUGGEST_ENABLED:
+        typeahead.index.start()
+    yield
+    await push.hub.close()
+    recommendations.index.stop()
+    typeahead.index.stop()
+    scheduler.stop()
+
+
 app = FastAPI(
     title="Tujitume API",
     description="Backend API for Tujitume Gig Platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+# Installed only when configured, so profiling costs nothing when off
+if profiling.enabled():
+    app.add_middleware(profiling.ProfilerMiddleware)
+
+app.add_middleware(RateLimitHeadersMiddleware)
+
+# Per-route-class concurrency limits and load shedding (inside CORS so 503s get CORS headers)
+app.add_middleware(concurrency.ConcurrencyLimitMiddleware)
+
+# Outside the concurrency limits so shed requests are counted too
+app.add_middleware(metrics.MetricsMiddleware)
+
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -31,6 +84,11 @@ app.include_router(gigs.router)
 app.include_router(users.router)
 app.include_router(applications.router)
 app.include_router(reviews.router)
+app.include_router(exports.router)
+app.include_router(events.router)
+app.include_router(saved_searches.router)
+app.include_router(suggest.router)
+app.include_router(batch.router)
 
 
 @app.get("/")
@@ -45,3 +103,64 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus text exposition, aggregated across gunicorn workers"""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/health/concurrency")
+def concurrency_stats():
+    """Queue depth, in-flight and shed counts for each route class on this worker"""
+    return {name: pool.snapshot() for name, pool in concurrency.pools.items()}
+
+
+@app.get("/health/scheduler")
+def scheduler_stats():
+    """Whether this worker holds the scheduler lease, and its last job runs"""
+    return scheduler.snapshot()
+
+
+@app.get("/health/outbox")
+def outbox_stats():
+    """Pending side-effect events and how long the oldest has waited"""
+    with SessionLocal() as db:
+        pending, oldest = crud.outbox_backlog(db)
+    return {
+        "pending": pending,
+        "oldest_pending_age_seconds": round((datetime.utcnow() - oldest).total_seconds(), 1) if oldest else 0,
+    }
+
+
+@app.get("/health/coalescing")
+def coalescing_stats():
+    """How many gig reads on this worker were served from another request's in-flight query"""
+    return {gig_reads.name: gig_reads.stats()}
+
+
+@app.get("/health/suggest")
+def suggest_stats():
+    """Size and approximate memory of this worker's typeahead index"""
+    return typeahead.index.stats()
+
+
+@app.get("/admin/slow-queries", include_in_schema=False, dependencies=[Depends(require_admin)])
+def slow_query_report(
+    sort: Literal["total_ms", "max_ms", "mean_ms", "count", "last_seen"] = "total_ms",
+    limit: int = Query(50, ge=1, le=500)
+):
+    """Statements slower than SLOW_QUERY_MS on this worker, aggregated by fingerprint, with plans"""
+    log = slow_queries.slow_queries
+    return {
+        "threshold_ms": log.threshold_ms if slow_queries.enabled() else None,
+        "queries": log.snapshot(sort=sort, limit=limit),
+    }
+
+
+@app.delete("/admin/slow-queries", include_in_schema=False, dependencies=[Depends(require_admin)])
+def reset_slow_queries():
+    """Clear this worker's aggregate, e.g. after shipping an index"""
+    slow_queries.slow_queries.reset()
+    return {"status": "cleared"}
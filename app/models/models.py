@@ -1,13 +1,27 @@
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON, ForeignKey, Index, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
+import enum
 from app.db.database import Base
 
 
+class GigStatus(str, enum.Enum):
+    OPEN = "open"  # Accepting applications
+    IN_PROGRESS = "in_progress"  # An applicant has been selected
+    COMPLETED = "completed"
+    EXPIRED = "expired"  # Deadline passed while still open
+
+
+# Predicates of partial indexes; queries must repeat them literally to use the index
+OPEN_GIG = text("status = 'open'")
+PENDING_APPLICATION = text("status = 'pending'")
+PENDING_EVENT = text("status = 'pending'")
+
+
 class User(Base):
     __tablename__ = "users"
     
-    uid = Column(String, primary_key=True, index=True)  # Firebase UID
+    uid = Column(String, primary_key=True)  # Firebase UID
     email = Column(String, unique=True, index=True, nullable=False)
     name = Column(String)
     bio = Column(Text)  # User bio/description
@@ -16,39 +30,52 @@ class User(Base):
     location = Column(String)  # User location
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped by every review of this user; versions the cached review stats
+    reviews_version = Column(Integer, nullable=False, default=0, server_default="0")
+    reviews_updated_at = Column(DateTime)
     
     # Relationships
-    gigs = relationship("Gig", back_populates="owner", cascade="all, delete-orphan")
-    applications = relationship("Application", back_populates="applicant", cascade="all, delete-orphan")
+    gigs = relationship("Gig", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True)
+    applications = relationship("Application", back_populates="applicant", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Gig(Base):
     __tablename__ = "gigs"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     title = Column(String, nullable=False, index=True)
     description = Column(Text, nullable=False)
-    budget = Column(Float)
+    budget = Column(Float, index=True)
     budget_type = Column(String)  # "fixed" or "hourly"
     location = Column(String)
     skills_required = Column(JSON)  # Array of strings
     deadline = Column(DateTime)
-    owner_id = Column(String, ForeignKey("users.uid"), nullable=False)
-    is_completed = Column(String, default="false")  # "false", "true"
+    owner_id = Column(String, ForeignKey("users.uid", ondelete="CASCADE"), nullable=False)
+    status = Column(String(20), nullable=False, default=GigStatus.OPEN.value, server_default=GigStatus.OPEN.value)
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     owner = relationship("User", back_populates="gigs")
-    applications = relationship("Application", back_populates="gig", cascade="all, delete-orphan")
+    applications = relationship("Application", back_populates="gig", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_gigs_owner_id_created_at", "owner_id", "created_at"),
+        Index("ix_gigs_updated_at_id", "updated_at", "id"),
+        # The feed only lists open gigs, so these stay proportional to the open set
+        Index("ix_gigs_open_created_at", "created_at", postgresql_where=OPEN_GIG, sqlite_where=OPEN_GIG),
+        Index("ix_gigs_open_budget", "budget", postgresql_where=OPEN_GIG, sqlite_where=OPEN_GIG),
+        # Deadline expiry only looks at open gigs
+        Index("ix_gigs_open_deadline", "deadline", postgresql_where=OPEN_GIG, sqlite_where=OPEN_GIG),
+    )
 
 
 class Application(Base):
     __tablename__ = "applications"
     
-    id = Column(Integer, primary_key=True, index=True)
-    gig_id = Column(Integer, ForeignKey("gigs.id"), nullable=False)
-    applicant_id = Column(String, ForeignKey("users.uid"), nullable=False)
+    id = Column(Integer, primary_key=True)
+    gig_id = Column(Integer, ForeignKey("gigs.id", ondelete="CASCADE"), nullable=False)
+    applicant_id = Column(String, ForeignKey("users.uid", ondelete="CASCADE"), nullable=False)
     cover_letter = Column(Text)
     status = Column(String, default="pending")  # pending, accepted, rejected
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -58,14 +85,175 @@ class Application(Base):
     gig = relationship("Gig", back_populates="applications")
     applicant = relationship("User", back_populates="applications")
 
+    __table_args__ = (
+        Index("ix_applications_gig_id_created_at", "gig_id", "created_at"),
+        Index("ix_applications_applicant_id_created_at", "applicant_id", "created_at"),
+        # Auto-rejection only looks at pending applications
+        Index(
+            "ix_applications_pending_gig_id", "gig_id",
+            postgresql_where=PENDING_APPLICATION, sqlite_where=PENDING_APPLICATION
+        ),
+    )
+
+
+class ArchivedGig(Base):
+    """A gig completed or expired long ago, moved out of `gigs` with the same columns; read-only"""
+    __tablename__ = "archived_gigs"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String, nullable=False)
+    description = Column(Text, nullable=False)
+    budget = Column(Float)
+    budget_type = Column(String)
+    location = Column(String)
+    skills_required = Column(JSON)
+    deadline = Column(DateTime)
+    owner_id = Column(String, ForeignKey("users.uid", ondelete="CASCADE"), nullable=False)
+    status = Column(String(20), nullable=False)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, nullable=False)
+
+    owner = relationship("User")
+    applications = relationship("ArchivedApplication", back_populates="gig", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_archived_gigs_owner_id_created_at", "owner_id", "created_at"),
+    )
+
+
+class ArchivedApplication(Base):
+    """An application to an archived gig, moved out of `applications` with it"""
+    __tablename__ = "archived_applications"
+
+    id = Column(Integer, primary_key=True)
+    gig_id = Column(Integer, ForeignKey("archived_gigs.id", ondelete="CASCADE"), nullable=False)
+    applicant_id = Column(String, ForeignKey("users.uid", ondelete="CASCADE"), nullable=False)
+    cover_letter = Column(Text)
+    status = Column(String)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, nullable=False)
+
+    gig = relationship("ArchivedGig", back_populates="applications")
+    applicant = relationship("User")
+
+    __table_args__ = (
+        Index("ix_archived_applications_gig_id_created_at", "gig_id", "created_at"),
+        Index("ix_archived_applications_applicant_id_created_at", "applicant_id", "created_at"),
+    )
+
+
+class SavedSearch(Base):
+    """A user's stored gig search; new gigs that match it are added to the user's feed"""
+    __tablename__ = "saved_searches"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(String, ForeignKey("users.uid", ondelete="CASCADE"), nullable=False)
+    search = Column(String(100))  # Substring of title, description or location
+    skills = Column(JSON)  # Any of these skills
+    budget_type = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    anchors = relationship("SavedSearchAnchor", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_saved_searches_user_id_created_at", "user_id", "created_at"),
+    )
+
+
+class SavedSearchAnchor(Base):
+    """Reverse-index entry: a new gig carrying `key` is a candidate match for the saved search"""
+    __tablename__ = "saved_search_anchors"
+
+    key = Column(String(120), primary_key=True)  # e.g. "skill:Python", "text:pyt", "budget_type:fixed"
+    saved_search_id = Column(Integer, ForeignKey("saved_searches.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_saved_search_anchors_saved_search_id", "saved_search_id"),
+    )
+
+
+class SavedSearchMatch(Base):
+    """Feed entry: `gig_id` matched one of the user's saved searches when it was posted"""
+    __tablename__ = "saved_search_matches"
+
+    id = Column(Integer, primary_key=True)
+    saved_search_id = Column(Integer, ForeignKey("saved_searches.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(String, ForeignKey("users.uid", ondelete="CASCADE"), nullable=False)
+    gig_id = Column(Integer, ForeignKey("gigs.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    gig = relationship("Gig")
+
+    __table_args__ = (
+        UniqueConstraint("saved_search_id", "gig_id", name="uq_saved_search_matches_saved_search_id_gig_id"),
+        Index("ix_saved_search_matches_user_id_id", "user_id", "id"),
+        Index("ix_saved_search_matches_gig_id", "gig_id"),
+    )
+
+
+class SchedulerLease(Base):
+    """Lock row for leader election: one holder runs background jobs until expires_at"""
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String(50), primary_key=True)
+    holder = Column(String(100), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+
+class OutboxEvent(Base):
+    """Side effect recorded in the same transaction as the write that caused it"""
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True)
+    topic = Column(String(100), nullable=False)  # e.g. "application.submitted"
+    payload = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending, done, dead
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # Not retried before this
+    claimed_by = Column(String(100))
+    claimed_until = Column(DateTime)  # Claim expiry; a crashed worker's events are picked up after it
+    last_error = Column(Text)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    processed_at = Column(DateTime)
+
+    __table_args__ = (
+        # Workers only poll pending events
+        Index(
+            "ix_outbox_events_pending_available_at", "available_at", "id",
+            postgresql_where=PENDING_EVENT, sqlite_where=PENDING_EVENT
+        ),
+        # Retention purge of processed events
+        Index("ix_outbox_events_processed_at", "processed_at"),
+    )
+
+
+class GigChange(Base):
+    """Append-only log of gig writes; its id is the sequence behind the change feed"""
+    __tablename__ = "gig_changes"
+
+    id = Column(Integer, primary_key=True)
+    gig_id = Column(Integer, nullable=False)  # No foreign key: tombstones outlive the gig
+    op = Column(String(10), nullable=False)  # "upsert" or "delete"
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Retention purge
+        Index("ix_gig_changes_created_at", "created_at"),
+        # Ids must never be reused, even after the newest rows are deleted
+        {"sqlite_autoincrement": True},
+    )
+
 
 class Review(Base):
     __tablename__ = "reviews"
     
-    id = Column(Integer, primary_key=True, index=True)
-    gig_id = Column(Integer, ForeignKey("gigs.id"), nullable=False)
-    reviewer_id = Column(String, ForeignKey("users.uid"), nullable=False)  # Who wrote the review
-    reviewed_user_id = Column(String, ForeignKey("users.uid"), nullable=False)  # Who is being reviewed
+    id = Column(Integer, primary_key=True)
+    # A gig in gigs or archived_gigs; no foreign key, so reviews outlive archival
+    gig_id = Column(Integer, nullable=False)
+    reviewer_id = Column(String, ForeignKey("users.uid", ondelete="CASCADE"), nullable=False)  # Who wrote the review
+    reviewed_user_id = Column(String, ForeignKey("users.uid", ondelete="CASCADE"), nullable=False)  # Who is being reviewed
     rating = Column(Integer, nullable=False)  # 1-5 stars
     comment = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -74,3 +262,10 @@ class Review(Base):
     # Relationships
     reviewer = relationship("User", foreign_keys=[reviewer_id])
     reviewed_user = relationship("User", foreign_keys=[reviewed_user_id])
+
+    __table_args__ = (
+        Index("ix_reviews_reviewed_user_id_created_at", "reviewed_user_id", "created_at"),
+        Index("ix_reviews_gig_id_reviewer_id", "gig_id", "reviewer_id"),
+        Index("ix_reviews_reviewer_id", "reviewer_id"),
+        Index("ix_reviews_updated_at_id", "updated_at", "id"),
+    )
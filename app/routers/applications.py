@@ -2,7 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import Dict
 from app.core.dependencies import get_db, get_current_user
+from app.core.rate_limit import rate_limit_user
 from app.crud import crud
+from app.models.models import GigStatus
 from app.schemas import schemas
 
 router = APIRouter(
@@ -11,7 +13,11 @@ router = APIRouter(
 )
 
 
-@router.put("/{application_id}/select", response_model=schemas.ApplicationResponse)
+@router.put(
+    "/{application_id}/select",
+    response_model=schemas.ApplicationResponse,
+    dependencies=[Depends(rate_limit_user("write"))]
+)
 def select_applicant(
     application_id: int,
     db: Session = Depends(get_db),
@@ -45,6 +51,13 @@ def select_applicant(
             detail="Only the gig owner can select applicants"
         )
     
+    # Applicants can only be selected while the gig is open
+    if gig.status != GigStatus.OPEN:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Applicants can only be selected on open gigs"
+        )
+    
     # Check if application is already accepted
     if application.status == "accepted":
         raise HTTPException(
@@ -62,12 +75,16 @@ def select_applicant(
             )
     
     # Update application status to accepted
-    updated_application = crud.update_application_status(db, application_id, "accepted")
+    updated_application = crud.select_application(db, application, gig)
     
     return updated_application
 
 
-@router.put("/{application_id}/reject", response_model=schemas.ApplicationResponse)
+@router.put(
+    "/{application_id}/reject",
+    response_model=schemas.ApplicationResponse,
+    dependencies=[Depends(rate_limit_user("write"))]
+)
 def reject_applicant(
     application_id: int,
     db: Session = Depends(get_db),
@@ -108,7 +125,7 @@ def reject_applicant(
         )
     
     # Update application status to rejected
-    updated_application = crud.update_application_status(db, application_id, "rejected")
+    updated_application = crud.reject_application(db, application, gig)
     
     return updated_application
 
@@ -122,9 +139,10 @@ def get_application(
     """
     Get a specific application by ID.
     Only the gig owner or the applicant can view the application.
+    Applications to archived gigs are included.
     """
     # Get the application
-    application = crud.get_application(db, application_id)
+    application = crud.get_application(db, application_id, include_archived=True)
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -132,7 +150,7 @@ def get_application(
         )
     
     # Get the gig
-    gig = crud.get_gig(db, application.gig_id)
+    gig = crud.get_gig(db, application.gig_id, include_archived=True)
     if not gig:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
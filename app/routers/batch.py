@@ -0,0 +1,78 @@
+from fastapi import APIRouter, HTTPException, Request, status
+from typing import Optional, Tuple
+import anyio
+import logging
+from app.core import batch, dependencies
+from app.core.serialization import json_response
+from app.db.database import SessionLocal
+from app.schemas import schemas
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/batch",
+    tags=["batch"]
+)
+
+
+def _resolve_user(authorization: Optional[str]) -> Tuple[Optional[str], Optional[HTTPException]]:
+    """(uid, None) for a valid bearer token, (None, error) for a rejected one, (None, None) without one"""
+    if not authorization or not authorization.startswith("Bearer "):
+        return None, None
+    with SessionLocal() as db:
+        try:
+            return dependencies.authenticate(authorization.split("Bearer ", 1)[1], db)["uid"], None
+        except HTTPException as e:
+            return None, e
+
+
+def _open_snapshot():
+    db = SessionLocal()
+    try:
+        batch.begin_snapshot(db)
+    except Exception:
+        db.close()
+        raise
+    return db
+
+
+@router.post("", response_model=schemas.BatchResponse)
+async def run_batch(payload: schemas.BatchRequest, request: Request):
+    """
+    Run several GET requests to the gigs, users, reviews and applications
+    endpoints in one round trip. Each sub-request gets the status and body it
+    would get on its own, in order; they share the caller's Authorization
+    header (verified once) and one consistent database snapshot.
+    At most 20 sub-requests, and searches count as 5 towards a cost of 20.
+    """
+    if len(payload.requests) > batch.MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch can hold at most {batch.MAX_REQUESTS} requests"
+        )
+    try:
+        targets = [batch.split_path(sub.path) for sub in payload.requests]
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if sum(batch.cost(path, query) for path, query in targets) > batch.MAX_COST:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch is too expensive; searches cost {batch.COSTS['search']} and the limit is {batch.MAX_COST}"
+        )
+
+    uid, auth_error = await anyio.to_thread.run_sync(_resolve_user, request.headers.get("authorization"))
+    db = await anyio.to_thread.run_sync(_open_snapshot)
+    token = batch.current_batch.set(batch.BatchContext(db, uid, auth_error))
+    try:
+        entries = []
+        for sub, (path, query) in zip(payload.requests, targets):
+            try:
+                result = await batch.dispatch(request.app.router, request.scope, path, query)
+            except Exception:
+                logger.exception("Batch sub-request %s failed", path)
+                result = (500, b'{"detail":"Internal Server Error"}', True)
+            entries.append(batch.encode_response(sub.id, *result))
+    finally:
+        batch.current_batch.reset(token)
+        await anyio.to_thread.run_sync(db.close)
+    return json_response(b'{"responses":[' + b",".join(entries) + b"]}")
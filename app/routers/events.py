@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app.core import push
+from app.core.dependencies import get_stream_user
+
+router = APIRouter(
+    prefix="/api/events",
+    tags=["events"]
+)
+
+
+@router.get("")
+async def stream_events(
+    last_event_id: Optional[str] = Header(None),
+    uid: str = Depends(get_stream_user)
+):
+    """
+    Server-Sent Events stream of application and gig updates for the current user:
+    application.submitted, application.selected, application.rejected and
+    gig.completed go to both the gig owner and the applicant the event names
+    (so an applicant also sees their own submission, e.g. in another tab).
+    Reconnects send Last-Event-ID (EventSource does this itself) to replay
+    missed events; a `reset` event means the client should refetch instead.
+    """
+    if push.hub.at_capacity(uid):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many open event streams"
+        )
+    resume_from = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    return StreamingResponse(
+        push.stream(uid, resume_from),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
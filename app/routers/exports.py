@@ -0,0 +1,120 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.engine import Result
+from sqlalchemy.orm import Session
+from typing import Iterator, Optional
+from datetime import datetime
+import csv
+import io
+import json
+from app.core.dependencies import get_db, get_current_user
+from app.crud import crud
+
+router = APIRouter(
+    prefix="/api/export",
+    tags=["export"]
+)
+
+FLUSH_ROWS = 500  # Rows encoded per chunk written to the response
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _iter_ndjson(result: Result) -> Iterator[bytes]:
+    columns = list(result.keys())
+    chunk = []
+    for row in result:
+        chunk.append(json.dumps(dict(zip(columns, row)), default=_json_default))
+        if len(chunk) >= FLUSH_ROWS:
+            yield ("\n".join(chunk) + "\n").encode()
+            chunk = []
+    if chunk:
+        yield ("\n".join(chunk) + "\n").encode()
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+def _iter_csv(result: Result) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(result.keys())
+    rows = 0
+    for row in result:
+        writer.writerow([_csv_value(value) for value in row])
+        rows += 1
+        if rows % FLUSH_ROWS == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def _export_response(result: Result, name: str, format: str) -> StreamingResponse:
+    if format == "csv":
+        body, media_type = _iter_csv(result), "text/csv"
+    else:
+        body, media_type = _iter_ndjson(result), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'}
+    )
+
+
+@router.get("/gigs")
+def export_gigs(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    updated_since: Optional[datetime] = Query(None),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream all gigs as NDJSON or CSV, oldest update first.
+
+    - **format**: `ndjson` (default) or `csv`
+    - **updated_since**: Only export gigs updated at or after this time
+    """
+    return _export_response(crud.stream_gigs(db, updated_since), "gigs", format)
+
+
+@router.get("/applications")
+def export_applications(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    updated_since: Optional[datetime] = Query(None),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream applications to the current user's gigs as NDJSON or CSV.
+
+    - **format**: `ndjson` (default) or `csv`
+    - **updated_since**: Only export applications updated at or after this time
+    """
+    result = crud.stream_owner_applications(db, current_user["uid"], updated_since)
+    return _export_response(result, "applications", format)
+
+
+@router.get("/reviews")
+def export_reviews(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    updated_since: Optional[datetime] = Query(None),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream all reviews as NDJSON or CSV.
+
+    - **format**: `ndjson` (default) or `csv`
+    - **updated_since**: Only export reviews updated at or after this time
+    """
+    return _export_response(crud.stream_reviews(db, updated_since), "reviews", format)
@@ -1,15 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Tuple
+import json
+import tempfile
 from app.schemas import schemas
 from app.crud import crud
+from app.models.models import ArchivedGig, GigStatus
+from app.core import change_feed
 from app.core.dependencies import get_db, get_current_user, get_current_user_optional
+from app.core.fieldsets import sparse_fields, fieldset_model
+from app.core.rate_limit import rate_limit_ip, rate_limit_user
+from app.core.serialization import list_response, dump_list, dump_object, json_response, object_response
+from app.core.single_flight import gig_reads
 
 
 router = APIRouter(prefix="/api/gigs", tags=["gigs"])
 
 
-@router.get("/", response_model=List[schemas.GigResponse])
+def _is_search(request: Request) -> bool:
+    return bool(request.query_params.get("search") or request.query_params.get("skills"))
+
+
+@router.get(
+    "/",
+    response_model=List[schemas.GigResponse],
+    dependencies=[Depends(rate_limit_ip("search", when=_is_search))]
+)
 def list_gigs(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
@@ -18,6 +37,10 @@ def list_gigs(
     budget_type: Optional[str] = Query(None, regex="^(fixed|hourly)$"),
     skills: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    gig_status: str = Query(
+        GigStatus.OPEN.value, alias="status", regex="^(open|in_progress|completed|expired|all)$"
+    ),
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(schemas.GigResponse)),
     db: Session = Depends(get_db)
 ):
     """
@@ -30,43 +53,98 @@ def list_gigs(
     - **budget_type**: Filter by budget type (fixed or hourly)
     - **skills**: Comma-separated list of skills to filter by
     - **search**: Search in title, description, or location
+    - **status**: Lifecycle status to list (open, in_progress, completed, expired or all; default open)
+    - **fields**: Comma-separated subset of fields to return
     """
     # Parse skills if provided
     skills_list = None
     if skills:
-        skills_list = [s.strip() for s in skills.split(",") if s.strip()]
-    
-    gigs = crud.get_gigs(
-        db=db,
-        skip=skip,
-        limit=limit,
-        sort_by=sort_by,
-        sort_order=sort_order,
-        budget_type=budget_type,
-        skills=skills_list,
-        search=search
+        skills_list = sorted({s.strip() for s in skills.split(",") if s.strip()})
+
+    def load() -> bytes:
+        gigs = crud.get_gigs(
+            db=db,
+            skip=skip,
+            limit=limit,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            budget_type=budget_type,
+            skills=skills_list,
+            search=search,
+            fields=fields,
+            status=None if gig_status == "all" else gig_status
+        )
+        return dump_list(fieldset_model(schemas.GigResponse, fields), gigs)
+
+    # Identical concurrent listings share one query and body
+    key = (
+        "list", skip, limit, sort_by, sort_order, budget_type, tuple(skills_list or ()), search, gig_status, fields
     )
-    return gigs
+    return json_response(gig_reads.do(key, load))
+
+
+@router.get("/changes", response_model=schemas.GigChangesResponse)
+def get_gig_changes(
+    since: Optional[str] = Query(None, description="Token from the previous call"),
+    limit: int = Query(500, ge=1, le=change_feed.MAX_LIMIT),
+    db: Session = Depends(get_db)
+):
+    """
+    Gigs created, updated, completed, expired or deleted since `since`, for
+    clients that keep a local copy instead of refetching listings.
+
+    Without `since`, returns no changes and a token for the current position:
+    take it before loading gigs in full, then poll with it. Apply `gigs` as
+    upserts and remove `deleted`, then call again with `next` (right away
+    while `has_more`). A 410 means the token is too old; reload in full.
+    """
+    if since is None:
+        return object_response(schemas.GigChangesResponse, {
+            "gigs": [], "deleted": [], "next": change_feed.encode_token(change_feed.head(db)), "has_more": False
+        })
+    try:
+        since_id = change_feed.decode_token(since)
+        gigs, deleted, next_id, has_more = change_feed.changes_since(db, since_id, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except change_feed.TokenExpired:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Change token has expired; reload gigs and start from a new token"
+        )
+    return object_response(schemas.GigChangesResponse, {
+        "gigs": gigs, "deleted": deleted, "next": change_feed.encode_token(next_id), "has_more": has_more
+    })
 
 
 @router.get("/{gig_id}", response_model=schemas.GigResponse)
 def get_gig(
     gig_id: int,
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(schemas.GigResponse)),
     db: Session = Depends(get_db)
 ):
     """
-    Get a specific gig by ID.
+    Get a specific gig by ID, including archived gigs.
     """
-    gig = crud.get_gig(db, gig_id)
-    if not gig:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Gig not found"
-        )
-    return gig
+    def load() -> bytes:
+        gig = crud.get_gig(db, gig_id, fields=fields, include_archived=True)
+        if not gig:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Gig not found"
+            )
+        return dump_object(fieldset_model(schemas.GigResponse, fields), gig)
+
+    # Identical concurrent lookups share one query and body
+    return json_response(gig_reads.do(("gig", gig_id, fields), load))
 
 
-@router.post("/", response_model=schemas.GigResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=schemas.GigResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit_user("write"))]
+)
 def create_gig(
     gig: schemas.GigCreate,
     current_user: dict = Depends(get_current_user),
@@ -78,7 +156,98 @@ def create_gig(
     return crud.create_gig(db=db, gig=gig, owner_id=current_user["uid"])
 
 
-@router.put("/{gig_id}", response_model=schemas.GigResponse)
+BULK_BATCH_SIZE = 500  # Rows per INSERT/transaction
+BULK_MAX_LINE_BYTES = 64 * 1024  # A valid gig is far smaller than this
+BULK_SPOOL_BYTES = 1024 * 1024  # Results beyond this are spooled to disk
+
+
+async def _iter_ndjson_lines(request: Request) -> AsyncIterator[Optional[bytes]]:
+    """
+    Split a streamed request body into lines without buffering the whole body.
+    Yields None in place of a line that exceeds BULK_MAX_LINE_BYTES.
+    """
+    buffer = b""
+    oversized = False
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield None if oversized else line
+            oversized = False
+        if len(buffer) > BULK_MAX_LINE_BYTES:
+            oversized = True
+            buffer = b""
+    if buffer or oversized:
+        yield None if oversized else buffer
+
+
+@router.post("/bulk", dependencies=[Depends(rate_limit_user("bulk"))])
+async def bulk_import_gigs(
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk import gigs from an NDJSON request body (one GigCreate object per line).
+    Requires authentication; every gig is owned by the current user.
+
+    Rows are validated as they arrive and inserted in batches of BULK_BATCH_SIZE,
+    each batch in its own transaction. The response is NDJSON with one result per
+    non-empty input line (`{"line": n, "id": ...}` or `{"line": n, "errors": [...]}`)
+    followed by a `{"summary": ...}` line. Results are not guaranteed to be in
+    input order; match them up by line number.
+    """
+    # Results are spooled rather than streamed while the body is still being read:
+    # on older ASGI servers the response's disconnect listener would consume the body.
+    results = tempfile.SpooledTemporaryFile(max_size=BULK_SPOOL_BYTES)
+    created = failed = 0
+    batch: List[schemas.GigCreate] = []
+    batch_lines: List[int] = []
+
+    def write_result(result: dict) -> None:
+        results.write(json.dumps(result).encode() + b"\n")
+
+    async def flush_batch() -> None:
+        nonlocal created
+        ids = await run_in_threadpool(crud.bulk_create_gigs, db, batch, current_user["uid"])
+        for line_number, gig_id in zip(batch_lines, ids):
+            write_result({"line": line_number, "id": gig_id})
+        created += len(ids)
+        batch.clear()
+        batch_lines.clear()
+
+    line_number = 0
+    async for line in _iter_ndjson_lines(request):
+        line_number += 1
+        if line is None:
+            failed += 1
+            write_result({"line": line_number, "errors": [{"msg": "Line too long"}]})
+            continue
+        if not line.strip():
+            continue
+        try:
+            gig = schemas.GigCreate.model_validate_json(line)
+        except ValidationError as e:
+            failed += 1
+            write_result({"line": line_number, "errors": json.loads(e.json(include_url=False))})
+            continue
+        batch.append(gig)
+        batch_lines.append(line_number)
+        if len(batch) >= BULK_BATCH_SIZE:
+            await flush_batch()
+    if batch:
+        await flush_batch()
+    write_result({"summary": {"created": created, "failed": failed}})
+    results.seek(0)
+
+    def iter_results():
+        with results:
+            yield from results
+
+    return StreamingResponse(iter_results(), media_type="application/x-ndjson")
+
+
+@router.put("/{gig_id}", response_model=schemas.GigResponse, dependencies=[Depends(rate_limit_user("write"))])
 def update_gig(
     gig_id: int,
     gig_update: schemas.GigUpdate,
@@ -106,7 +275,11 @@ def update_gig(
     return updated_gig
 
 
-@router.delete("/{gig_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{gig_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(rate_limit_user("write"))]
+)
 def delete_gig(
     gig_id: int,
     current_user: dict = Depends(get_current_user),
@@ -133,7 +306,12 @@ def delete_gig(
     return None
 
 
-@router.post("/{gig_id}/apply", response_model=schemas.ApplicationResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{gig_id}/apply",
+    response_model=schemas.ApplicationResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit_user("apply"))]
+)
 def apply_to_gig(
     gig_id: int,
     application: schemas.ApplicationCreate,
@@ -159,6 +337,13 @@ def apply_to_gig(
             detail="Cannot apply to your own gig"
         )
     
+    # Only open gigs take applications
+    if gig.status != GigStatus.OPEN:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="This gig is no longer accepting applications"
+        )
+    
     # Check if already applied
     existing_application = crud.check_existing_application(db, gig_id, current_user["uid"])
     if existing_application:
@@ -172,20 +357,23 @@ def apply_to_gig(
         db=db,
         application=application,
         gig_id=gig_id,
-        applicant_id=current_user["uid"]
+        applicant_id=current_user["uid"],
+        owner_id=gig.owner_id
     )
 
 
 @router.get("/{gig_id}/applications", response_model=List[schemas.ApplicationWithDetails])
 def get_gig_applications(
     gig_id: int,
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(schemas.ApplicationWithDetails)),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get all applications for a gig with applicant details. Only the gig owner can view applications.
+    Works for archived gigs too.
     """
-    gig = crud.get_gig(db, gig_id)
+    gig = crud.get_gig(db, gig_id, include_archived=True)
     if not gig:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -199,4 +387,7 @@ def get_gig_applications(
             detail="Not authorized to view applications for this gig"
         )
     
-    return crud.get_gig_applications_with_details(db, gig_id)
+    applications = crud.get_gig_applications_with_details(
+        db, gig_id, fields=fields, archived=isinstance(gig, ArchivedGig)
+    )
+    return list_response(fieldset_model(schemas.ApplicationWithDetails, fields), applications)
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core import http_cache
 from app.core.dependencies import get_db, get_current_user
+from app.core.rate_limit import rate_limit_user
 from app.crud import crud
+from app.models.models import GigStatus
 from app.schemas import schemas
 
 router = APIRouter(
@@ -11,7 +14,11 @@ router = APIRouter(
 )
 
 
-@router.post("/gigs/{gig_id}/complete", response_model=schemas.GigResponse)
+@router.post(
+    "/gigs/{gig_id}/complete",
+    response_model=schemas.GigResponse,
+    dependencies=[Depends(rate_limit_user("write"))]
+)
 def complete_gig(
     gig_id: int,
     db: Session = Depends(get_db),
@@ -38,7 +45,7 @@ def complete_gig(
         )
     
     # Check if gig is already completed
-    if gig.is_completed == "true":
+    if gig.status == GigStatus.COMPLETED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Gig is already marked as completed"
@@ -60,7 +67,12 @@ def complete_gig(
     return updated_gig
 
 
-@router.post("/reviews", response_model=schemas.ReviewResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/reviews",
+    response_model=schemas.ReviewResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit_user("write"))]
+)
 def create_review(
     review: schemas.ReviewCreate,
     db: Session = Depends(get_db),
@@ -79,7 +91,7 @@ def create_review(
         )
     
     # Check if gig is completed
-    if gig.is_completed != "true":
+    if gig.status != GigStatus.COMPLETED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Can only review after gig is completed"
@@ -142,19 +154,27 @@ def create_review(
 @router.get("/reviews/{user_id}", response_model=schemas.UserReviewStats)
 def get_user_reviews(
     user_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Get all reviews and stats for a specific user.
     Returns average rating, total reviews, and list of reviews.
+    Supports If-None-Match / If-Modified-Since; the version changes when a
+    review of the user is added or removed, or a reviewer's profile changes.
     """
-    # Check if user exists
-    user = crud.get_user(db, user_id)
-    if not user:
+    # Check if user exists, reading only the review-stats version
+    version = crud.get_user_reviews_version(db, user_id)
+    if not version:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
+    tag = http_cache.etag("reviews", user_id, version.reviews_version, version.reviewers_updated_at)
+    last_modified = max(filter(None, (version.reviews_updated_at, version.reviewers_updated_at)), default=None)
+    if http_cache.not_modified(request, tag, last_modified):
+        return http_cache.not_modified_response(tag, last_modified)
     
     # Get all reviews for this user
     reviews = crud.get_user_reviews(db, user_id)
@@ -163,6 +183,7 @@ def get_user_reviews(
     total_reviews = len(reviews)
     average_rating = sum(r.rating for r in reviews) / total_reviews if total_reviews > 0 else 0.0
     
+    response.headers.update(http_cache.validators(tag, last_modified))
     return {
         "average_rating": round(average_rating, 2),
         "total_reviews": total_reviews,
@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.core.dependencies import get_db, get_current_user
+from app.core.rate_limit import rate_limit_user
+from app.core.serialization import list_response
+from app.crud import crud
+from app.schemas import schemas
+
+router = APIRouter(
+    prefix="/api/users/me/saved-searches",
+    tags=["saved searches"]
+)
+
+MAX_SAVED_SEARCHES = 20  # Per user
+
+
+@router.get("", response_model=List[schemas.SavedSearchResponse])
+def list_saved_searches(
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the current user's saved searches.
+    """
+    return list_response(schemas.SavedSearchResponse, crud.get_user_saved_searches(db, current_user["uid"]))
+
+
+@router.post(
+    "",
+    response_model=schemas.SavedSearchResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit_user("write"))]
+)
+def create_saved_search(
+    saved_search: schemas.SavedSearchCreate,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Save a search. Gigs posted from now on that match it appear in the feed.
+    Filters work as in GET /api/gigs/: search is a substring of the title,
+    description or location, and any one of the skills matches.
+    """
+    if crud.count_user_saved_searches(db, current_user["uid"]) >= MAX_SAVED_SEARCHES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"You can have at most {MAX_SAVED_SEARCHES} saved searches"
+        )
+    return crud.create_saved_search(db, current_user["uid"], saved_search)
+
+
+@router.get("/feed", response_model=List[schemas.SavedSearchMatchResponse])
+def get_search_feed(
+    before_id: Optional[int] = Query(None, description="Return entries older than this feed id (next page)"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Newly posted gigs that matched the current user's saved searches, newest first.
+    """
+    matches = crud.get_search_feed(db, current_user["uid"], before_id=before_id, limit=limit)
+    return list_response(schemas.SavedSearchMatchResponse, matches)
+
+
+@router.delete(
+    "/{saved_search_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(rate_limit_user("write"))]
+)
+def delete_saved_search(
+    saved_search_id: int,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete a saved search and its feed entries.
+    """
+    saved_search = crud.get_saved_search(db, saved_search_id)
+    if not saved_search or saved_search.user_id != current_user["uid"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Saved search not found"
+        )
+
+    crud.delete_saved_search(db, saved_search_id)
+    return None
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from app.core import typeahead
+from app.schemas import schemas
+
+router = APIRouter(
+    prefix="/api/suggest",
+    tags=["suggest"]
+)
+
+
+@router.get("", response_model=schemas.SuggestResponse)
+async def get_suggestions(
+    q: str = Query(..., min_length=1, max_length=50, description="What the user has typed so far"),
+    limit: int = Query(5, ge=1, le=typeahead.MAX_LIMIT)
+):
+    """
+    Typeahead completions for the skill picker and search box: skills and gig
+    title words starting with `q`, most used first. Served from memory, so
+    call it on every keystroke instead of searching gigs.
+    """
+    index = typeahead.index
+    if not typeahead.SUGGEST_ENABLED or not index.ready.is_set():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Suggestions are not available yet",
+            headers={"Retry-After": "5"}
+        )
+    completions = index.suggest(q, limit)
+    return {
+        kind: [{"text": text, "count": count} for text, count in pairs]
+        for kind, pairs in completions.items()
+    }
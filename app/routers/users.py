@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, Header
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from app.schemas import schemas
 from app.crud import crud
-from app.core.dependencies import get_db, get_current_user, verify_firebase_token
+from app.models.models import GigStatus
+from app.core import http_cache, recommendations
+from app.core.dependencies import get_db, get_current_user, verify_firebase_token, verify_id_token
+from app.core.fieldsets import sparse_fields, fieldset_model
+from app.core.rate_limit import rate_limit_user
+from app.core.serialization import list_response, object_response
 
 
 router = APIRouter(prefix="/api/users", tags=["users"])
@@ -19,8 +24,6 @@ def register_user(
     Register/sync user from Firebase to database.
     Creates user if doesn't exist, returns existing user if already registered.
     """
-    from firebase_admin import auth
-    
     # Verify Firebase token
     if not authorization or not authorization.startswith('Bearer '):
         raise HTTPException(
@@ -30,7 +33,7 @@ def register_user(
     
     token = authorization.split('Bearer ')[1]
     try:
-        decoded_token = auth.verify_id_token(token)
+        decoded_token = verify_id_token(token)
         uid = decoded_token['uid']
     except Exception as e:
         print(f"Token verification failed: {e}")
@@ -51,54 +54,133 @@ def register_user(
 
 @router.get("/me", response_model=schemas.UserResponse)
 def get_current_user_info(
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(schemas.UserResponse)),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Get current authenticated user's information.
     """
-    return current_user["db_user"]
+    return object_response(fieldset_model(schemas.UserResponse, fields), current_user["db_user"])
 
 
 @router.get("/{uid}", response_model=schemas.UserResponse)
 def get_user(
     uid: str,
+    request: Request,
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(schemas.UserResponse)),
     db: Session = Depends(get_db)
 ):
     """
     Get user information by UID.
+    Supports If-None-Match / If-Modified-Since, checked against updated_at
+    before the profile is loaded.
     """
-    user = crud.get_user(db, uid)
+    if http_cache.is_conditional(request):
+        version = crud.get_user_version(db, uid)
+        if version:
+            tag = http_cache.etag("user", uid, version.updated_at, fields)
+            if http_cache.not_modified(request, tag, version.updated_at):
+                return http_cache.not_modified_response(tag, version.updated_at)
+
+    user = crud.get_user(db, uid, fields=fields and (*fields, "updated_at"))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    return user
+    tag = http_cache.etag("user", uid, user.updated_at, fields)
+    return http_cache.with_validators(
+        object_response(fieldset_model(schemas.UserResponse, fields), user), tag, user.updated_at
+    )
 
 
 @router.get("/me/gigs", response_model=List[schemas.GigResponse])
 def get_my_gigs(
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(schemas.GigResponse)),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get all gigs created by the current user.
+    Get all gigs created by the current user, archived ones included.
     """
-    return crud.get_user_gigs(db, current_user["uid"])
+    gigs = crud.get_user_gigs(db, current_user["uid"], fields=fields, include_archived=True)
+    return list_response(fieldset_model(schemas.GigResponse, fields), gigs)
 
 
 @router.get("/me/applications", response_model=List[schemas.ApplicationWithDetails])
 def get_my_applications(
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(schemas.ApplicationWithDetails)),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get all applications submitted by the current user with gig details,
+    including those to archived gigs.
+    """
+    applications = crud.get_user_applications_with_details(
+        db, current_user["uid"], fields=fields, include_archived=True
+    )
+    return list_response(fieldset_model(schemas.ApplicationWithDetails, fields), applications)
+
+
+@router.get("/me/recommended-gigs", response_model=List[schemas.GigResponse])
+def get_recommended_gigs(
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(schemas.GigResponse)),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Open gigs ranked for the current user by skill match, recency and budget.
+    Empty until the user's profile lists skills.
+    """
+    index = recommendations.index
+    if not recommendations.RECOMMENDATIONS_ENABLED or not index.ready.is_set():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Recommendations are not available yet",
+            headers={"Retry-After": "5"}
+        )
+    uid = current_user["uid"]
+    # Extra candidates make up for the user's own gigs and rows changed since the last sync
+    ranked = index.recommend(current_user["db_user"].skills or [], limit + 10)
+    load = fields and tuple(set(fields) | {"owner_id", "status"})
+    gigs = {gig.id: gig for gig in crud.get_gigs_by_ids(db, [gig_id for gig_id, _ in ranked], fields=load)}
+    recommended = [
+        gigs[gig_id] for gig_id, _ in ranked
+        if gig_id in gigs and gigs[gig_id].owner_id != uid and gigs[gig_id].status == GigStatus.OPEN
+    ][:limit]
+    return list_response(fieldset_model(schemas.GigResponse, fields), recommended)
+
+
+@router.get("/me/dashboard", response_model=schemas.DashboardResponse)
+def get_dashboard(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get all applications submitted by the current user with gig details.
+    Everything the frontend shows after login in one response: profile, rating
+    stats, my gigs with application counts by status, and my applications with
+    a summary of each gig. Replaces calling /me, /me/gigs, /me/applications,
+    /api/reviews/{uid} and every gig's /applications separately.
     """
-    return crud.get_user_applications_with_details(db, current_user["uid"])
+    uid = current_user["uid"]
+    average_rating, total_reviews = crud.get_user_rating_stats(db, uid)
+    gigs = crud.get_user_gigs(db, uid)
+    counts = crud.count_applications_by_gig_status(db, uid)
+    for gig in gigs:
+        by_status = counts.get(gig.id, {})
+        # Plain attribute, not a column: read by the response model only
+        gig.application_counts = {**by_status, "total": sum(by_status.values())}
+    return object_response(schemas.DashboardResponse, {
+        "profile": current_user["db_user"],
+        "rating": {"average_rating": round(average_rating, 2), "total_reviews": total_reviews},
+        "gigs": gigs,
+        "applications": crud.get_user_applications_with_gig_summaries(db, uid),
+    })
 
 
-@router.put("/me", response_model=schemas.UserResponse)
+@router.put("/me", response_model=schemas.UserResponse, dependencies=[Depends(rate_limit_user("write"))])
 def update_my_profile(
     user_update: schemas.UserUpdate,
     current_user: dict = Depends(get_current_user),
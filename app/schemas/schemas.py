@@ -1,6 +1,11 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import List, Optional
+from pydantic import BaseModel, EmailStr, Field, model_validator
+from typing import Annotated, Any, List, Optional
 from datetime import datetime
+from app.models.models import GigStatus
+
+
+# Fits the `skill:<name>` keys of saved_search_anchors.key (String(120))
+Skill = Annotated[str, Field(min_length=1, max_length=100)]
 
 
 # User Schemas
@@ -40,7 +45,7 @@ class GigBase(BaseModel):
     budget: Optional[float] = Field(None, gt=0)
     budget_type: Optional[str] = Field(None, pattern="^(fixed|hourly)$")
     location: Optional[str] = Field(None, max_length=200)
-    skills_required: Optional[List[str]] = None
+    skills_required: Optional[List[Skill]] = None
     deadline: Optional[datetime] = None
 
 
@@ -54,13 +59,14 @@ class GigUpdate(BaseModel):
     budget: Optional[float] = Field(None, gt=0)
     budget_type: Optional[str] = Field(None, pattern="^(fixed|hourly)$")
     location: Optional[str] = Field(None, max_length=200)
-    skills_required: Optional[List[str]] = None
+    skills_required: Optional[List[Skill]] = None
     deadline: Optional[datetime] = None
 
 
 class GigResponse(GigBase):
     id: int
     owner_id: str
+    status: GigStatus
     created_at: datetime
     updated_at: datetime
     
@@ -133,3 +139,115 @@ class UserReviewStats(BaseModel):
     average_rating: float
     total_reviews: int
     reviews: List[ReviewWithDetails] = []
+
+
+# Dashboard Schemas
+class RatingStats(BaseModel):
+    average_rating: float
+    total_reviews: int
+
+
+class ApplicationCounts(BaseModel):
+    pending: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    total: int = 0
+
+
+class DashboardGig(GigResponse):
+    application_counts: ApplicationCounts
+
+
+class GigSummary(BaseModel):
+    id: int
+    title: str
+    status: GigStatus
+    budget: Optional[float] = None
+    budget_type: Optional[str] = None
+    location: Optional[str] = None
+    deadline: Optional[datetime] = None
+    owner_id: str
+
+    class Config:
+        from_attributes = True
+
+
+class DashboardApplication(ApplicationResponse):
+    gig: GigSummary
+
+
+class DashboardResponse(BaseModel):
+    profile: UserResponse
+    rating: RatingStats
+    gigs: List[DashboardGig]
+    applications: List[DashboardApplication]
+
+
+# Gig Change Feed Schemas
+class GigChangesResponse(BaseModel):
+    gigs: List[GigResponse]  # Current state of each gig created or changed since the token
+    deleted: List[int]
+    next: str  # Token for the next call
+    has_more: bool  # More changes are waiting; call again right away
+
+
+# Saved Search Schemas
+class SavedSearchCreate(BaseModel):
+    search: Optional[str] = Field(None, min_length=3, max_length=100)
+    skills: Optional[List[Skill]] = Field(None, max_length=10)
+    budget_type: Optional[str] = Field(None, pattern="^(fixed|hourly)$")
+
+    @model_validator(mode="after")
+    def require_a_filter(self) -> "SavedSearchCreate":
+        if not (self.search or self.skills or self.budget_type):
+            raise ValueError("A saved search needs at least one of search, skills or budget_type")
+        return self
+
+
+class SavedSearchResponse(SavedSearchCreate):
+    id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class SavedSearchMatchResponse(BaseModel):
+    id: int
+    saved_search_id: int
+    created_at: datetime
+    gig: GigResponse
+
+    class Config:
+        from_attributes = True
+
+
+# Suggestion Schemas
+class Suggestion(BaseModel):
+    text: str
+    count: int
+
+
+class SuggestResponse(BaseModel):
+    skills: List[Suggestion]
+    terms: List[Suggestion]
+
+
+# Batch Schemas
+class BatchSubRequest(BaseModel):
+    id: Optional[str] = Field(None, max_length=64, description="Echoed back to match responses to requests")
+    path: str = Field(..., max_length=2000, description="GET path with query string, e.g. /api/gigs/12")
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest] = Field(..., min_length=1)
+
+
+class BatchSubResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    responses: List[BatchSubResponse]
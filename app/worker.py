@@ -0,0 +1,83 @@
+"""
+Outbox worker: performs the side effects recorded by request handlers.
+
+Usage:
+    python -m app.worker [--once] [--batch-size 100]
+
+Run one or more alongside the API. Prometheus metrics for backlog, lag and
+throughput are served on OUTBOX_METRICS_PORT (default 9101, 0 disables).
+"""
+import argparse
+import logging
+import os
+import signal
+
+from prometheus_client import start_http_server
+
+from app.core.outbox import BATCH_SIZE, OutboxWorker, handler
+from app.crud import crud
+from app.db.database import SessionLocal
+
+
+METRICS_PORT = int(os.getenv("OUTBOX_METRICS_PORT", "9101"))
+
+logger = logging.getLogger(__name__)
+
+
+@handler("gig.created")
+def match_saved_searches(payload: dict) -> None:
+    with SessionLocal() as db:
+        crud.percolate_gig(db, payload["gig_id"])
+
+
+# Placeholders: notifications are only logged until a delivery channel (email,
+# push) exists. Streams get these events from app.core.push, not from here.
+
+@handler("application.submitted")
+def notify_owner_of_application(payload: dict) -> None:
+    with SessionLocal() as db:
+        gig = crud.get_gig(db, payload["gig_id"], fields=("id", "owner_id", "title"))
+    if gig:
+        logger.info(
+            "Notify %s: new application %s for gig %s (%s)", gig.owner_id, payload["application_id"], gig.id, gig.title
+        )
+
+
+@handler("application.selected")
+def notify_selected_applicant(payload: dict) -> None:
+    logger.info("Notify %s: you were selected for gig %s", payload["applicant_id"], payload["gig_id"])
+
+
+@handler("gig.completed")
+def request_reviews(payload: dict) -> None:
+    with SessionLocal() as db:
+        accepted = [a for a in crud.get_gig_applications(db, payload["gig_id"]) if a.status == "accepted"]
+    for application in accepted:
+        logger.info("Notify %s: gig %s is complete, leave a review", application.applicant_id, payload["gig_id"])
+    logger.info("Notify %s: gig %s is complete, leave a review", payload["owner_id"], payload["gig_id"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Dispatch outbox events to their handlers")
+    parser.add_argument("--once", action="store_true", help="Process one batch and exit")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    worker = OutboxWorker(batch_size=args.batch_size)
+    if args.once:
+        logger.info("Processed %s events", worker.run_once())
+        return
+
+    if METRICS_PORT:
+        start_http_server(METRICS_PORT)
+    signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+    logger.info("Outbox worker %s started", worker.worker_id)
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+Standalone benchmarks for the Tujitume API.
+
+Run a benchmark as a module from the repository root, e.g.
+``python -m benchmarks.cascade_delete``.
+"""
@@ -0,0 +1,103 @@
+"""
+Hot/cold tiering: gig queries and the size of the gigs and applications
+tables (with their indexes) before and after closed gigs are archived.
+
+Seeds the datagen scale, then closes gigs until about 80% are completed or
+expired, all older than GIG_ARCHIVE_AFTER_DAYS. SQLite only (sizes come from
+the dbstat table).
+
+Usage:
+    python -m benchmarks.archive [--scale 1m] [--iterations 50]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='tujitume-bench-')}/app.db")
+
+from benchmarks import harness
+
+HOT_TABLES = ("gigs", "applications")
+
+
+def table_bytes(engine, table: str) -> int:
+    """Pages used by a table and its indexes"""
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(
+            "SELECT SUM(pgsize) FROM dbstat WHERE name IN "
+            "(SELECT name FROM sqlite_master WHERE tbl_name = ?)", (table,)
+        ).scalar() or 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Gig queries before and after archiving closed gigs")
+    parser.add_argument("--scale", choices=("10k", "1m", "10m"), default="1m")
+    parser.add_argument("--iterations", type=int, default=50)
+    harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    from sqlalchemy import text
+    from app.crud import crud
+    from app.db.database import SessionLocal, engine
+    from benchmarks.datagen import SCALES, seed, user_uid
+
+    scale = SCALES[args.scale]
+    print(f"Seeding {args.scale}")
+    seed(engine, scale)
+    with engine.begin() as conn:
+        # A third of the seed is completed; expire most open gigs for ~80% closed
+        conn.execute(text("UPDATE gigs SET status = 'expired' WHERE status = 'open' AND id % 10 < 7"))
+        closed = conn.execute(text("SELECT COUNT(*) FROM gigs WHERE status != 'open'")).scalar()
+    print(f"  {closed / scale.gigs:.0%} of {scale.gigs} gigs closed")
+
+    rng = random.Random(42)
+    queries = {
+        # No matches, so each one reads every candidate row
+        "search (status=all)": lambda db: crud.get_gigs(db, search="no such gig", limit=20),
+        "skills (status=all)": lambda db: crud.get_gigs(db, skills=["No such skill"], limit=20),
+        "search (open)": lambda db: crud.get_gigs(db, search="no such gig", limit=20, status="open"),
+        "list (status=all)": lambda db: crud.get_gigs(db, skip=rng.randrange(1000), limit=20),
+        "get_gig": lambda db: crud.get_gig(db, rng.randint(1, scale.gigs), include_archived=True),
+        "get_user_gigs": lambda db: crud.get_user_gigs(
+            db, user_uid(rng.randrange(scale.users)), include_archived=True
+        ),
+    }
+
+    def measure(phase: str) -> harness.Results:
+        results = {}
+        for name, query in queries.items():
+            samples = []
+            for _ in range(args.iterations):
+                with SessionLocal() as db:
+                    began = time.perf_counter()
+                    query(db)
+                    samples.append(time.perf_counter() - began)
+            results[f"{name} {phase}"] = harness.summarize(samples)
+        return results
+
+    sizes = {"before": {table: table_bytes(engine, table) for table in HOT_TABLES}}
+    results = measure("before")
+
+    began = time.perf_counter()
+    archived = 0
+    with SessionLocal() as db:
+        while moved := crud.archive_gigs(db, datetime.utcnow(), 500, timedelta(days=90)):
+            archived += moved
+    elapsed = time.perf_counter() - began
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    sizes["after"] = {table: table_bytes(engine, table) for table in HOT_TABLES}
+    results.update(measure("after"))
+
+    harness.print_report(f"Archiving {archived} gigs ({archived / elapsed:,.0f} gigs/s)", results)
+    for phase, by_table in sizes.items():
+        print(f"  hot tables {phase}: " + ", ".join(f"{t} {n / 2**20:.1f} MiB" for t, n in by_table.items()))
+    return harness.finish(args, results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
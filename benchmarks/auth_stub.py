@@ -0,0 +1,41 @@
+"""
+Firebase auth stub for benchmarks.
+
+Replaces token verification (dependencies.authenticate, used by
+get_current_user and the batch endpoint) and get_stream_user so that
+`Authorization: Bearer <uid>` authenticates as `<uid>` without contacting
+Firebase. Users are created on first use, as in the real dependency. Never
+install this outside benchmarks.
+"""
+from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.orm import Session
+
+from app.core import dependencies
+from app.core.dependencies import get_stream_user
+from app.crud import crud
+
+
+def stub_authenticate(token: str, db: Session) -> dict:
+    uid = token
+    if not uid:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing uid")
+    user = crud.get_or_create_user(db, uid=uid, email=f"{uid}@example.com")
+    return {"uid": uid, "email": user.email, "name": user.name, "db_user": user}
+
+
+async def stub_stream_user(
+    credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer(auto_error=False))
+) -> str:
+    if not credentials or not credentials.credentials:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing uid")
+    return credentials.credentials
+
+
+def install(app: FastAPI) -> None:
+    dependencies.authenticate = stub_authenticate
+    app.dependency_overrides[get_stream_user] = stub_stream_user
+
+
+def auth_header(uid: str) -> dict:
+    return {"Authorization": f"Bearer {uid}"}
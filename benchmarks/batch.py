@@ -0,0 +1,85 @@
+"""
+One POST /api/batch against the same GETs sent one by one, through the full
+ASGI stack. --rtt-ms adds a simulated network round trip per HTTP request, as a
+mobile client on a slow network would pay it; server time is measured either
+way. Authentication goes through benchmarks.auth_stub, so Firebase
+verification (paid once per batch, once per request otherwise) is not included.
+
+Usage:
+    python -m benchmarks.batch [--screen 8] [--rtt-ms 150] [--iterations 100]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='tujitume-bench-')}/app.db")
+os.environ.setdefault("RECOMMENDATIONS_ENABLED", "false")
+os.environ.setdefault("SUGGEST_ENABLED", "false")
+
+from benchmarks import harness
+
+USER = "batch-user"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Batch API vs separate requests")
+    parser.add_argument("--screen", type=int, default=8, help="GETs needed to render one screen")
+    parser.add_argument("--rtt-ms", type=float, default=150.0, help="Simulated round trip per HTTP request")
+    parser.add_argument("--iterations", type=int, default=100)
+    harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    from sqlalchemy import insert
+    from app.main import app
+    from app.db.database import engine
+    from app.models.models import Gig, User
+    from benchmarks import auth_stub
+    from benchmarks.load import call
+
+    auth_stub.install(app)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"uid": USER, "email": f"{USER}@example.com"}])
+        conn.execute(insert(Gig), [
+            {"title": f"Gig {i}", "description": "x" * 40, "owner_id": USER} for i in range(200)
+        ])
+
+    headers = auth_stub.auth_header(USER)
+    paths = [
+        "/api/users/me", "/api/users/me/gigs", "/api/users/me/applications", f"/api/reviews/{USER}",
+    ] + [f"/api/gigs/{gig_id}" for gig_id in range(1, args.screen - 3)]
+    paths = paths[:args.screen]
+    body = json.dumps({"requests": [{"path": path} for path in paths]}).encode()
+    rtt = args.rtt_ms / 1000
+
+    async def separate():
+        for path in paths:
+            await asyncio.sleep(rtt)
+            await call(app, "GET", path, {}, headers, None)
+
+    async def batched():
+        await asyncio.sleep(rtt)
+        if await call(app, "POST", "/api/batch", {}, headers, body) != 200:
+            raise RuntimeError("batch failed")
+
+    async def run(screen):
+        samples = []
+        for _ in range(args.iterations):
+            began = time.perf_counter()
+            await screen()
+            samples.append(time.perf_counter() - began)
+        return harness.summarize(samples)
+
+    results = {}
+    for name, screen in ((f"{len(paths)} separate GETs", separate), (f"batch of {len(paths)}", batched)):
+        results[name] = asyncio.run(run(screen))
+
+    harness.print_report(f"One screen, {args.rtt_ms:g} ms round trip", results)
+    return harness.finish(args, results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
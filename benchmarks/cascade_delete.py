@@ -0,0 +1,105 @@
+"""
+Compare ORM-loaded cascade deletes with database-level ON DELETE CASCADE.
+
+Usage:
+    python -m benchmarks.cascade_delete [applications_per_gig] [runs]
+"""
+import os
+import sys
+import tempfile
+import time
+
+# The app builds its engine at import time, so give it a throwaway database
+_db_dir = tempfile.mkdtemp(prefix="tujitume-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/app.db")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.models import User, Gig, Application, Review
+from app.crud import crud
+
+
+def _make_session(path: str):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _seed(db, applications_per_gig: int) -> int:
+    owner = User(uid="owner", email="owner@example.com", name="Owner")
+    db.add(owner)
+    gig = Gig(
+        title="Benchmark gig",
+        description="A gig with many applications attached to it",
+        owner_id=owner.uid,
+    )
+    db.add(gig)
+    db.flush()
+
+    applicants = [
+        {"uid": f"applicant-{i}", "email": f"applicant-{i}@example.com"}
+        for i in range(applications_per_gig)
+    ]
+    db.bulk_insert_mappings(User, applicants)
+    db.bulk_insert_mappings(Application, [
+        {"gig_id": gig.id, "applicant_id": a["uid"], "cover_letter": "x" * 200, "status": "pending"}
+        for a in applicants
+    ])
+    db.add(Review(gig_id=gig.id, reviewer_id=owner.uid, reviewed_user_id="applicant-0", rating=5))
+    db.commit()
+    return gig.id
+
+
+def _orm_cascade_delete(db, gig_id: int) -> None:
+    # Previous behaviour: the ORM loads every child row and deletes them one by one
+    gig = db.query(Gig).filter(Gig.id == gig_id).first()
+    for application in list(gig.applications):
+        db.delete(application)
+    for review in db.query(Review).filter(Review.gig_id == gig_id).all():
+        db.delete(review)
+    db.delete(gig)
+    db.commit()
+
+
+def _count_statements(engine, fn) -> int:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements)
+
+
+def run(applications_per_gig: int = 10_000, runs: int = 3) -> None:
+    strategies = {
+        "orm cascade": _orm_cascade_delete,
+        "db cascade": crud.delete_gig,
+    }
+    print(f"Deleting a gig with {applications_per_gig} applications ({runs} runs)")
+    for name, delete in strategies.items():
+        timings = []
+        statements = 0
+        for run_index in range(runs):
+            engine, Session = _make_session(os.path.join(_db_dir, f"{name.replace(' ', '_')}-{run_index}.db"))
+            with Session() as db:
+                gig_id = _seed(db, applications_per_gig)
+                start = time.perf_counter()
+                statements = _count_statements(engine, lambda: delete(db, gig_id))
+                timings.append(time.perf_counter() - start)
+                assert db.query(Application).count() == 0
+                assert db.query(Review).count() == 0
+            engine.dispose()
+        best = min(timings) * 1000
+        print(f"  {name:<12} best {best:9.2f} ms  statements {statements}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
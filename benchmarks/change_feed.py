@@ -0,0 +1,90 @@
+"""
+A client resyncing its gig list: refetching the first pages of GET /api/gigs
+against one GET /api/gigs/changes call for the changes made since its last
+sync. Reports latency and response bytes for each.
+
+Usage:
+    python -m benchmarks.change_feed [--gigs 10000] [--changes 20] [--pages 3] [--iterations 200]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='tujitume-bench-')}/app.db")
+os.environ.setdefault("RECOMMENDATIONS_ENABLED", "false")
+os.environ.setdefault("SUGGEST_ENABLED", "false")
+
+from benchmarks import harness
+
+USER = "feed-user"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Change feed vs refetching listing pages")
+    parser.add_argument("--gigs", type=int, default=10000)
+    parser.add_argument("--changes", type=int, default=20, help="Gig writes since the client's last sync")
+    parser.add_argument("--pages", type=int, default=3, help="Listing pages of 100 a client refetches")
+    parser.add_argument("--iterations", type=int, default=200)
+    harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import insert
+    from app.main import app
+    from app.core import change_feed
+    from app.crud import crud
+    from app.db.database import SessionLocal, engine
+    from app.models.models import Gig, User
+    from app.schemas import schemas
+
+    rng = random.Random(42)
+    now = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"uid": USER, "email": f"{USER}@example.com"}])
+        conn.execute(insert(Gig), [
+            {
+                "title": f"Benchmark gig number {i}", "description": "Lorem ipsum dolor sit amet " * 20,
+                "budget": 100.0 + i, "budget_type": "fixed", "location": "Nairobi",
+                "skills_required": ["Python", "FastAPI"], "owner_id": USER,
+                "created_at": now + timedelta(minutes=i), "updated_at": now + timedelta(minutes=i),
+            }
+            for i in range(args.gigs)
+        ])
+    with SessionLocal() as db:
+        since = change_feed.head(db)
+        for gig_id in rng.sample(range(1, args.gigs + 1), args.changes):
+            crud.update_gig(db, gig_id, schemas.GigUpdate(budget=rng.randint(50, 5000)))
+
+    client = TestClient(app)
+    token = change_feed.encode_token(since)
+
+    def refetch():
+        return sum(
+            len(client.get("/api/gigs/", params={"skip": page * 100, "limit": 100}).content)
+            for page in range(args.pages)
+        )
+
+    def delta():
+        return len(client.get("/api/gigs/changes", params={"since": token}).content)
+
+    results, sizes = {}, {}
+    for name, sync in ((f"refetch {args.pages} pages", refetch), (f"changes ({args.changes} writes)", delta)):
+        samples = []
+        for _ in range(args.iterations):
+            began = time.perf_counter()
+            sizes[name] = sync()
+            samples.append(time.perf_counter() - began)
+        results[name] = harness.summarize(samples)
+
+    harness.print_report(f"Resync of {args.gigs} gigs", results)
+    for name, size in sizes.items():
+        print(f"  {name}: {size / 1024:.1f} KiB")
+    return harness.finish(args, results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Full responses against 304 Not Modified for GET /api/users/{uid} and
+GET /api/reviews/{user_id}, through the full ASGI stack, with the SQL
+statements each one issues.
+
+Usage:
+    python -m benchmarks.conditional [--reviews 50] [--iterations 500]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='tujitume-bench-')}/app.db")
+os.environ.setdefault("RECOMMENDATIONS_ENABLED", "false")
+os.environ.setdefault("SUGGEST_ENABLED", "false")
+
+from benchmarks import harness
+
+USER = "profile-user"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Full responses vs 304 for profiles and review stats")
+    parser.add_argument("--reviews", type=int, default=50, help="Reviews of the user")
+    parser.add_argument("--iterations", type=int, default=500)
+    harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    from sqlalchemy import event, insert
+    from app.main import app
+    from app.crud import crud
+    from app.db.database import SessionLocal, engine
+    from app.models.models import Gig, User
+    from benchmarks.load import call
+
+    rng = random.Random(42)
+    reviewers = [f"reviewer-{i}" for i in range(args.reviews)]
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"uid": uid, "email": f"{uid}@example.com"} for uid in [USER, *reviewers]])
+        conn.execute(insert(Gig), [{"title": "Reviewed gig", "description": "x" * 40, "owner_id": USER}])
+    with SessionLocal() as db:
+        for reviewer in reviewers:
+            crud.create_review(db, {
+                "gig_id": 1, "reviewer_id": reviewer, "reviewed_user_id": USER, "rating": rng.randint(1, 5)
+            })
+
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+
+    async def fetch_tag(path):
+        tag = None
+
+        async def capture(message):
+            nonlocal tag
+            if message["type"] == "http.response.start":
+                tag = dict(message["headers"]).get(b"etag", b"").decode()
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+            "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+        }
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        await app(scope, receive, capture)
+        return tag
+
+    async def run(path, headers, expected):
+        nonlocal statements
+        samples, errors, queries = [], 0, 0
+        for _ in range(args.iterations):
+            statements = 0
+            began = time.perf_counter()
+            if await call(app, "GET", path, {}, headers, None) != expected:
+                errors += 1
+            samples.append(time.perf_counter() - began)
+            queries = statements
+        return harness.summarize(samples, errors), queries
+
+    results, queries = {}, {}
+    for name, path in (("get_user", f"/api/users/{USER}"), ("get_user_reviews", f"/api/reviews/{USER}")):
+        tag = asyncio.run(fetch_tag(path))
+        results[f"{name} (200)"], queries[f"{name} (200)"] = asyncio.run(run(path, {}, 200))
+        results[f"{name} (304)"], queries[f"{name} (304)"] = asyncio.run(run(path, {"If-None-Match": tag}, 304))
+
+    harness.print_report(f"Conditional requests, {args.reviews} reviews", results)
+    for name, n in queries.items():
+        print(f"  {name}: {n} SQL statements")
+    return harness.finish(args, results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
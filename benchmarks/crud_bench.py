@@ -0,0 +1,208 @@
+"""
+Micro-benchmarks for every function in app.crud.
+
+Each case runs in a fresh session per iteration against a dataset from
+benchmarks.datagen. Without --url a temporary SQLite database is seeded first.
+With --url the database must already hold the given --scale. Write cases create
+their own rows, so use a disposable database.
+
+Usage:
+    python -m benchmarks.crud_bench [--scale 10k] [--url URL] [--iterations 200]
+                                    [--save-baseline PATH] [--baseline PATH] [--threshold 0.2]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict
+
+from benchmarks import harness
+
+
+def cases(scale, created_gigs: list) -> Dict[str, Callable[[Any, int], Any]]:
+    from app.crud import crud
+    from app.schemas import schemas
+    from benchmarks.datagen import EPOCH, SKILLS, applicant_index, gig_owner_index, user_uid
+
+    rng = random.Random(7)
+    run = int(time.time())
+
+    def gig_id() -> int:
+        return rng.randint(1, scale.gigs)
+
+    def uid() -> str:
+        return user_uid(rng.randrange(scale.users))
+
+    def new_gig() -> schemas.GigCreate:
+        return schemas.GigCreate(
+            title="Benchmark gig for crud timings",
+            description="Benchmark description that is long enough to validate",
+            budget=1000,
+            budget_type="fixed",
+            location="Nairobi",
+            skills_required=rng.sample(SKILLS, 2),
+        )
+
+    def create_gig(db, i):
+        gig = crud.create_gig(db, new_gig(), owner_id=uid())
+        created_gigs.append(gig.id)
+        return gig
+
+    def delete_gig(db, i):
+        return crud.delete_gig(db, created_gigs.pop() if created_gigs else gig_id())
+
+    def completed_gig() -> int:
+        return rng.randrange(1, scale.gigs // scale.completed_every + 1) * scale.completed_every
+
+    recent = EPOCH + timedelta(seconds=scale.gigs * 30 * 0.99)
+    cover_letter = schemas.ApplicationCreate(cover_letter="I would like to work on this gig. " * 3)
+
+    return {
+        "get_user": lambda db, i: crud.get_user(db, uid()),
+        "get_user_by_email": lambda db, i: crud.get_user_by_email(db, f"{uid()}@example.com"),
+        "create_user": lambda db, i: crud.create_user(
+            db, schemas.UserCreate(uid=f"bench-{run}-{i}", email=f"bench-{run}-{i}@example.com")
+        ),
+        "get_or_create_user": lambda db, i: crud.get_or_create_user(db, uid(), email=None),
+        "update_user": lambda db, i: crud.update_user(db, uid(), schemas.UserUpdate(bio=f"Updated {i}")),
+        "get_gig": lambda db, i: crud.get_gig(db, gig_id()),
+        "get_gig(archived)": lambda db, i: crud.get_gig(db, scale.gigs + 1 + i, include_archived=True),
+        "get_gigs": lambda db, i: crud.get_gigs(db, limit=20),
+        "get_gigs(fields)": lambda db, i: crud.get_gigs(db, limit=20, fields=("id", "title", "budget")),
+        "get_gigs(search)": lambda db, i: crud.get_gigs(db, limit=20, search=rng.choice(SKILLS)),
+        "get_gigs(skills)": lambda db, i: crud.get_gigs(db, limit=20, skills=rng.sample(SKILLS, 2)),
+        "get_gigs(sort=budget)": lambda db, i: crud.get_gigs(db, limit=20, sort_by="budget"),
+        "get_gigs(deep page)": lambda db, i: crud.get_gigs(db, skip=scale.gigs // 2, limit=20),
+        "get_gigs(open)": lambda db, i: crud.get_gigs(db, limit=20, status="open"),
+        "get_gigs(open, sort=budget)": lambda db, i: crud.get_gigs(db, limit=20, sort_by="budget", status="open"),
+        "get_user_gigs": lambda db, i: crud.get_user_gigs(db, uid()),
+        "get_user_gigs(archived)": lambda db, i: crud.get_user_gigs(db, uid(), include_archived=True),
+        "get_gigs_by_ids(20)": lambda db, i: crud.get_gigs_by_ids(db, [gig_id() for _ in range(20)]),
+        "get_gigs_updated_after": lambda db, i: crud.get_gigs_updated_after(db, recent, 0, 1000),
+        "stream_open_gig_skills": lambda db, i: list(crud.stream_open_gig_skills(db)),
+        "stream_gig_terms": lambda db, i: list(crud.stream_gig_terms(db)),
+        "get_gigs_after_id": lambda db, i: crud.get_gigs_after_id(db, gig_id(), 1000),
+        "stream_user_skills": lambda db, i: list(crud.stream_user_skills(db)),
+        "create_gig": create_gig,
+        "bulk_create_gigs(100)": lambda db, i: crud.bulk_create_gigs(db, [new_gig() for _ in range(100)], uid()),
+        "update_gig": lambda db, i: crud.update_gig(db, gig_id(), schemas.GigUpdate(budget=2000 + i)),
+        "delete_gig": delete_gig,
+        "get_application": lambda db, i: crud.get_application(db, rng.randint(1, scale.applications)),
+        "get_application(archived)": lambda db, i: crud.get_application(
+            db, scale.applications + 1 + i, include_archived=True
+        ),
+        "get_gig_applications": lambda db, i: crud.get_gig_applications(db, gig_id()),
+        "get_user_applications": lambda db, i: crud.get_user_applications(db, uid()),
+        "get_gig_applications_with_details": lambda db, i: crud.get_gig_applications_with_details(db, gig_id()),
+        "get_user_applications_with_details": lambda db, i: crud.get_user_applications_with_details(db, uid()),
+        "get_user_applications_with_details(archived)": lambda db, i: crud.get_user_applications_with_details(
+            db, uid(), include_archived=True
+        ),
+        "get_user_applications_with_gig_summaries": lambda db, i: crud.get_user_applications_with_gig_summaries(
+            db, uid()
+        ),
+        "count_applications_by_gig_status": lambda db, i: crud.count_applications_by_gig_status(db, uid()),
+        "check_existing_application": lambda db, i: crud.check_existing_application(db, gig_id(), uid()),
+        "create_application": lambda db, i: crud.create_application(
+            db, cover_letter, gig_id=gig_id(), applicant_id=uid(), owner_id=uid()
+        ),
+        "update_application_status": lambda db, i: crud.update_application_status(
+            db, rng.randint(1, scale.applications), "pending"
+        ),
+        "create_review": lambda db, i: crud.create_review(db, {
+            "gig_id": gig_id(), "reviewer_id": uid(), "reviewed_user_id": uid(), "rating": 5, "comment": "Great"
+        }),
+        "get_user_reviews": lambda db, i: crud.get_user_reviews(db, uid()),
+        "get_user_version": lambda db, i: crud.get_user_version(db, uid()),
+        "get_user_reviews_version": lambda db, i: crud.get_user_reviews_version(db, uid()),
+        "get_user_rating_stats": lambda db, i: crud.get_user_rating_stats(db, uid()),
+        "get_review": lambda db, i: crud.get_review(db, rng.randint(1, scale.reviews)),
+        "check_existing_review": lambda db, i: crud.check_existing_review(
+            db, (g := completed_gig()), user_uid(gig_owner_index(scale, g)),
+            user_uid(applicant_index(scale, g, 0))
+        ),
+        "mark_gig_completed": lambda db, i: crud.mark_gig_completed(db, gig_id()),
+        "select_application": lambda db, i: (
+            lambda a: crud.select_application(db, a, a.gig) if a else None
+        )(crud.get_application(db, rng.randint(1, scale.applications))),
+        "create_saved_search": lambda db, i: crud.create_saved_search(
+            db, uid(), schemas.SavedSearchCreate(search="Python", skills=["Python", "Django"])
+        ),
+        "get_user_saved_searches": lambda db, i: crud.get_user_saved_searches(db, uid()),
+        "percolate_gig": lambda db, i: crud.percolate_gig(db, gig_id()),
+        "get_search_feed": lambda db, i: crud.get_search_feed(db, uid()),
+        "enqueue_event": lambda db, i: (crud.enqueue_event(db, "bench", {"i": i}), db.commit()),
+        "outbox_backlog": lambda db, i: crud.outbox_backlog(db),
+        "get_events_after": lambda db, i: crud.get_events_after(
+            db, (crud.event_id_range(db)[1] or 0) - 10, also=(1, 2, 3)
+        ),
+        "event_id_range": lambda db, i: crud.event_id_range(db),
+        "claim_outbox_events(100)": lambda db, i: crud.claim_outbox_events(
+            db, "bench", datetime.utcnow(), 100, timedelta(seconds=60)
+        ),
+        "purge_outbox_events(100)": lambda db, i: crud.purge_outbox_events(
+            db, datetime.utcnow(), 100, timedelta(days=7)
+        ),
+        "record_gig_changes": lambda db, i: (crud.record_gig_changes(db, [gig_id()]), db.commit()),
+        "get_gig_changes_after": lambda db, i: crud.get_gig_changes_after(
+            db, (crud.gig_change_id_range(db)[1] or 0) - 100, 500
+        ),
+        "gig_change_id_range": lambda db, i: crud.gig_change_id_range(db),
+        "purge_gig_changes(100)": lambda db, i: crud.purge_gig_changes(
+            db, datetime.utcnow(), 100, timedelta(days=30)
+        ),
+        "stream_gigs(recent)": lambda db, i: list(crud.stream_gigs(db, updated_since=recent)),
+        "stream_owner_applications": lambda db, i: list(crud.stream_owner_applications(db, uid())),
+        "stream_reviews(recent)": lambda db, i: list(crud.stream_reviews(db, updated_since=recent)),
+        # Last, since they close gigs the read cases above expect to be open
+        "expire_gigs(100)": lambda db, i: crud.expire_gigs(db, datetime.utcnow(), 100),
+        "reject_pending_applications(100)": lambda db, i: crud.reject_pending_applications(db, datetime.utcnow(), 100),
+        "archive_gigs(100)": lambda db, i: crud.archive_gigs(db, datetime.utcnow(), 100, timedelta(days=90)),
+    }
+
+
+def run(scale_name: str, iterations: int) -> harness.Results:
+    from app.db.database import SessionLocal
+    from benchmarks.datagen import SCALES
+
+    scale = SCALES[scale_name]
+    results = {}
+    for name, case in cases(scale, created_gigs=[]).items():
+        samples = []
+        for i in range(iterations):
+            with SessionLocal() as db:
+                start = time.perf_counter()
+                case(db, i)
+                samples.append(time.perf_counter() - start)
+        results[name] = harness.summarize(samples)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark every crud function")
+    parser.add_argument("--scale", choices=("10k", "1m", "10m"), default="10k")
+    parser.add_argument("--url", help="Pre-seeded database (default: a fresh temporary SQLite)")
+    parser.add_argument("--iterations", type=int, default=200)
+    harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{tempfile.mkdtemp(prefix='tujitume-bench-')}/bench.db"
+    os.environ["DATABASE_URL"] = url
+
+    from app.db.database import engine
+    from benchmarks.datagen import SCALES, seed
+
+    if not args.url:
+        print(f"Seeding {args.scale} into {url}")
+        seed(engine, SCALES[args.scale])
+
+    results = run(args.scale, args.iterations)
+    harness.print_report(f"crud micro-benchmarks ({args.scale}, {args.iterations} iterations)", results)
+    return harness.finish(args, results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+GET /api/users/me/dashboard against the calls the frontend used to make after
+login (/me, /me/gigs, /me/applications, /api/reviews/{uid} and every gig's
+/applications), through the full ASGI stack.
+
+Counts the SQL statements each side issues and fails (exit 1) if the dashboard
+needs more than QUERY_BUDGET, however many gigs and applications the user has.
+
+Usage:
+    python -m benchmarks.dashboard [--gigs 50] [--applications 30] [--iterations 200]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='tujitume-bench-')}/app.db")
+os.environ.setdefault("RECOMMENDATIONS_ENABLED", "false")
+os.environ.setdefault("SUGGEST_ENABLED", "false")
+
+from benchmarks import harness
+
+# Authentication (1) + rating stats, gigs, application counts, applications
+QUERY_BUDGET = 6  # Includes the archived-applications query
+OWNER = "dashboard-user"
+
+
+def _seed(engine, gigs: int, applications: int, rng: random.Random) -> None:
+    from sqlalchemy import insert
+    from app.models.models import Application, Gig, Review, User
+
+    now = datetime.utcnow()
+    others = [f"user-{i}" for i in range(200)]
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"uid": uid, "email": f"{uid}@example.com"} for uid in [OWNER, *others]])
+        own_ids = conn.execute(insert(Gig).returning(Gig.id, sort_by_parameter_order=True), [
+            {"title": f"Gig {i}", "description": "x" * 40, "owner_id": OWNER, "created_at": now - timedelta(hours=i)}
+            for i in range(gigs)
+        ]).scalars().all()
+        other_ids = conn.execute(insert(Gig).returning(Gig.id, sort_by_parameter_order=True), [
+            {"title": f"Other gig {i}", "description": "x" * 40, "owner_id": rng.choice(others)}
+            for i in range(applications)
+        ]).scalars().all()
+        conn.execute(insert(Application), [
+            {"gig_id": gig_id, "applicant_id": applicant, "cover_letter": "y" * 60,
+             "status": rng.choice(["pending", "pending", "accepted", "rejected"])}
+            for gig_id in own_ids for applicant in rng.sample(others, rng.randint(0, 20))
+        ] + [
+            {"gig_id": gig_id, "applicant_id": OWNER, "cover_letter": "y" * 60, "status": "pending"}
+            for gig_id in other_ids
+        ])
+        conn.execute(insert(Review), [
+            {"gig_id": rng.choice(own_ids), "reviewer_id": rng.choice(others), "reviewed_user_id": OWNER,
+             "rating": rng.randint(1, 5)}
+            for _ in range(20)
+        ])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Dashboard endpoint vs client-side fan-out")
+    parser.add_argument("--gigs", type=int, default=50, help="Gigs owned by the user")
+    parser.add_argument("--applications", type=int, default=30, help="Applications made by the user")
+    parser.add_argument("--iterations", type=int, default=200)
+    harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    from sqlalchemy import event
+    from app.main import app
+    from app.crud import crud
+    from app.db.database import SessionLocal, engine
+    from benchmarks import auth_stub
+    from benchmarks.load import call
+
+    auth_stub.install(app)
+    _seed(engine, args.gigs, args.applications, random.Random(42))
+    with SessionLocal() as db:
+        gig_ids = [gig.id for gig in crud.get_user_gigs(db, OWNER)]
+
+    headers = auth_stub.auth_header(OWNER)
+    dashboard = [("GET", "/api/users/me/dashboard")]
+    fan_out = [
+        ("GET", "/api/users/me"), ("GET", "/api/users/me/gigs"), ("GET", "/api/users/me/applications"),
+        ("GET", f"/api/reviews/{OWNER}"),
+    ] + [("GET", f"/api/gigs/{gig_id}/applications") for gig_id in gig_ids]
+
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+
+    async def run(requests):
+        nonlocal statements
+        samples, errors, queries = [], 0, 0
+        for _ in range(args.iterations):
+            statements = 0
+            began = time.perf_counter()
+            for method, path in requests:
+                if await call(app, method, path, {}, headers, None) != 200:
+                    errors += 1
+            samples.append(time.perf_counter() - began)
+            queries = statements
+        return harness.summarize(samples, errors), queries
+
+    results, queries = {}, {}
+    for name, requests in (("dashboard", dashboard), (f"fan-out ({len(fan_out)} requests)", fan_out)):
+        results[name], queries[name] = asyncio.run(run(requests))
+
+    harness.print_report(f"Dashboard, {args.gigs} gigs, {args.applications} applications", results)
+    for name, n in queries.items():
+        print(f"  {name}: {n} SQL statements")
+
+    status = harness.finish(args, results)
+    if queries["dashboard"] > QUERY_BUDGET:
+        print(f"Dashboard issued {queries['dashboard']} statements; the budget is {QUERY_BUDGET}")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Deterministic scale-data generator.
+
+Seeds users, gigs, applications and reviews into SQLite or PostgreSQL. The same
+scale and seed always produce the same rows, so benchmark runs are comparable.
+Rows are generated and inserted in chunks, so memory stays flat even at 10M rows.
+
+Usage:
+    python -m benchmarks.datagen --scale 10k --url sqlite:///bench.db
+    python -m benchmarks.datagen --scale 1m --url postgresql://localhost/tujitume_bench
+"""
+import argparse
+import os
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+
+from app.db.database import Base
+from app.models.models import User, Gig, GigStatus, Application, Review
+
+
+@dataclass(frozen=True)
+class Scale:
+    users: int
+    gigs: int
+    applications_per_gig: int
+    completed_every: int  # Every n-th gig is completed, with an accepted applicant and a review
+
+    @property
+    def applications(self) -> int:
+        return self.gigs * self.applications_per_gig
+
+    @property
+    def reviews(self) -> int:
+        return len(range(0, self.gigs, self.completed_every))
+
+    @property
+    def rows(self) -> int:
+        return self.users + self.gigs + self.applications + self.reviews
+
+
+SCALES: Dict[str, Scale] = {
+    "10k": Scale(users=1_000, gigs=2_000, applications_per_gig=3, completed_every=3),
+    "1m": Scale(users=50_000, gigs=200_000, applications_per_gig=3, completed_every=3),
+    "10m": Scale(users=500_000, gigs=2_000_000, applications_per_gig=3, completed_every=3),
+}
+
+CHUNK_SIZE = 5_000
+EPOCH = datetime(2025, 1, 1)
+
+SKILLS = [
+    "Python", "JavaScript", "TypeScript", "React", "Vue", "Angular", "Node.js", "Django",
+    "FastAPI", "Flutter", "Kotlin", "Swift", "PostgreSQL", "MySQL", "MongoDB", "AWS",
+    "Docker", "Kubernetes", "Figma", "UI Design", "Copywriting", "SEO", "Data Entry",
+    "Excel", "Accounting", "Photography", "Video Editing", "Graphic Design", "Marketing",
+    "Translation", "Customer Support", "Plumbing", "Electrical", "Carpentry", "Driving",
+    "Delivery", "Cleaning", "Tutoring", "Event Planning", "M-Pesa Integration",
+]
+LOCATIONS = ["Nairobi", "Mombasa", "Kisumu", "Nakuru", "Eldoret", "Thika", "Remote"]
+TITLE_TEMPLATES = [
+    "Need a {skill} expert for a short project",
+    "Looking for an experienced {skill} freelancer",
+    "{skill} help wanted for small business",
+    "Part-time {skill} specialist",
+    "Urgent: {skill} work this week",
+]
+WORDS = (
+    "project client deliver quality deadline experience portfolio team remote "
+    "weekly budget milestone requirements communication design build test deploy "
+    "maintain support local business startup website mobile app customers data "
+    "report content schedule flexible hours payment invoice review feedback"
+).split()
+
+
+def user_uid(index: int) -> str:
+    return f"user-{index:08d}"
+
+
+def gig_owner_index(scale: Scale, gig_id: int) -> int:
+    return (gig_id * 7) % scale.users
+
+
+def applicant_index(scale: Scale, gig_id: int, k: int) -> int:
+    """The k-th applicant of a gig; distinct from each other and from the owner"""
+    return (gig_owner_index(scale, gig_id) + 1 + k * 13) % scale.users
+
+
+def _description(rng: random.Random) -> str:
+    length = int(min(5000, max(40, rng.lognormvariate(6, 0.8))))
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length].capitalize()
+
+
+def _users(scale: Scale, rng: random.Random) -> Iterator[dict]:
+    for i in range(scale.users):
+        created = EPOCH + timedelta(minutes=i)
+        yield {
+            "uid": user_uid(i),
+            "email": f"{user_uid(i)}@example.com",
+            "name": f"User {i}",
+            "bio": _description(rng)[:300],
+            "skills": rng.sample(SKILLS, rng.randint(1, 5)),
+            "phone": f"+2547{i:08d}",
+            "location": rng.choice(LOCATIONS),
+            "created_at": created,
+            "updated_at": created,
+        }
+
+
+def _gigs(scale: Scale, rng: random.Random) -> Iterator[dict]:
+    for gig_id in range(1, scale.gigs + 1):
+        skills = rng.sample(SKILLS, rng.randint(1, 4))
+        created = EPOCH + timedelta(seconds=gig_id * 30)
+        yield {
+            "id": gig_id,
+            "title": rng.choice(TITLE_TEMPLATES).format(skill=skills[0]),
+            "description": _description(rng),
+            "budget": round(rng.lognormvariate(8, 1), 2),
+            "budget_type": rng.choice(["fixed", "fixed", "hourly"]),
+            "location": rng.choice(LOCATIONS),
+            "skills_required": skills,
+            "deadline": created + timedelta(days=rng.randint(1, 60)),
+            "owner_id": user_uid(gig_owner_index(scale, gig_id)),
+            "status": GigStatus.COMPLETED.value if gig_id % scale.completed_every == 0 else GigStatus.OPEN.value,
+            "created_at": created,
+            "updated_at": created,
+        }
+
+
+def _applications(scale: Scale, rng: random.Random) -> Iterator[dict]:
+    application_id = 0
+    for gig_id in range(1, scale.gigs + 1):
+        completed = gig_id % scale.completed_every == 0
+        for k in range(scale.applications_per_gig):
+            application_id += 1
+            created = EPOCH + timedelta(seconds=gig_id * 30 + k * 60 + 60)
+            yield {
+                "id": application_id,
+                "gig_id": gig_id,
+                "applicant_id": user_uid(applicant_index(scale, gig_id, k)),
+                "cover_letter": _description(rng)[:1000].ljust(50, "."),
+                "status": ("accepted" if k == 0 else "rejected") if completed else "pending",
+                "created_at": created,
+                "updated_at": created,
+            }
+
+
+def _reviews(scale: Scale, rng: random.Random) -> Iterator[dict]:
+    review_id = 0
+    for gig_id in range(scale.completed_every, scale.gigs + 1, scale.completed_every):
+        review_id += 1
+        created = EPOCH + timedelta(seconds=gig_id * 30 + 86400)
+        yield {
+            "id": review_id,
+            "gig_id": gig_id,
+            "reviewer_id": user_uid(gig_owner_index(scale, gig_id)),
+            "reviewed_user_id": user_uid(applicant_index(scale, gig_id, 0)),
+            "rating": rng.choices([1, 2, 3, 4, 5], weights=[1, 1, 3, 8, 12])[0],
+            "comment": _description(rng)[:300],
+            "created_at": created,
+            "updated_at": created,
+        }
+
+
+def _insert_chunked(engine: Engine, model, rows: Iterator[dict]) -> int:
+    count = 0
+    chunk: List[dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            with engine.begin() as conn:
+                conn.execute(insert(model), chunk)
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        with engine.begin() as conn:
+            conn.execute(insert(model), chunk)
+        count += len(chunk)
+    return count
+
+
+def seed(engine: Engine, scale: Scale, seed: int = 42, log: Callable[[str], None] = print) -> None:
+    """Create the schema and insert the dataset for `scale` into an empty database"""
+    Base.metadata.create_all(bind=engine)
+    tables = [
+        (User, _users),
+        (Gig, _gigs),
+        (Application, _applications),
+        (Review, _reviews),
+    ]
+    for model, generate in tables:
+        # Each table gets its own stream so row contents don't depend on other tables' sizes
+        rng = random.Random(f"{seed}:{model.__tablename__}")
+        start = time.perf_counter()
+        count = _insert_chunked(engine, model, generate(scale, rng))
+        log(f"  {model.__tablename__:<13} {count:>10} rows  {time.perf_counter() - start:7.1f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed a database with deterministic benchmark data")
+    parser.add_argument("--scale", choices=SCALES, default="10k")
+    parser.add_argument("--url", default=os.getenv("BENCH_DATABASE_URL", "sqlite:///bench.db"))
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    scale = SCALES[args.scale]
+    print(f"Seeding {args.scale} ({scale.rows} rows) into {args.url}")
+    seed(create_engine(args.url), scale, args.seed)
+
+
+if __name__ == "__main__":
+    main()
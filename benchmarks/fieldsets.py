@@ -0,0 +1,79 @@
+"""
+Measure what sparse fieldsets (`?fields=`) save on the gig list endpoint:
+bytes read from the database into the ORM and bytes in the JSON response.
+
+Usage:
+    python -m benchmarks.fieldsets [gigs] [description_length]
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+_db_dir = tempfile.mkdtemp(prefix="tujitume-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/app.db")
+
+from fastapi.testclient import TestClient
+
+from app.crud import crud
+from app.db.database import SessionLocal
+from app.main import app
+from app.models.models import User, Gig
+
+LIST_FIELDS = ("id", "title", "budget", "budget_type", "location", "created_at")
+
+
+def _seed(gigs: int, description_length: int) -> None:
+    now = datetime(2025, 1, 1)
+    with SessionLocal() as db:
+        db.add(User(uid="owner", email="owner@example.com"))
+        db.flush()
+        db.bulk_insert_mappings(Gig, [
+            {
+                "title": f"Benchmark gig number {i}",
+                "description": ("Lorem ipsum dolor sit amet " * (description_length // 27 + 1))[:description_length],
+                "budget": 100.0 + i,
+                "budget_type": "fixed",
+                "location": "Nairobi",
+                "skills_required": ["Python", "FastAPI"],
+                "owner_id": "owner",
+                "created_at": now + timedelta(minutes=i),
+                "updated_at": now + timedelta(minutes=i),
+            }
+            for i in range(gigs)
+        ])
+        db.commit()
+
+
+def _loaded_bytes(fields) -> int:
+    """Approximate bytes materialized from the database for one 100-gig page"""
+    with SessionLocal() as db:
+        gigs = crud.get_gigs(db, limit=100, fields=fields)
+        return sum(
+            len(str(value))
+            for gig in gigs
+            for key, value in vars(gig).items()
+            if not key.startswith("_sa_") and value is not None
+        )
+
+
+def run(gigs: int = 1000, description_length: int = 5000) -> None:
+    _seed(gigs, description_length)
+    client = TestClient(app)
+    cases = {
+        "all fields": None,
+        "list fields": LIST_FIELDS,
+    }
+    print(f"Listing 100 of {gigs} gigs with {description_length}-char descriptions")
+    for name, fields in cases.items():
+        params = {"limit": 100}
+        if fields:
+            params["fields"] = ",".join(fields)
+        response = client.get("/api/gigs/", params=params)
+        response.raise_for_status()
+        print(f"  {name:<12} db bytes {_loaded_bytes(fields):>9}  response bytes {len(response.content):>9}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
@@ -0,0 +1,95 @@
+"""
+Shared reporting for benchmarks: latency percentiles, result tables and
+baseline comparison.
+
+A run can save its results with --save-baseline and later runs can pass
+--baseline to fail (exit status 1) when any case's p95 regressed by more than
+--threshold (default 20%).
+"""
+import argparse
+import json
+import statistics
+from typing import Dict, List
+
+Results = Dict[str, Dict[str, float]]
+
+MIN_REGRESSION_MS = 0.05  # Ignore differences below timer noise
+
+
+def summarize(samples: List[float], errors: int = 0, elapsed: float = 0.0) -> Dict[str, float]:
+    """Latency summary in milliseconds for a list of durations in seconds"""
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        return ordered[index] * 1000
+
+    summary = {
+        "count": len(ordered),
+        "errors": errors,
+        "mean": statistics.fmean(ordered) * 1000 if ordered else 0.0,
+        "p50": percentile(50),
+        "p95": percentile(95),
+        "p99": percentile(99),
+    }
+    if elapsed:
+        summary["rps"] = len(ordered) / elapsed
+    return summary
+
+
+def print_report(title: str, results: Results) -> None:
+    print(title)
+    print(f"  {'case':<44} {'count':>7} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rps':>8}")
+    for name, s in results.items():
+        rps = f"{s['rps']:8.1f}" if "rps" in s else f"{'':>8}"
+        print(
+            f"  {name:<44} {s['count']:>7} {s['errors']:>5} "
+            f"{s['p50']:9.3f} {s['p95']:9.3f} {s['p99']:9.3f} {rps}"
+        )
+
+
+def add_baseline_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write results to PATH as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against results saved at PATH")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="Allowed relative p95 regression against the baseline (default 0.2)"
+    )
+
+
+def compare(results: Results, baseline: Results, threshold: float) -> List[str]:
+    """Describe every case whose p95 regressed beyond `threshold`"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        limit = previous["p95"] * (1 + threshold)
+        if current["p95"] > limit and current["p95"] - previous["p95"] > MIN_REGRESSION_MS:
+            # A zero baseline (sub-resolution timing, or no successful samples) has no ratio
+            growth = f" (+{(current['p95'] / previous['p95'] - 1) * 100:.0f}%)" if previous["p95"] > 0 else ""
+            regressions.append(f"{name}: p95 {current['p95']:.3f} ms vs baseline {previous['p95']:.3f} ms{growth}")
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: {current['errors']} errors vs baseline {previous['errors']}")
+    return regressions
+
+
+def finish(args: argparse.Namespace, results: Results) -> int:
+    """Save and/or compare baselines as requested; returns the process exit status"""
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Regressions beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
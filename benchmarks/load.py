@@ -0,0 +1,197 @@
+"""
+In-process ASGI load driver.
+
+Drives the real FastAPI app (middleware, routing, validation, serialization and
+the database) by calling it as an ASGI application directly, so no server or
+network is involved. Authentication goes through benchmarks.auth_stub.
+Rate limits are lifted for the run; the concurrency pools stay in place.
+
+For each endpoint the driver sends --requests requests from --concurrency
+concurrent clients and reports p50/p95/p99 latency, errors and throughput.
+
+Usage:
+    python -m benchmarks.load [--scale 10k] [--url URL] [--requests 500] [--concurrency 16]
+                              [--only list_gigs,get_gig] [--save-baseline PATH] [--baseline PATH]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from benchmarks import harness
+
+# (method, path, query, headers, body)
+Request = Tuple[str, str, dict, dict, Optional[bytes]]
+
+
+async def call(app, method: str, path: str, query: dict, headers: dict, body: Optional[bytes]) -> int:
+    """Send one request through `app` and return the response status"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": urlencode(query).encode(),
+        "root_path": "",
+        "headers": [(b"host", b"bench")] + [
+            (name.lower().encode(), value.encode()) for name, value in headers.items()
+        ] + ([(b"content-type", b"application/json")] if body else []),
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    request_sent = False
+    response_done = asyncio.Event()
+    status = 0
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body or b"", "more_body": False}
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body", False):
+            response_done.set()
+
+    await app(scope, receive, send)
+    return status
+
+
+def _scenarios(scale) -> Dict[str, Callable[[random.Random], Request]]:
+    from benchmarks.auth_stub import auth_header
+    from benchmarks.datagen import SKILLS, gig_owner_index, user_uid
+
+    def gig_id(rng):
+        return rng.randint(1, scale.gigs)
+
+    def uid(rng):
+        return user_uid(rng.randrange(scale.users))
+
+    def owned_gig(rng):
+        gig = gig_id(rng)
+        return gig, user_uid(gig_owner_index(scale, gig))
+
+    new_gig = json.dumps({
+        "title": "Load test gig posting",
+        "description": "A gig posted by the load driver to measure writes",
+        "budget": 1500,
+        "budget_type": "fixed",
+        "location": "Nairobi",
+        "skills_required": ["Python", "FastAPI"],
+    }).encode()
+
+    return {
+        "list_gigs": lambda rng: ("GET", "/api/gigs/", {"limit": 20, "skip": rng.randrange(0, 200)}, {}, None),
+        "list_gigs(search)": lambda rng: (
+            "GET", "/api/gigs/", {"limit": 20, "search": rng.choice(SKILLS)}, {}, None
+        ),
+        "list_gigs(skills)": lambda rng: (
+            "GET", "/api/gigs/", {"limit": 20, "skills": ",".join(rng.sample(SKILLS, 2))}, {}, None
+        ),
+        "list_gigs(fields)": lambda rng: (
+            "GET", "/api/gigs/",
+            {"limit": 20, "skip": rng.randrange(0, 200), "fields": "id,title,budget,budget_type,location,created_at"},
+            {}, None
+        ),
+        "get_gig": lambda rng: ("GET", f"/api/gigs/{gig_id(rng)}", {}, {}, None),
+        "get_user": lambda rng: ("GET", f"/api/users/{uid(rng)}", {}, {}, None),
+        "get_user_reviews": lambda rng: ("GET", f"/api/reviews/{uid(rng)}", {}, {}, None),
+        "get_me": lambda rng: ("GET", "/api/users/me", {}, auth_header(uid(rng)), None),
+        "get_my_gigs": lambda rng: ("GET", "/api/users/me/gigs", {}, auth_header(uid(rng)), None),
+        "get_my_applications": lambda rng: ("GET", "/api/users/me/applications", {}, auth_header(uid(rng)), None),
+        "get_gig_applications": lambda rng: (
+            lambda gig, owner: ("GET", f"/api/gigs/{gig}/applications", {}, auth_header(owner), None)
+        )(*owned_gig(rng)),
+        "create_gig": lambda rng: ("POST", "/api/gigs/", {}, auth_header(uid(rng)), new_gig),
+    }
+
+
+async def _drive(app, make_request, requests: int, concurrency: int, seed: int) -> Dict[str, float]:
+    rng = random.Random(seed)
+    plan = [make_request(rng) for _ in range(requests)]
+    samples: List[float] = []
+    errors = 0
+    position = 0
+
+    async def client():
+        nonlocal errors, position
+        while position < len(plan):
+            request = plan[position]
+            position += 1
+            start = time.perf_counter()
+            status = await call(app, *request)
+            samples.append(time.perf_counter() - start)
+            if status >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    return harness.summarize(samples, errors=errors, elapsed=time.perf_counter() - start)
+
+
+async def run(scale_name: str, requests: int, concurrency: int, only: Optional[List[str]]) -> harness.Results:
+    from app.core import rate_limit
+    from app.main import app
+    from benchmarks import auth_stub
+    from benchmarks.datagen import SCALES
+
+    auth_stub.install(app)
+    for name in list(rate_limit.policies):
+        rate_limit.policies[name] = rate_limit.Policy(name, capacity=10**9, window=1)
+
+    scenarios = _scenarios(SCALES[scale_name])
+    results = {}
+    async with app.router.lifespan_context(app):
+        for index, (name, make_request) in enumerate(scenarios.items()):
+            if only and name not in only:
+                continue
+            results[name] = await _drive(app, make_request, requests, concurrency, seed=index)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="In-process ASGI load test")
+    parser.add_argument("--scale", choices=("10k", "1m", "10m"), default="10k")
+    parser.add_argument("--url", help="Pre-seeded database (default: a fresh temporary SQLite)")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--only", help="Comma-separated scenario names")
+    harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{tempfile.mkdtemp(prefix='tujitume-bench-')}/bench.db"
+    os.environ["DATABASE_URL"] = url
+    # Seeded deadlines are in the past; the expiry job would empty the open feed mid-run
+    os.environ["SCHEDULER_ENABLED"] = "false"
+
+    from app.db.database import engine
+    from benchmarks.datagen import SCALES, seed
+
+    if not args.url:
+        print(f"Seeding {args.scale} into {url}")
+        seed(engine, SCALES[args.scale])
+
+    only = args.only.split(",") if args.only else None
+    results = asyncio.run(run(args.scale, args.requests, args.concurrency, only))
+    harness.print_report(
+        f"Load test ({args.scale}, {args.requests} requests x {args.concurrency} clients per endpoint)", results
+    )
+    return harness.finish(args, results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
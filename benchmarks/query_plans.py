@@ -0,0 +1,154 @@
+"""
+Query-plan regression check for app.crud.
+
+Runs every case from benchmarks.crud_bench once against seeded data and
+captures the SQL each one issues. It then EXPLAINs every SELECT, UPDATE and
+DELETE. The check fails (exit status 1) when a plan does any of these:
+
+- scans a whole table (`SCAN <table>` without `USING [COVERING] INDEX` on
+  SQLite, `Seq Scan on <table>` on PostgreSQL)
+- sorts rows instead of reading them in index order
+- leaves out the index its case is listed under in INDEXES
+
+Cases that need a scan or sort by design are listed in EXPECTED with the
+reason. Remove an entry once an index makes it unnecessary.
+
+PostgreSQL prefers sequential scans on small tables, so run it at --scale 1m or
+above there.
+
+Usage:
+    python -m benchmarks.query_plans [--scale 10k] [--url URL] [--verbose]
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+from typing import Dict, List, Set, Tuple
+
+# case -> index its plans must use
+INDEXES: Dict[str, str] = {
+    # The browse list walks these in order and stops at LIMIT
+    "get_gigs": "ix_gigs_created_at",
+    "get_gigs(fields)": "ix_gigs_created_at",
+    "get_gigs(sort=budget)": "ix_gigs_budget",
+    "get_gigs(deep page)": "ix_gigs_created_at",
+    # The public feed walks the partial indexes, which hold open gigs only
+    "get_gigs(open)": "ix_gigs_open_created_at",
+    "get_gigs(open, sort=budget)": "ix_gigs_open_budget",
+    # The skill index rebuild reads every open gig
+    "stream_open_gig_skills": "ix_gigs_open_created_at",
+    # Counts the pending set only
+    "outbox_backlog": "ix_outbox_events_pending_available_at",
+}
+
+# case -> findings that are acceptable for it
+EXPECTED: Dict[str, Set[str]] = {
+    # The typeahead index rebuild counts every gig and every user's skills
+    "stream_gig_terms": {"scan gigs"},
+    "stream_user_skills": {"scan users"},
+    # Substring search and JSON skill matching can't use a b-tree index
+    "get_gigs(search)": {"scan gigs"},
+    "get_gigs(skills)": {"scan gigs"},
+    # Walks the pending set through the partial ix_applications_pending_gig_id
+    # (a plain table scan while most seeded applications are still pending)
+    "reject_pending_applications(100)": {"scan applications"},
+    # Applications to one owner's gigs come from several gigs, so they are sorted by updated_at
+    "stream_owner_applications": {"sort"},
+}
+
+EXPLAINABLE = ("select", "update", "delete")
+
+_SQLITE_SCAN = re.compile(r"^\s*SCAN (\w+)\b(?! USING)")
+_POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+_SORT = re.compile(r"USE TEMP B-TREE FOR (?:ORDER BY|RIGHT PART OF ORDER BY)|(?:^|->\s+)(?:Incremental )?Sort\b")
+
+
+def findings(plan: List[str]) -> Set[str]:
+    """Full scans (`scan <table>`) and explicit sorts (`sort`) in a plan"""
+    found = set()
+    for line in plan:
+        scan = _SQLITE_SCAN.match(line) or _POSTGRES_SCAN.search(line)
+        if scan:
+            found.add(f"scan {scan.group(1)}")
+        if _SORT.search(line.strip()):
+            found.add("sort")
+    return found
+
+
+def check(engine, scale_name: str, verbose: bool = False) -> List[str]:
+    from sqlalchemy import event
+    from app.core.slow_queries import explain
+    from app.db.database import SessionLocal
+    from benchmarks.crud_bench import cases
+    from benchmarks.datagen import SCALES
+
+    captured: List[Tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip()[:6].lower().startswith(EXPLAINABLE):
+            captured.append((statement, parameters))
+
+    failures = []
+    for name, case in cases(SCALES[scale_name], created_gigs=[]).items():
+        captured.clear()
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            with SessionLocal() as db:
+                case(db, 0)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        allowed = EXPECTED.get(name, set())
+        index = INDEXES.get(name)
+        index_used = False
+        with engine.connect() as conn:
+            for statement, parameters in captured:
+                plan = explain(conn, statement, parameters)
+                if index and any(re.search(rf"\b{index}\b", line) for line in plan):
+                    index_used = True
+                unexpected = findings(plan) - allowed
+                if verbose or unexpected:
+                    status = "FAIL" if unexpected else "ok"
+                    print(f"[{status}] {name}: {' '.join(statement.split())[:160]}")
+                    for line in plan:
+                        print(f"         {line}")
+                if unexpected:
+                    failures.append(f"{name}: {', '.join(sorted(unexpected))}")
+        if index and not index_used:
+            print(f"[FAIL] {name}: no plan uses {index}")
+            failures.append(f"{name}: {index} not used")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Fail when a crud query plan scans a table, sorts or skips its index")
+    parser.add_argument("--scale", choices=("10k", "1m", "10m"), default="10k")
+    parser.add_argument("--url", help="Pre-seeded database (default: a fresh temporary SQLite)")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan, not just failures")
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{tempfile.mkdtemp(prefix='tujitume-plans-')}/plans.db"
+    os.environ["DATABASE_URL"] = url
+
+    from app.db.database import engine
+    from benchmarks.datagen import SCALES, seed
+
+    if not args.url:
+        print(f"Seeding {args.scale} into {url}")
+        seed(engine, SCALES[args.scale])
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+    failures = check(engine, args.scale, args.verbose)
+    if failures:
+        print(f"{len(failures)} unexpected full scans, sorts or missing indexes:")
+        for line in failures:
+            print(f"  {line}")
+        return 1
+    print("All crud query plans use indexes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
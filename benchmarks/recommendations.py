@@ -0,0 +1,57 @@
+"""
+Ranking latency of the in-memory skill index (app.core.recommendations) with
+synthetic open gigs, so large sizes need no database.
+
+Usage:
+    python -m benchmarks.recommendations [--gigs 1000000] [--iterations 200]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='tujitume-bench-')}/app.db")
+
+from benchmarks import harness
+from benchmarks.datagen import EPOCH, SKILLS
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time 'gigs for me' ranking against the skill index")
+    parser.add_argument("--gigs", type=int, default=1_000_000, help="Open gigs in the index")
+    parser.add_argument("--iterations", type=int, default=200)
+    harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    from app.core.recommendations import GigIndex
+
+    rng = random.Random(42)
+    index = GigIndex()
+    start = time.perf_counter()
+    for gig_id in range(1, args.gigs + 1):
+        index.apply(
+            gig_id, "open", rng.sample(SKILLS, rng.randint(1, 4)),
+            EPOCH + timedelta(seconds=gig_id * 30), rng.choice((500, 1500, 5000, 20000, 80000))
+        )
+    print(f"Indexed {len(index)} open gigs in {time.perf_counter() - start:.1f} s")
+
+    now = (EPOCH + timedelta(seconds=args.gigs * 30)).timestamp()
+    results = {}
+    for skills_per_user in (1, 3, 5):
+        samples = []
+        for _ in range(args.iterations):
+            skills = rng.sample(SKILLS, skills_per_user)
+            began = time.perf_counter()
+            index.recommend(skills, 30, now=now)
+            samples.append(time.perf_counter() - began)
+        results[f"recommend({skills_per_user} skills)"] = harness.summarize(samples)
+
+    harness.print_report(f"Recommendations, {args.gigs} open gigs", results)
+    return harness.finish(args, results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
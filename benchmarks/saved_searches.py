@@ -0,0 +1,104 @@
+"""
+Cost of matching one new gig against a growing number of saved searches
+(crud.percolate_gig), against a full check of every saved search.
+
+Usage:
+    python -m benchmarks.saved_searches [--counts 1000,10000,100000] [--gigs 50]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='tujitume-bench-')}/app.db")
+
+from benchmarks import harness
+from benchmarks.datagen import LOCATIONS, SKILLS
+
+
+# Real searches and gigs draw on a much larger vocabulary than datagen's word
+# list; with a few dozen words every search would match every gig
+VOCABULARY = [
+    "".join(random.Random(i).choices("abcdefghijklmnopqrstuvwxyz", k=random.Random(-i).randint(4, 9)))
+    for i in range(5000)
+]
+SKILL_NAMES = SKILLS + [f"Skill {i}" for i in range(460)]
+
+
+def _saved_search(rng: random.Random) -> dict:
+    kind = rng.random()
+    search = {"search": None, "skills": None, "budget_type": None}
+    if kind < 0.5:
+        search["skills"] = rng.sample(SKILL_NAMES, rng.randint(1, 2))
+    elif kind < 0.8:
+        search["search"] = rng.choice(VOCABULARY)
+    else:
+        search["search"] = rng.choice(VOCABULARY)
+        search["budget_type"] = rng.choice(["fixed", "hourly"])
+    return search
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time saved-search matching per new gig")
+    parser.add_argument("--counts", default="1000,10000,100000", help="Saved-search totals to measure at")
+    parser.add_argument("--gigs", type=int, default=50, help="New gigs matched per total")
+    harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    from sqlalchemy import insert
+    from app.core import saved_searches
+    from app.crud import crud
+    from app.db.database import Base, SessionLocal, engine
+    from app.models.models import Gig, SavedSearch, SavedSearchAnchor, User
+    from app.schemas import schemas
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        users = [{"uid": f"user-{i}", "email": f"user-{i}@example.com"} for i in range(1000)]
+        conn.execute(insert(User), users + [{"uid": "owner", "email": "owner@example.com"}])
+
+    results = {}
+    total = 0
+    for count in (int(c) for c in args.counts.split(",")):
+        with engine.begin() as conn:
+            searches = [{**_saved_search(rng), "user_id": f"user-{rng.randrange(1000)}"} for _ in range(count - total)]
+            ids = conn.execute(
+                insert(SavedSearch).returning(SavedSearch.id, sort_by_parameter_order=True), searches
+            ).scalars().all()
+            conn.execute(insert(SavedSearchAnchor), [
+                {"key": key, "saved_search_id": saved_search_id}
+                for saved_search_id, s in zip(ids, searches)
+                for key in saved_searches.anchor_keys(s["search"], s["skills"], s["budget_type"])
+            ])
+        total = count
+
+        indexed, scanned = [], []
+        with SessionLocal() as db:
+            for _ in range(args.gigs):
+                skills = rng.sample(SKILL_NAMES, rng.randint(1, 4))
+                gig = crud.create_gig(db, schemas.GigCreate(
+                    title=f"Need {skills[0]} help", description=" ".join(rng.choices(VOCABULARY, k=40)),
+                    budget_type=rng.choice(["fixed", "hourly"]), location=rng.choice(LOCATIONS),
+                    skills_required=skills
+                ), owner_id="owner")
+                start = time.perf_counter()
+                crud.percolate_gig(db, gig.id)
+                indexed.append(time.perf_counter() - start)
+
+                # Baseline: load and check every saved search
+                start = time.perf_counter()
+                [s for s in db.query(SavedSearch) if saved_searches.matches(s, gig)]
+                scanned.append(time.perf_counter() - start)
+                db.expunge_all()
+        results[f"percolate_gig({count} searches)"] = harness.summarize(indexed)
+        results[f"check every search({count} searches)"] = harness.summarize(scanned)
+
+    harness.print_report("Saved-search matching per new gig", results)
+    return harness.finish(args, results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
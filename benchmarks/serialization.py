@@ -0,0 +1,81 @@
+"""
+Compare FastAPI's default response serialization with the TypeAdapter path
+used by list endpoints (app.core.serialization).
+
+Usage:
+    python -m benchmarks.serialization [page_size] [description_length] [iterations]
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+_db_dir = tempfile.mkdtemp(prefix="tujitume-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/app.db")
+
+import orjson
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.serialization import dump_list
+from app.models.models import Gig
+from app.schemas import schemas
+
+
+def _make_gigs(page_size: int, description_length: int) -> List[Gig]:
+    now = datetime(2025, 1, 1)
+    return [
+        Gig(
+            id=i,
+            title=f"Benchmark gig number {i}",
+            description=("Lorem ipsum dolor sit amet " * (description_length // 27 + 1))[:description_length],
+            budget=100.0 + i,
+            budget_type="fixed",
+            location="Nairobi",
+            skills_required=["Python", "FastAPI", "PostgreSQL"],
+            deadline=now + timedelta(days=30),
+            owner_id="owner",
+            created_at=now + timedelta(minutes=i),
+            updated_at=now + timedelta(minutes=i),
+        )
+        for i in range(page_size)
+    ]
+
+
+def _timeit(fn, iterations: int) -> float:
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def run(page_size: int = 100, description_length: int = 5000, iterations: int = 200) -> None:
+    gigs = _make_gigs(page_size, description_length)
+    field = create_model_field(name="Response", type_=List[schemas.GigResponse], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def fastapi_default(dumps):
+        content = loop.run_until_complete(serialize_response(field=field, response_content=gigs))
+        return dumps(content)
+
+    strategies = {
+        "fastapi + json.dumps": lambda: fastapi_default(lambda c: json.dumps(c).encode()),
+        "fastapi + orjson": lambda: fastapi_default(orjson.dumps),
+        "type adapter": lambda: dump_list(schemas.GigResponse, gigs),
+    }
+    assert json.loads(strategies["type adapter"]()) == json.loads(strategies["fastapi + json.dumps"]())
+
+    print(f"Serializing {page_size} gigs with {description_length}-char descriptions ({iterations} iterations)")
+    for name, fn in strategies.items():
+        print(f"  {name:<22} {_timeit(fn, iterations):8.3f} ms/page")
+    loop.close()
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    run(*args)
@@ -0,0 +1,88 @@
+"""
+Typeahead lookup latency and memory of the in-memory prefix index
+(app.core.typeahead) with synthetic gigs and users, so large sizes need no
+database.
+
+Usage:
+    python -m benchmarks.suggest [--gigs 200000] [--users 50000] [--iterations 2000]
+"""
+import argparse
+import itertools
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='tujitume-bench-')}/app.db")
+
+from benchmarks import harness
+from benchmarks.datagen import SKILLS
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time typeahead lookups against the prefix index")
+    parser.add_argument("--gigs", type=int, default=200_000, help="Gigs counted into the index")
+    parser.add_argument("--users", type=int, default=50_000, help="Users counted into the index")
+    parser.add_argument("--iterations", type=int, default=2000)
+    harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    from app.core.typeahead import MIN_TERM_COUNT, SuggestIndex
+
+    rng = random.Random(42)
+    # Title words follow a long-tailed distribution, like real titles
+    vocabulary = list(dict.fromkeys(
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(50_000)
+    ))
+    weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    skill_names = SKILLS + [f"Skill {i}" for i in range(2000)]
+
+    # Traced so the index's own estimate can be checked; this slows the build several times over
+    tracemalloc.start()
+    index = SuggestIndex()
+    start = time.perf_counter()
+    for gig_id in range(1, args.gigs + 1):
+        title = " ".join(rng.choices(vocabulary, cum_weights=weights, k=6))
+        index.add_gig(gig_id, title, rng.sample(skill_names, rng.randint(1, 4)))
+    for _ in range(args.users):
+        for skill in rng.sample(skill_names, rng.randint(0, 5)):
+            index.skills.add(skill)
+    index.terms.prune(MIN_TERM_COUNT)
+    index.ready.set()
+    built = time.perf_counter() - start
+    traced = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    stats = index.stats()
+    print(
+        f"Indexed {args.gigs} gigs and {args.users} users in {built:.1f} s: "
+        f"{stats['skills']} skills, {stats['terms']} terms, "
+        f"{stats['memory_bytes'] / 2**20:.1f} MiB reported, {traced / 2**20:.1f} MiB traced"
+    )
+
+    results = {}
+    for length in (1, 2, 3, 5):
+        samples = []
+        for _ in range(args.iterations):
+            prefix = rng.choice(vocabulary)[:length]
+            began = time.perf_counter()
+            index.suggest(prefix, 5)
+            samples.append(time.perf_counter() - began)
+        results[f"suggest({length}-char prefix)"] = harness.summarize(samples)
+
+    samples = []
+    for gig_id in range(args.gigs + 1, args.gigs + 1 + args.iterations):
+        began = time.perf_counter()
+        index.add_gig(gig_id, " ".join(rng.choices(vocabulary, cum_weights=weights, k=6)), rng.sample(skill_names, 2))
+        samples.append(time.perf_counter() - began)
+    results["add_gig"] = harness.summarize(samples)
+
+    harness.print_report(f"Typeahead, {args.gigs} gigs", results)
+    return harness.finish(args, results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+"""
+Gunicorn settings, loaded automatically when gunicorn starts from the repo root.
+
+Sets up Prometheus multiprocess mode so GET /metrics aggregates all workers.
+"""
+import os
+import shutil
+
+
+def on_starting(server):
+    # Workers inherit this environment; start each deploy with an empty directory
+    path = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/tujitume-metrics")
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)